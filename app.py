@@ -1,6 +1,8 @@
 import sys
 import os
 from flask import Flask, session, redirect, url_for, flash, render_template, request
+from jinja2 import FileSystemBytecodeCache, TemplateSyntaxError
+from jinja2.utils import LRUCache
 try:
     from flask_wtf import CSRFProtect
     _CSRF_AVAILABLE = True
@@ -15,14 +17,21 @@ sys.modules["app"] = sys.modules.get(__name__)
 
 app = Flask(__name__, template_folder="templates")
 
+# Laufzeitprofil: CUEX_ENV=production -> Templates beim Start kompiliert,
+# kein Auto-Reload, Start unter waitress. Standard ist die Entwicklung.
+PRODUCTION = os.environ.get("CUEX_ENV", "development").strip().lower() in ("production", "prod")
+# Optional: Bytecode-Cache der Templates auf der Platte (schnellere Neustarts)
+TEMPLATE_CACHE_DIR = os.environ.get("CUEX_TEMPLATE_CACHE") or None
+
 # Configuration
 # WARNUNG: Dieser Key ist nur für die Entwicklung! In Produktion muss er via Environment Variable gesetzt werden.
 app.config['SECRET_KEY'] = os.environ.get('FLASK_SECRET_KEY', 'dev-secret-change-me')
 app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024  # 100 MB
 app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///shows.db"
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-app.config['TEMPLATES_AUTO_RELOAD'] = True  # Force template reloading
-app.jinja_env.auto_reload = True
+app.config['TEMPLATES_AUTO_RELOAD'] = not PRODUCTION
+if PRODUCTION and app.config['SECRET_KEY'] == 'dev-secret-change-me':
+    print("[WARN] Produktionsprofil ohne FLASK_SECRET_KEY — bitte setzen!")
 
 # Database init
 db.init_app(app)
@@ -60,6 +69,50 @@ app.register_blueprint(show_assets_bp)
 app.register_blueprint(show_io_bp)
 
 
+def precompile_templates(env) -> int:
+    """
+    Alle HTML-Templates kompilieren und im Template-Cache ablegen.
+    Ohne Auto-Reload werden sie danach nie wieder geprüft oder geparst.
+    """
+    names = env.list_templates(extensions=["html"])
+    if env.cache is not None and env.cache.capacity < len(names):
+        env.cache = LRUCache(2 * len(names))
+    compiled = 0
+    for name in names:
+        try:
+            env.get_template(name)
+            compiled += 1
+        except TemplateSyntaxError as e:
+            print(f"[WARN] Template {name} konnte nicht kompiliert werden: {e}")
+    return compiled
+
+
+def configure_templates(flask_app, production: bool, cache_dir: str | None = None) -> int:
+    """
+    Entwicklung: Templates bei jeder Anfrage auf Änderungen prüfen.
+    Produktion: kein Auto-Reload, alle Templates beim Start vorkompilieren,
+    optional mit Bytecode-Cache in `cache_dir`.
+
+    Returns:
+        Anzahl vorkompilierter Templates (0 in der Entwicklung)
+    """
+    flask_app.config['TEMPLATES_AUTO_RELOAD'] = not production
+    env = flask_app.jinja_env
+    env.auto_reload = not production
+    if not production:
+        env.bytecode_cache = None
+        return 0
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+    return precompile_templates(env)
+
+
+_compiled = configure_templates(app, PRODUCTION, TEMPLATE_CACHE_DIR)
+if PRODUCTION:
+    print(f"[INFO] Produktionsprofil: {_compiled} Templates vorkompiliert, kein Auto-Reload")
+
+
 # Database Migration (Simple)
 with app.app_context():
     engine = db.engine
@@ -86,9 +139,19 @@ with app.app_context():
     db.create_all()
 
 if __name__ == "__main__":
-    # Verwende Flask Debug-Server für automatisches Template-Reloading
-    # Debug-Modus lädt Templates bei JEDER Anfrage neu (kein Caching)
-    print("[INFO] Flask Debug-Server startet auf http://127.0.0.1:5000")
-    print("[INFO] Templates werden automatisch neu geladen (kein Caching)")
-    print("[INFO] Drücke CTRL+C zum Beenden.")
-    app.run(debug=True, host='127.0.0.1', port=5000)
\ No newline at end of file
+    host = os.environ.get("CUEX_HOST", "127.0.0.1")
+    port = int(os.environ.get("CUEX_PORT", "5000"))
+    if PRODUCTION:
+        from waitress import serve
+        threads = int(os.environ.get("CUEX_THREADS", "8"))
+        print(f"[INFO] waitress startet auf http://{host}:{port} ({threads} Threads)")
+        print("[INFO] Drücke CTRL+C zum Beenden.")
+        serve(app, host=host, port=port, threads=threads)
+    else:
+        # Verwende Flask Debug-Server für automatisches Template-Reloading
+        # Debug-Modus lädt Templates bei JEDER Anfrage neu (kein Caching)
+        print(f"[INFO] Flask Debug-Server startet auf http://{host}:{port}")
+        print("[INFO] Templates werden automatisch neu geladen (kein Caching)")
+        print("[INFO] Für den Showbetrieb: CUEX_ENV=production (waitress, vorkompilierte Templates)")
+        print("[INFO] Drücke CTRL+C zum Beenden.")
+        app.run(debug=True, host=host, port=port)
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""
+Benchmark: EOS-XLSX-Export (Write-Only-Modus vs. klassisches Workbook).
+
+Misst Laufzeit und Spitzen-Speicher (tracemalloc) für 1k, 10k und 100k Cues.
+
+Aufruf (aus dem Projekt-Root):
+    python -m benchmarks.bench_eos_xlsx
+    python -m benchmarks.bench_eos_xlsx --sizes 1000 10000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import openpyxl
+from openpyxl.styles import Font
+
+from core import show_logic
+from services.exporters.export_nomad_csv import export_cues_to_xlsx, _iter_cue_rows, HEADERS
+
+
+BENCH_SHOW_ID = 999_999
+
+
+def _legacy_export(show, file_path):
+    """Bisherige Implementierung: volles Workbook, Zellen einzeln gesetzt."""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "EOS_Cues"
+    for col, header in enumerate(HEADERS, 1):
+        cell = ws.cell(row=1, column=col, value=header)
+        cell.font = Font(bold=True)
+    for row_idx, row in enumerate(_iter_cue_rows(show), 2):
+        for col, value in enumerate(row, 1):
+            ws.cell(row=row_idx, column=col, value=value)
+    wb.save(file_path)
+
+
+def _make_show(n_cues):
+    songs = [
+        {
+            "id": i,
+            "order_index": i,
+            "name": f"Cue {i}",
+            "mood": "Warm",
+            "colors": "Amber, Rot",
+            "special_notes": "Blackout auf Schlag",
+            "general_notes": "Nebel an",
+        }
+        for i in range(1, n_cues + 1)
+    ]
+    return {"id": BENCH_SHOW_ID, "name": "Benchmark", "eos_cuelist_id": 1, "songs": songs}
+
+
+def _measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'Cues':>8} | {'legacy s':>9} | {'legacy MB':>9} | {'stream s':>9} | {'stream MB':>9}")
+    print("-" * 56)
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            show = _make_show(n)
+            show_logic.shows.append(show)
+            try:
+                legacy_path = os.path.join(tmp, f"legacy_{n}.xlsx")
+                stream_path = os.path.join(tmp, f"stream_{n}.xlsx")
+                t_old, m_old = _measure(lambda: _legacy_export(show, legacy_path))
+                t_new, m_new = _measure(lambda: export_cues_to_xlsx(BENCH_SHOW_ID, stream_path))
+            finally:
+                show_logic.shows.remove(show)
+            print(f"{n:>8} | {t_old:>9.3f} | {m_old:>9.1f} | {t_new:>9.3f} | {m_new:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: GDTF-Katalog-Abfragen (Standard: 30000 Fixtures, synthetisch).
+
+Misst den einmaligen Indexaufbau pro Katalog und die Abfragen, die die
+Autovervollständigung pro Tastendruck auslöst (Fixtures eines Herstellers,
+Modes eines Fixtures, Freitextsuche) – erster Aufruf und gemerkter Aufruf.
+Kein Netzwerk: der Katalog wird direkt in den Speicher gelegt.
+
+Aufruf (aus dem Projekt-Root):
+    python -m benchmarks.bench_gdtf_lookup
+    python -m benchmarks.bench_gdtf_lookup --fixtures 30000 100000
+"""
+import argparse
+import random
+import time
+
+from services import gdtf_api, gdtf_search
+
+
+_SYLLABLES = ["ro", "be", "mar", "tin", "clay", "pa", "ky", "ayr", "ton", "glp", "sha", "lu", "mi",
+              "nox", "vari", "lite", "chau", "vet", "ela", "tion", "mega", "poin", "te", "spi", "der",
+              "aura", "khan", "sin", "for", "te", "pro", "wash", "beam", "spot", "zoom", "led", "bar"]
+
+
+def _word(rnd, parts):
+    return "".join(rnd.choice(_SYLLABLES) for _ in range(parts)).capitalize()
+
+
+def _make_catalog(n_fixtures, n_manufacturers=800):
+    """Synthetischer Katalog mit gemischten Namen wie auf GDTF Share."""
+    rnd = random.Random(42)
+    manufacturers = [f"{_word(rnd, 2)} {rnd.choice(['Lighting', 'Professional', 'GmbH', 'LED', ''])}".strip()
+                     for _ in range(n_manufacturers)]
+    return [
+        {
+            "manufacturer": rnd.choice(manufacturers),
+            "fixture": f"{_word(rnd, rnd.randint(2, 3))} {rnd.choice(['', 'XB', 'Pro', str(rnd.randint(1, 900))])}".strip(),
+            "rid": i,
+            "rating": str(rnd.randint(0, 5)),
+            "modes": [{str(m): {"name": f"Mode {m}", "dmxfootprint": rnd.choice([8, 16, 24, 40])}}
+                      for m in range(rnd.randint(1, 4))],
+        }
+        for i in range(n_fixtures)
+    ]
+
+
+def _time(func, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixtures", type=int, nargs="+", default=[30000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'Fixtures':>9} | {'Index bauen':>12} | {'Hersteller neu':>15} | "
+          f"{'Hersteller gemerkt':>19} | {'Modes':>9} | {'Suchindex':>10} | {'Suche neu':>10}")
+    for n in args.fixtures:
+        catalog = _make_catalog(n)
+        gdtf_api._fixtures_cache.update(data=catalog, timestamp=time.time(), disk_checked=True)
+        build = _time(lambda: gdtf_api._CatalogIndex(catalog), repeat=args.repeat)
+        index = gdtf_api._index_for(catalog)
+        query = catalog[0]["manufacturer"]
+
+        def first():
+            index._matches.clear()
+            gdtf_api.get_fixtures_by_manufacturer("", "", query)
+
+        cold = _time(first, repeat=200)
+        warm = _time(lambda: gdtf_api.get_fixtures_by_manufacturer("", "", query), repeat=200)
+        modes = _time(lambda: gdtf_api.get_modes_for_fixture("", "", query, catalog[0]["fixture"]), repeat=200)
+        search_build = _time(lambda: gdtf_search._SearchIndex(catalog))
+        search_index = gdtf_search._index_for(catalog)
+        # "Hersteller Modell" mit Tippfehler (zwei Buchstaben vertauscht), wie beim Eintippen
+        queries = []
+        for i in range(0, n, max(1, n // 50)):
+            name = catalog[i]["fixture"]
+            queries.append(f"{catalog[i]['manufacturer'].split()[0]} {name[:2]}{name[3]}{name[2]}{name[4:]}")
+
+        def search():
+            search_index._results.clear()
+            for q in queries:
+                gdtf_search.search_fixtures("", "", q)
+
+        search_cold = _time(search, repeat=args.repeat) / len(queries)
+        print(f"{n:>9} | {build:>9.2f} ms | {cold:>12.3f} ms | {warm:>16.4f} ms | {modes:>6.4f} ms | "
+              f"{search_build:>7.0f} ms | {search_cold:>7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: Show-Report-PDF mit 300 Cues und 100 Requisiten-Bildern.
+
+Vergleicht
+  - ohne Cache  (Verhalten vor der Layout-Engine: Originalbilder bei jedem Export)
+  - kalt        (Cache leer, Thumbnails werden einmal erzeugt)
+  - warm        (Logo + Thumbnails aus dem Modul-Cache)
+und gibt Laufzeit und PDF-Größe aus.
+
+Aufruf (aus dem Projekt-Root):
+    python -m benchmarks.bench_pdf_report
+    python -m benchmarks.bench_pdf_report --cues 300 --images 100 --runs 3
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from PIL import Image
+
+from services.exporters import pdf_layout
+from services.exporters.pdf_export import build_show_report_pdf
+
+
+def _make_images(directory, count):
+    """Erzeugt Handyfoto-ähnliche Testbilder (JPEG und PNG gemischt)."""
+    names = []
+    for i in range(count):
+        img = Image.linear_gradient("L").resize((2400, 1800)).convert("RGB")
+        img.putpixel((i, i), (255, 0, 0))
+        ext = "jpg" if i % 2 else "png"
+        name = f"bench_{i}.{ext}"
+        img.save(os.path.join(directory, name))
+        names.append(name)
+    return names
+
+
+def _make_show(n_cues, images):
+    songs = [
+        {
+            "id": i,
+            "order_index": i,
+            "name": f"Cue {i}",
+            "mood": "Warm",
+            "colors": "Amber",
+            "special_notes": "Blackout auf Schlag",
+            "general_notes": "Nebel an",
+        }
+        for i in range(1, n_cues + 1)
+    ]
+    return {"name": "Benchmark", "songs": songs, "prop_images": images, "checklists": {}}
+
+
+def _run(show, runs):
+    times = []
+    size = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        buffer, _ = build_show_report_pdf(show)
+        times.append(time.perf_counter() - start)
+        size = len(buffer.getvalue())
+    return min(times), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cues", type=int, default=300)
+    parser.add_argument("--images", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    original_dir = pdf_layout.PROPS_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Erzeuge {args.images} Testbilder ...")
+        show = _make_show(args.cues, _make_images(tmp, args.images))
+        pdf_layout.PROPS_DIR = tmp
+        try:
+            pdf_layout.CACHE_ENABLED = False
+            t_off, size_off = _run(show, args.runs)
+
+            pdf_layout.CACHE_ENABLED = True
+            pdf_layout.clear_caches()
+            t_cold, size_cold = _run(show, 1)
+            t_warm, size_warm = _run(show, args.runs)
+        finally:
+            pdf_layout.PROPS_DIR = original_dir
+            pdf_layout.CACHE_ENABLED = True
+            pdf_layout.clear_caches()
+
+    print(f"{'Modus':<12} | {'Zeit s':>8} | {'PDF KB':>9}")
+    print("-" * 36)
+    print(f"{'ohne Cache':<12} | {t_off:>8.3f} | {size_off / 1024:>9.0f}")
+    print(f"{'kalt':<12} | {t_cold:>8.3f} | {size_cold / 1024:>9.0f}")
+    print(f"{'warm':<12} | {t_warm:>8.3f} | {size_warm / 1024:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: Strom-Berechnung für große Rigs (Phasenlast + Verteilungsvorschlag).
+
+Misst die erste Berechnung (Parser + Greedy-Verteilung) und den Aufruf aus
+dem Cache, wie er bei jedem `show_detail`-GET passiert.
+
+Aufruf (aus dem Projekt-Root):
+    python -m benchmarks.bench_power
+    python -m benchmarks.bench_power --fixtures 1000 5000 20000
+"""
+import argparse
+import random
+import time
+
+from core import rig_model
+from services import power_service
+
+
+def _make_rig(n_fixtures, items_per_prefix=20):
+    rnd = random.Random(42)
+    per_item = max(1, n_fixtures // (len(power_service.FIXTURE_PREFIXES) * items_per_prefix))
+    rig = {"power_main": "63A CEE"}
+    for prefix in power_service.FIXTURE_PREFIXES:
+        rig[f"{prefix}_items"] = [
+            {
+                "count": str(per_item),
+                "watt": str(rnd.choice([150, 250, 470, 700, 1200])),
+                "phase": rnd.choice(["L1", "L2", "L3", "L1-2", ""]),
+                "model": f"{prefix} {i}",
+            }
+            for i in range(items_per_prefix)
+        ]
+    return rig_model.upgrade(rig)
+
+
+def _time(func, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixtures", type=int, nargs="+", default=[1000, 5000, 20000])
+    args = parser.parse_args()
+
+    print(f"{'Fixtures':>9} | {'erste Berechnung':>17} | {'davon Verteilung':>17} | {'aus Cache':>10}")
+    for n in args.fixtures:
+        rig = _make_rig(n)
+        loads = [(k, l, w, c) for k, l, w, c, _ in power_service._iter_loads(rig)]
+        power_service.clear_cache()
+        cold = _time(lambda: power_service.calculate_rig_power(rig))
+        solver = _time(lambda: power_service.balance_phases(loads), repeat=5)
+        warm = _time(lambda: power_service.calculate_rig_power(rig), repeat=200)
+        print(f"{n:>9} | {cold:>14.2f} ms | {solver:>14.2f} ms | {warm:>7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: Fixture-Tabelle für große Rigs (Standard: 5000 Fixtures).
+
+Misst den Aufbau der spaltenbasierten Tabelle und die Auswertungen, die
+darauf aufsetzen (Lampenzahl, Strom, DMX-Patch, MVR-Gruppen) – einmal mit
+frisch gebauter Tabelle, einmal mit Tabelle aus dem Cache, wie bei
+wiederholten Seitenaufrufen ohne Rig-Änderung.
+
+Aufruf (aus dem Projekt-Root):
+    python -m benchmarks.bench_rig_table
+    python -m benchmarks.bench_rig_table --fixtures 5000 20000 --items 200
+"""
+import argparse
+import random
+import time
+
+from core import rig_model
+from routes.main import calculate_total_lamps
+from services import fixture_table, patch_service, power_service
+from services.exporters import mvr_export
+
+
+def _make_rig(n_fixtures, items_per_prefix=50):
+    rnd = random.Random(42)
+    per_item = max(1, n_fixtures // (len(fixture_table.FIXTURE_PREFIXES) * items_per_prefix))
+    rig = {"power_main": "125A CEE"}
+    universe, address = 1, 1
+    for prefix in fixture_table.FIXTURE_PREFIXES:
+        items = []
+        for i in range(items_per_prefix):
+            footprint = rnd.choice([8, 16, 24, 40])
+            item = {
+                "count": str(per_item),
+                "watt": str(rnd.choice([150, 250, 470, 700, 1200])),
+                "phase": rnd.choice(["L1", "L2", "L3", ""]),
+                "model": f"{prefix} {i}",
+                "mode": f"Standard {footprint}ch",
+            }
+            # Zwei Drittel gepatcht, der Rest bleibt für den Auto-Patch
+            if i % 3:
+                item["universe"], item["address"] = str(universe), str(address)
+                for universe, address in patch_service.layout((universe, address), per_item + 1, footprint):
+                    pass
+            items.append(item)
+        rig[f"{prefix}_items"] = items
+    return rig_model.upgrade(rig)
+
+
+def _consumers(rig):
+    calculate_total_lamps(rig)
+    power_service.clear_cache()
+    power_service.calculate_rig_power(rig)
+    patch_service.clear_cache()
+    patch_service.analyze_rig(rig)
+    mvr_export._collect_fixture_groups(rig)
+
+
+def _time(func, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000.0
+
+
+def _cold(rig):
+    fixture_table.clear_cache()
+    _consumers(rig)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixtures", type=int, nargs="+", default=[5000])
+    parser.add_argument("--items", type=int, default=50, help="Rig-Einträge pro Kategorie")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'Fixtures':>9} | {'Tabelle bauen':>14} | {'Lampen (Cache)':>15} | "
+          f"{'alle, Tabelle neu':>18} | {'alle, Tabelle Cache':>20}")
+    for n in args.fixtures:
+        rig = _make_rig(n, args.items)
+        build = _time(lambda: fixture_table.build(rig), repeat=args.repeat)
+        fixture_table.get_table(rig)
+        lamps = _time(lambda: calculate_total_lamps(rig), repeat=200)
+        cold = _time(lambda: _cold(rig), repeat=args.repeat)
+        fixture_table.get_table(rig)
+        warm = _time(lambda: _consumers(rig), repeat=args.repeat)
+        print(f"{n:>9} | {build:>11.2f} ms | {lamps:>12.3f} ms | {cold:>15.2f} ms | {warm:>17.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: Render-Latenz der Show-Detailseite (show_detail.html mit allen
+Tab-Partials) im Entwicklungs- und im Produktionsprofil.
+
+Vergleicht
+  - Entwicklung (Auto-Reload: jedes Template wird pro Anfrage auf Änderungen
+    geprüft, die erste Anfrage kompiliert alles)
+  - Produktion  (Templates beim Start vorkompiliert, kein Auto-Reload)
+und misst den Start-Aufwand der Vorkompilierung mit leerem und gefülltem
+Bytecode-Cache auf der Platte.
+
+Aufruf (aus dem Projekt-Root):
+    python -m benchmarks.bench_template_render
+    python -m benchmarks.bench_template_render --songs 200 --requests 100
+"""
+import argparse
+import statistics
+import tempfile
+import time
+
+from app import app, configure_templates
+from benchmarks.bench_rig_table import _make_rig
+from core import show_logic
+
+
+def _make_show(n_songs, n_fixtures):
+    show = show_logic.create_default_show("Benchmark", "Artist", "2025-01-01", "Club", "Rock", "Standard")
+    show["id"] = 999_001
+    show["rig_setup"] = _make_rig(n_fixtures, items_per_prefix=10)
+    show["songs"] = [
+        {"id": i, "order_index": i, "name": f"Song {i}", "mood": "Warm", "colors": "Amber",
+         "movement_style": "Langsam", "eye_candy": "", "special_notes": "Blackout auf Schlag",
+         "general_notes": "Nebel an"}
+        for i in range(1, n_songs + 1)
+    ]
+    return show
+
+
+def _request(client, show_id):
+    start = time.perf_counter()
+    response = client.get(f"/show/{show_id}")
+    elapsed = (time.perf_counter() - start) * 1000.0
+    assert response.status_code == 200, response.status_code
+    return elapsed
+
+
+def _profile(client, show_id, production, n_requests, cache_dir=None):
+    """(Start ms, erste Anfrage ms, Median ms, p95 ms) für ein Profil."""
+    app.jinja_env.cache.clear()
+    start = time.perf_counter()
+    configure_templates(app, production, cache_dir)
+    startup = (time.perf_counter() - start) * 1000.0
+    first = _request(client, show_id)
+    times = sorted(_request(client, show_id) for _ in range(n_requests))
+    return startup, first, statistics.median(times), times[int(len(times) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--songs", type=int, default=100)
+    parser.add_argument("--fixtures", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    show = _make_show(args.songs, args.fixtures)
+    original = show_logic.shows
+    show_logic.shows = [show]
+    app.config["TESTING"] = True
+    try:
+        with app.test_client() as client, tempfile.TemporaryDirectory() as cache_dir:
+            with client.session_transaction() as sess:
+                sess["user"] = "Admin"
+
+            print(f"{'Profil':<28} | {'Start':>9} | {'1. Anfrage':>10} | {'Median':>8} | {'p95':>8}")
+            rows = [
+                ("Entwicklung (Auto-Reload)", False, None),
+                ("Produktion", True, None),
+                ("Produktion, Bytecode kalt", True, cache_dir),
+                ("Produktion, Bytecode warm", True, cache_dir),
+            ]
+            for label, production, cache in rows:
+                startup, first, median, p95 = _profile(client, show["id"], production, args.requests, cache)
+                print(f"{label:<28} | {startup:7.1f}ms | {first:8.1f}ms | {median:6.2f}ms | {p95:6.2f}ms")
+    finally:
+        show_logic.shows = original
+        configure_templates(app, False)
+
+
+if __name__ == "__main__":
+    main()
@@ -85,7 +85,9 @@ class Song(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     show_id = db.Column(db.Integer, db.ForeignKey("shows.id"), nullable=False)
 
-    order_index = db.Column(db.Integer, nullable=False, default=1)
+    # Sortierschlüssel (kann gebrochen sein, z.B. 2.5 nach dem Verschieben);
+    # SQLite speichert REAL auch in bestehenden INTEGER-Spalten verlustfrei
+    order_index = db.Column(db.Float, nullable=False, default=1)
 
     name = db.Column(db.String(200), nullable=False, default="")
     mood = db.Column(db.String(200), default="")
@@ -0,0 +1,238 @@
+"""
+Rig-Modell: normalisierte Struktur für `show["rig_setup"]`.
+
+Ein Rig besteht aus fünf Gerätelisten (`spots_items` … `strobes_items`),
+`custom_devices` und einigen Freitext-/Strom-Feldern. Zahlen werden beim
+Schreiben geparst (`normalize_item`) und als int/float gespeichert, damit
+Leser nicht bei jedem Aufruf Strings parsen müssen.
+
+Alte Datenstände (Anzahl/Watt/Universe als lose Felder wie `spots`,
+`watt_spots`, `universe_spots` …) werden einmalig per `upgrade()` in
+`*_items`-Einträge überführt; danach gibt es nur noch eine Struktur.
+Der Stand steht in `rig["schema"]`.
+
+Wer ein Rig im aktuellen Stand ändert, ruft danach `touch(rig)` auf: die
+gecachten Auswertungen (services/fixture_table.py) zu diesem Rig verfallen.
+"""
+from typing import Callable, Dict, List, Optional, Tuple, TypedDict
+import copy
+import re
+
+RIG_SCHEMA = 2
+
+CATEGORIES = ("spots", "washes", "beams", "blinders", "strobes")
+
+ITEM_TEXT_FIELDS = ("manufacturer", "model", "mode", "phase")
+
+TEXT_FIELDS = (
+    "main_brand", "positions", "notes", "truss_info", "truss_height", "specials",
+    "power_main", "power_light", "power_sound", "power_video", "power_foh", "power_other",
+)
+
+_ABSOLUTE_RE = re.compile(r"^\s*(\d+)\s*[./:]\s*(\d+)\s*$")
+
+# Wird bei `touch` mit dem geänderten Rig aufgerufen (Cache-Invalidierung);
+# hier wird kein Zustand pro Rig gehalten
+_touch_listeners: List[Callable[[Dict], None]] = []
+
+
+class RigItem(TypedDict, total=False):
+    """Ein Eintrag in `*_items` / `custom_devices` (nach `normalize_item`)."""
+    count: int
+    watt: float                 # pro Gerät
+    universe: Optional[int]     # None = nicht gepatcht
+    address: Optional[int]
+    dmx_footprint: Optional[int]
+    manufacturer: str
+    model: str
+    mode: str
+    phase: str
+    name: str                   # nur custom_devices
+
+
+class RigSetup(TypedDict, total=False):
+    schema: int
+    main_brand: str
+    spots_items: List[RigItem]
+    washes_items: List[RigItem]
+    beams_items: List[RigItem]
+    blinders_items: List[RigItem]
+    strobes_items: List[RigItem]
+    custom_devices: List[RigItem]
+    visual_plan: Dict
+    positions: str
+    notes: str
+    truss_info: str
+    truss_height: str
+    specials: str
+    power_main: str
+    power_light: str
+    power_sound: str
+    power_video: str
+    power_foh: str
+    power_other: str
+
+
+# ---------------------------------------------------------------------- #
+# Parser (nur beim Schreiben / bei der Migration)
+# ---------------------------------------------------------------------- #
+
+def to_int(value) -> Optional[int]:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    try:
+        s = str(value if value is not None else "").strip()
+        return int(s) if s else None
+    except ValueError:
+        return None
+
+
+def to_count(value) -> int:
+    return max(0, to_int(value) or 0)
+
+
+def to_watt(value) -> float:
+    """Watt als Zahl; ganzzahlige Werte bleiben int (Anzeige "200" statt "200.0")."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        watt = float(value)
+    else:
+        try:
+            s = str(value if value is not None else "").strip().replace(",", ".")
+            watt = float(s) if s else 0.0
+        except ValueError:
+            watt = 0.0
+    if watt < 0:
+        watt = 0.0
+    return int(watt) if watt.is_integer() else watt
+
+
+def parse_start(universe, address) -> Optional[Tuple[int, int]]:
+    """
+    Startadresse eines Eintrags: Universe + Adresse, oder absolute
+    Schreibweise "2.101" im Adressfeld. None = nicht gepatcht.
+    """
+    if isinstance(universe, int) and isinstance(address, int):
+        return universe, address
+    m = _ABSOLUTE_RE.match(str(address if address is not None else ""))
+    if m and not str(universe if universe is not None else "").strip():
+        return int(m.group(1)), int(m.group(2))
+    uni = to_int(re.sub(r"^\s*[Uu]", "", str(universe if universe is not None else "")))
+    addr = to_int(address)
+    if uni is None or addr is None:
+        return None
+    return uni, addr
+
+
+def normalize_item(raw: Dict, custom: bool = False) -> RigItem:
+    """Formular-/Altdaten -> RigItem (Zahlen geparst). Unbekannte Felder bleiben erhalten."""
+    item: Dict = dict(raw)
+    item["count"] = to_count(raw.get("count"))
+    item["watt"] = to_watt(raw.get("watt"))
+    start = parse_start(raw.get("universe"), raw.get("address"))
+    item["universe"], item["address"] = start if start else (None, None)
+    footprint = to_int(raw.get("dmx_footprint"))
+    if footprint and footprint > 0:
+        item["dmx_footprint"] = footprint
+    else:
+        item.pop("dmx_footprint", None)
+    for field in ITEM_TEXT_FIELDS + (("name",) if custom else ()):
+        item[field] = str(raw.get(field) or "").strip()
+    return item
+
+
+# ---------------------------------------------------------------------- #
+# Struktur / Migration
+# ---------------------------------------------------------------------- #
+
+def empty_rig() -> RigSetup:
+    rig: Dict = {"schema": RIG_SCHEMA}
+    for field in TEXT_FIELDS:
+        rig[field] = ""
+    for prefix in CATEGORIES:
+        rig[f"{prefix}_items"] = []
+    rig["custom_devices"] = []
+    return rig
+
+
+def is_current(rig: Dict) -> bool:
+    return rig.get("schema") == RIG_SCHEMA
+
+
+def _legacy_item(rig: Dict, prefix: str) -> Optional[RigItem]:
+    """Lose Altfelder einer Kategorie -> ein Eintrag (None, wenn leer)."""
+    count = to_count(rig.get(prefix)) or to_count(rig.get(f"count_{prefix}"))
+    total_watt = to_watt(rig.get(f"watt_{prefix}"))
+    models = [m for m in rig.get(f"models_{prefix}") or [] if m]
+    modes = [m for m in rig.get(f"modes_{prefix}") or [] if m]
+    manufacturer = str(rig.get(f"manufacturer_{prefix}") or "").strip()
+    if not (count or total_watt or models or manufacturer):
+        return None
+    # Altformat speicherte die Gesamtleistung der Kategorie
+    if total_watt and not count:
+        count = 1
+    return normalize_item({
+        "count": count,
+        "watt": total_watt / count if count else 0,
+        "manufacturer": manufacturer,
+        "model": " / ".join(models),
+        "mode": " / ".join(modes),
+        "universe": rig.get(f"universe_{prefix}"),
+        "address": rig.get(f"address_{prefix}"),
+        "phase": rig.get(f"phase_{prefix}"),
+    })
+
+
+_LEGACY_PATTERNS = ("{p}", "count_{p}", "manufacturer_{p}", "universe_{p}", "address_{p}",
+                    "watt_{p}", "phase_{p}", "models_{p}", "modes_{p}")
+
+
+def upgrade(rig: Dict) -> Dict:
+    """
+    Bringt ein Rig in place auf den aktuellen Stand (einmalige Migration):
+    Altfelder -> `*_items`, Zahlen geparst, fehlende Felder ergänzt.
+    """
+    if is_current(rig):
+        return rig
+
+    if not rig.get("main_brand") and rig.get("manufacturer"):
+        rig["main_brand"] = rig["manufacturer"]
+    rig.pop("manufacturer", None)
+
+    for prefix in CATEGORIES:
+        items = rig.get(f"{prefix}_items")
+        if isinstance(items, list) and items:
+            rig[f"{prefix}_items"] = [normalize_item(it) for it in items if isinstance(it, dict)]
+        else:
+            legacy = _legacy_item(rig, prefix)
+            rig[f"{prefix}_items"] = [legacy] if legacy else []
+        for pattern in _LEGACY_PATTERNS:
+            rig.pop(pattern.format(p=prefix), None)
+
+    rig["custom_devices"] = [
+        normalize_item(cd, custom=True) for cd in rig.get("custom_devices") or [] if isinstance(cd, dict)
+    ]
+    for field in TEXT_FIELDS:
+        value = rig.get(field)
+        rig[field] = value if isinstance(value, str) else ("" if value is None else str(value))
+    rig["schema"] = RIG_SCHEMA
+    return rig
+
+
+def on_touch(listener: Callable[[Dict], None]) -> None:
+    """Listener registrieren, der bei jedem `touch` das geänderte Rig erhält."""
+    if listener not in _touch_listeners:
+        _touch_listeners.append(listener)
+
+
+def touch(rig: Dict) -> None:
+    """Rig wurde geändert: gecachte Auswertungen dazu verfallen."""
+    for listener in list(_touch_listeners):
+        listener(rig)
+
+
+def current(rig: Optional[Dict]) -> Dict:
+    """Rig im aktuellen Stand – ohne das übergebene Dict zu verändern."""
+    rig = rig or {}
+    if is_current(rig):
+        return rig
+    return upgrade(copy.deepcopy(rig))
@@ -1,9 +1,12 @@
 from typing import List, Dict, Optional
+import hashlib
 import json
+import math
 import os
 import copy
 
 from .models import db, Show as ShowModel, Song as SongModel, ChecklistItem as ChecklistItemModel
+from . import rig_model
 
 
 Show = Dict
@@ -16,6 +19,9 @@ shows: List[Show] = []
 next_show_id: int = 1
 next_song_id: int = 1
 next_check_item_id: int = 1
+# Zählt jedes Laden/Speichern; günstiges Signal "Daten haben sich geändert"
+# für Indizes, die nicht bei jeder Anfrage die ganze Show hashen sollen
+data_generation: int = 0
 
 # -----------------------------------------------------------------------------#
 # KONFIGURATION: Hersteller-Liste
@@ -49,83 +55,8 @@ MANUFACTURERS = [
 
 
 def _empty_rig_setup() -> Dict:
-    """Standard-Structure für rig_setup, inkl. Hersteller- und Strom-Felder."""
-    return {
-        # globale Hersteller-Präferenz
-        "main_brand": "",
-        "manufacturer": "",  # altes Feld, bleibt für Kompatibilität
-
-        # Spots
-        "spots": "",
-        "manufacturer_spots": "",
-        "universe_spots": "",
-        "address_spots": "",
-        "watt_spots": "",
-        "phase_spots": "",
-        "models_spots": [],
-        "modes_spots": [],
-        "spots_items": [],
-
-        # Washes
-        "washes": "",
-        "manufacturer_washes": "",
-        "universe_washes": "",
-        "address_washes": "",
-        "watt_washes": "",
-        "phase_washes": "",
-        "models_washes": [],
-        "modes_washes": [],
-
-        # Beams
-        "beams": "",
-        "manufacturer_beams": "",
-        "universe_beams": "",
-        "address_beams": "",
-        "watt_beams": "",
-        "phase_beams": "",
-        "models_beams": [],
-        "modes_beams": [],
-
-        # Blinder
-        "blinders": "",
-        "manufacturer_blinders": "",
-        "universe_blinders": "",
-        "address_blinders": "",
-        "watt_blinders": "",
-        "phase_blinders": "",
-        "models_blinders": [],
-        "modes_blinders": [],
-
-        # Strobes
-        "strobes": "",
-        "manufacturer_strobes": "",
-        "universe_strobes": "",
-        "address_strobes": "",
-        "watt_strobes": "",
-        "phase_strobes": "",
-        "models_strobes": [],
-        "modes_strobes": [],
-
-        # Positionen / Truss / Hinweise
-        "positions": "",
-        "notes": "",
-        "count_spots": "",
-        "count_washes": "",
-        "count_beams": "",
-        "count_blinders": "",
-        "count_strobes": "",
-        "truss_info": "",
-        "truss_height": "",
-        "specials": "",
-
-        # Strom / Infrastruktur
-        "power_main": "",
-        "power_light": "",
-        "power_sound": "",
-        "power_video": "",
-        "power_foh": "",
-        "power_other": "",
-    }
+    """Standard-Structure für rig_setup (siehe core/rig_model.py)."""
+    return rig_model.empty_rig()
 
 
 def _empty_checklists() -> Dict:
@@ -138,8 +69,9 @@ def _empty_checklists() -> Dict:
 
 def load_data() -> None:
     """Lädt Shows + IDs aus shows.json, falls vorhanden, und sorgt für Defaults."""
-    global shows, next_show_id, next_song_id, next_check_item_id
+    global shows, next_show_id, next_song_id, next_check_item_id, data_generation
 
+    data_generation += 1
     if not os.path.exists(DATA_FILE):
         return
 
@@ -187,16 +119,16 @@ def load_data() -> None:
             s.setdefault("special_notes", "")
             s.setdefault("general_notes", "")
             s.setdefault("prop_images", [])
+        # Reihenfolge = Sortierschlüssel (Liste bleibt danach sortiert)
+        songs_list.sort(key=_song_key)
         show["songs"] = songs_list
 
-        # Rig-Struktur
+        # Rig-Struktur (Altdaten werden einmalig migriert, Zahlen geparst)
         rig = show.get("rig_setup")
         if not isinstance(rig, dict):
             rig = _empty_rig_setup()
         else:
-            defaults = _empty_rig_setup()
-            for key, default_val in defaults.items():
-                rig.setdefault(key, default_val)
+            rig_model.upgrade(rig)
         show["rig_setup"] = rig
 
         # Checklisten-Struktur
@@ -221,14 +153,34 @@ def load_data() -> None:
 
 def save_data() -> None:
     """Speichert Shows + IDs nach shows.json."""
+    global data_generation
+    data_generation += 1
     data = {
         "shows": shows,
         "next_show_id": next_show_id,
         "next_song_id": next_song_id,
         "next_check_item_id": next_check_item_id,
     }
+    # Erst komplett serialisieren, dann in einem Rutsch schreiben (json.dump schreibt stückweise)
+    raw = json.dumps(data, ensure_ascii=False, indent=2)
     with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write(raw)
+
+    # Medien-Index (Datei -> Shows/Songs) nachziehen; Fehler dort dürfen das Speichern nicht verhindern
+    try:
+        from services import media_index
+        media_index.sync_shows(shows)
+    except Exception as e:
+        print(f"[MEDIA] Index konnte nicht aktualisiert werden: {e}")
+
+
+def show_version(show: Show) -> str:
+    """
+    Inhaltsversion einer Show (kurzer Hash über alle Felder). Ändert sich bei
+    jeder Änderung, egal über welche Route; Schlüssel für gecachte Teilansichten.
+    """
+    raw = json.dumps(show, ensure_ascii=False, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=8).hexdigest()
 
 
 def find_show(show_id: int) -> Optional[Show]:
@@ -286,11 +238,12 @@ def create_song(
     """Fügt der Show einen neuen Song/Szene hinzu."""
     global next_song_id
 
-    order_index = len(show["songs"]) + 1
+    songs = show["songs"]
+    order_index = math.floor(_song_key(songs[-1])) + 1 if songs else 1
 
     song: Song = {
         "id": next_song_id,
-        "name": name or f"Song {order_index}",
+        "name": name or f"Song {len(songs) + 1}",
         "order_index": order_index,
         "mood": mood or "",
         "colors": colors or "",
@@ -305,13 +258,78 @@ def create_song(
     return song
 
 
-def remove_song_from_show(show: Show, song_id: int) -> None:
-    """Entfernt einen Song aus der Show und nummeriert neu durch."""
+def remove_song_from_show(show: Show, song_id: int) -> Optional[Song]:
+    """
+    Entfernt einen Song aus der Show und gibt ihn zurück. Die übrigen
+    Sortierschlüssel bleiben; Cue-Nummern ergeben sich beim Lesen neu.
+    """
     songs_list = show.get("songs", [])
-    songs_list = [s for s in songs_list if s.get("id") != song_id]
-    for idx, s in enumerate(songs_list, start=1):
-        s["order_index"] = idx
-    show["songs"] = songs_list
+    index = next((i for i, s in enumerate(songs_list) if s.get("id") == song_id), None)
+    if index is None:
+        return None
+    return songs_list.pop(index)
+
+
+# -----------------------------------------------------------------------------#
+# Reihenfolge der Songs
+# -----------------------------------------------------------------------------#
+# order_index ist ein Sortierschlüssel, keine fortlaufende Nummer: Verschieben
+# setzt nur den Schlüssel des verschobenen Songs (Mitte zwischen den neuen
+# Nachbarn). Erst wenn die Lücke zu klein wird, wird neu durchnummeriert.
+# Cue-Nummern leitet services/cue_list beim Lesen aus der Reihenfolge ab.
+
+_MIN_KEY_GAP = 1e-6
+
+
+def _song_key(song: Song) -> float:
+    try:
+        return float(song.get("order_index"))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def rebalance_song_keys(show: Show) -> List[tuple]:
+    """Setzt die Schlüssel wieder auf 1..n; gibt [(alter Schlüssel, Song)] der geänderten zurück."""
+    changed = []
+    for idx, song in enumerate(show.get("songs", []), start=1):
+        old = song.get("order_index")
+        if old != idx:
+            song["order_index"] = idx
+            changed.append((old, song))
+    return changed
+
+
+def move_song(show: Show, song_id: int, position: int) -> List[tuple]:
+    """
+    Verschiebt einen Song an eine Position (0-basiert, in der neuen Reihenfolge).
+
+    Returns:
+        [(alter Schlüssel, Song)] der geänderten Songs – normalerweise nur
+        der verschobene, beim Neu-Durchnummerieren alle betroffenen.
+    """
+    songs = show.get("songs", [])
+    index = next((i for i, s in enumerate(songs) if s.get("id") == song_id), None)
+    if index is None:
+        return []
+    position = max(0, min(int(position), len(songs) - 1))
+    if position == index:
+        return []
+
+    song = songs.pop(index)
+    songs.insert(position, song)
+    old = song.get("order_index")
+    before = _song_key(songs[position - 1]) if position > 0 else None
+    after = _song_key(songs[position + 1]) if position + 1 < len(songs) else None
+    if before is None:
+        song["order_index"] = math.floor(after) - 1
+    elif after is None:
+        song["order_index"] = math.floor(before) + 1
+    elif after - before < _MIN_KEY_GAP:
+        return rebalance_song_keys(show)
+    else:
+        middle = (before + after) / 2
+        song["order_index"] = int(middle) if middle.is_integer() else middle
+    return [(old, song)]
 
 
 def create_check_item(show: Show, category: str, text: str) -> None:
@@ -333,15 +351,16 @@ def create_check_item(show: Show, category: str, text: str) -> None:
     show["checklists"][category].append(item)
 
 
-def toggle_check_item(show: Show, category: str, item_id: int) -> None:
-    """Schaltet den Status eines Checklisten-Eintrags um."""
+def toggle_check_item(show: Show, category: str, item_id: int) -> Optional[Dict]:
+    """Schaltet den Status eines Checklisten-Eintrags um und gibt ihn zurück."""
     if "checklists" not in show or category not in show["checklists"]:
-        return
+        return None
 
     for item in show["checklists"][category]:
         if item.get("id") == item_id:
             item["done"] = not item.get("done", False)
-            break
+            return item
+    return None
 
 
 def delete_check_item(show: Show, category: str, item_id: int) -> None:
@@ -451,16 +470,18 @@ def sync_entire_show_to_db(show: Show) -> None:
         rig = show.get("rig_setup") or {}
         if not isinstance(rig, dict):
             rig = {}
+        rig = rig_model.current(rig)
 
-        db_show.rig_manufacturer = (
-            rig.get("main_brand") or rig.get("manufacturer") or ""
-        )
+        db_show.rig_manufacturer = rig.get("main_brand") or ""
 
-        db_show.rig_spots = rig.get("spots", "") or ""
-        db_show.rig_washes = rig.get("washes", "") or ""
-        db_show.rig_beams = rig.get("beams", "") or ""
-        db_show.rig_blinders = rig.get("blinders", "") or ""
-        db_show.rig_strobes = rig.get("strobes", "") or ""
+        # Anzahl pro Kategorie aus der Fixture-Tabelle
+        from services import fixture_table
+        counts = fixture_table.get_table(rig).count_by_category()
+        db_show.rig_spots = str(counts["spots"] or "")
+        db_show.rig_washes = str(counts["washes"] or "")
+        db_show.rig_beams = str(counts["beams"] or "")
+        db_show.rig_blinders = str(counts["blinders"] or "")
+        db_show.rig_strobes = str(counts["strobes"] or "")
 
         db_show.rig_positions = rig.get("positions", "") or ""
         db_show.rig_notes = rig.get("notes", "") or ""
@@ -477,17 +498,7 @@ def sync_entire_show_to_db(show: Show) -> None:
         songs_list = show.get("songs") or []
         if isinstance(songs_list, list):
             for s in songs_list:
-                db_song = SongModel(
-                    show_id=show_id,
-                    order_index=s.get("order_index", 1) or 1,
-                    name=s.get("name", "") or "",
-                    mood=s.get("mood", "") or "",
-                    colors=s.get("colors", "") or "",
-                    movement_style=s.get("movement_style", "") or "",
-                    eye_candy=s.get("eye_candy", "") or "",
-                    special_notes=s.get("special_notes", "") or "",
-                    general_notes=s.get("general_notes", "") or "",
-                )
+                db_song = SongModel(show_id=show_id, **_song_columns(s))
                 db.session.add(db_song)
 
         # Checklisten: ebenfalls komplett neu schreiben
@@ -515,6 +526,80 @@ def sync_entire_show_to_db(show: Show) -> None:
         print(f"[DB-SYNC] Fehler beim Synchronisieren der Show {show_id}: {e}")
 
 
+def _song_columns(song: Song) -> Dict:
+    return {
+        "order_index": _song_key(song),
+        "name": song.get("name", "") or "",
+        "mood": song.get("mood", "") or "",
+        "colors": song.get("colors", "") or "",
+        "movement_style": song.get("movement_style", "") or "",
+        "eye_candy": song.get("eye_candy", "") or "",
+        "special_notes": song.get("special_notes", "") or "",
+        "general_notes": song.get("general_notes", "") or "",
+    }
+
+
+def sync_songs_to_db(show: Show, changed: List[tuple], removed: List = ()) -> None:
+    """
+    Spiegelt nur geänderte Songs in die DB statt der ganzen Show.
+
+    Args:
+        changed: Liste (bisheriger order_index, Song mit ggf. neuem order_index)
+        removed: order_index gelöschter Songs
+
+    Die DB-Zeilen werden über (show_id, order_index) gefunden. Passt die DB
+    nicht zum JSON (z.B. noch nie gespiegelt), wird die ganze Show gespiegelt.
+    """
+    show_id = show.get("id")
+    if show_id is None or not (changed or removed):
+        return
+    old_keys = [old for old, _ in changed] + list(removed)
+    try:
+        rows = SongModel.query.filter(
+            SongModel.show_id == show_id, SongModel.order_index.in_(old_keys)
+        ).all()
+        by_key = {row.order_index: row for row in rows}
+        in_sync = (
+            len(rows) == len(by_key) == len(set(old_keys)) == len(old_keys)
+            and SongModel.query.filter_by(show_id=show_id).count() == len(show.get("songs") or []) + len(removed)
+        )
+        if not in_sync:
+            sync_entire_show_to_db(show)
+            return
+        for old_key, song in changed:
+            for column, value in _song_columns(song).items():
+                setattr(by_key[old_key], column, value)
+        for old_key in removed:
+            db.session.delete(by_key[old_key])
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"[DB-SYNC] Fehler beim Synchronisieren der Songs von Show {show_id}: {e}")
+
+
+def sync_checklist_to_db(show: Show, category: str) -> None:
+    """Schreibt nur eine Checkliste (Kategorie) der Show neu in die DB."""
+    show_id = show.get("id")
+    if show_id is None:
+        return
+    try:
+        if not db.session.get(ShowModel, show_id):
+            sync_entire_show_to_db(show)
+            return
+        ChecklistItemModel.query.filter_by(show_id=show_id, category=category).delete()
+        for item in (show.get("checklists") or {}).get(category) or []:
+            db.session.add(ChecklistItemModel(
+                show_id=show_id,
+                category=category,
+                text=item.get("text", "") or "",
+                done=bool(item.get("done", False)),
+            ))
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"[DB-SYNC] Fehler beim Synchronisieren der Checkliste {category} von Show {show_id}: {e}")
+
+
 # Beim Import einmal Daten laden
 load_data()
 
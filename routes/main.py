@@ -1,17 +1,62 @@
 from flask import Blueprint, render_template, request, redirect, url_for, session, flash, current_app, jsonify
 from core import show_logic
-from services import gdtf_api
+from services import gdtf_api, gdtf_library, gdtf_search, fixture_table
 
+import gzip
 import os
 
 main_bp = Blueprint('main', __name__)
 
+# Browser-Cache für Katalog-Antworten (danach Revalidierung per ETag -> 304)
+GDTF_MAX_AGE = 600
+# Kleinere Antworten lohnen das Komprimieren nicht
+GZIP_MIN_SIZE = 1024
+
+
+def _gdtf_available(gdtf_user, gdtf_password):
+    """GDTF-Login hinterlegt – oder lokale GDTF-Bibliothek vorhanden (offline)."""
+    return bool(gdtf_user and gdtf_password) or bool(gdtf_library.entries())
+
+
+def _gdtf_catalog_response(gdtf_user, gdtf_password, build):
+    """
+    JSON-Antwort aus dem GDTF-Katalog mit HTTP-Caching:
+    - ETag = Katalog-Version; passt If-None-Match, gibt es 304, ohne dass
+      `build` aufgerufen wird
+    - Cache-Control: private (hinter dem Login), max-age=GDTF_MAX_AGE
+    - gzip, wenn der Browser es annimmt
+    """
+    version = gdtf_api.catalog_version()
+    if version and request.if_none_match.contains(f"gdtf-{version}"):
+        # Katalog ggf. im Hintergrund erneuern, wie beim normalen Zugriff
+        gdtf_api.prefetch_catalog(gdtf_user, gdtf_password)
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(build())
+        version = gdtf_api.catalog_version()
+        if response.content_length and response.content_length >= GZIP_MIN_SIZE \
+                and request.accept_encodings['gzip']:
+            response.set_data(gzip.compress(response.get_data(), compresslevel=6))
+            response.headers['Content-Encoding'] = 'gzip'
+
+    response.vary.add('Accept-Encoding')
+    if version:
+        response.set_etag(f"gdtf-{version}")
+        response.cache_control.private = True
+        response.cache_control.max_age = GDTF_MAX_AGE
+    else:
+        # Noch kein Katalog (z.B. GDTF Share nicht erreichbar): nicht cachen
+        response.cache_control.no_store = True
+    return response
+
+
 # GDTF API Endpoint: Fixtures für Hersteller (für Autocomplete)
 @main_bp.route('/api/gdtf/fixtures/<manufacturer>')
 def api_gdtf_fixtures(manufacturer):
     """
-    Gibt alle Modelle eines Herstellers aus GDTF Share zurück.
-    Wird vom Frontend für Autocomplete genutzt.
+    Gibt die Modell-Namen eines Herstellers aus GDTF Share zurück.
+    Wird vom Frontend für Autocomplete genutzt; Modes gibt es pro Fixture
+    über /api/gdtf/modes.
     """
     if 'user' not in session:
         return jsonify({'error': 'Nicht eingeloggt', 'models': []}), 401
@@ -19,27 +64,58 @@ def api_gdtf_fixtures(manufacturer):
     gdtf_user = session.get('gdtf_user', '')
     gdtf_password = session.get('gdtf_password', '')
     
-    if not gdtf_user or not gdtf_password:
+    if not _gdtf_available(gdtf_user, gdtf_password):
         return jsonify({
             'error': 'GDTF Login fehlt. Bitte unter Einstellungen hinterlegen.',
             'models': []
         }), 400
     
-    try:
-        fixtures = gdtf_api.get_fixtures_by_manufacturer(gdtf_user, gdtf_password, manufacturer)
-        # Nur Namen für Autocomplete
-        models = list(set(f.get('fixture', '') for f in fixtures if f.get('fixture')))
-        models.sort()
-        return jsonify({
+    def build():
+        models = gdtf_api.get_model_names_by_manufacturer(gdtf_user, gdtf_password, manufacturer)
+        return {
             'manufacturer': manufacturer,
             'models': models,
-            'fixtures': fixtures,  # Vollständige Daten inkl. Modes
             'count': len(models)
-        })
+        }
+
+    try:
+        return _gdtf_catalog_response(gdtf_user, gdtf_password, build)
     except Exception as e:
         return jsonify({'error': str(e), 'models': []}), 500
 
 
+# GDTF API Endpoint: Freitextsuche (Hersteller + Modell, tippfehlertolerant)
+@main_bp.route('/api/gdtf/search')
+def api_gdtf_search():
+    """
+    Sucht im GDTF-Katalog nach "Hersteller Modell" (z.B. "robe megapointe").
+    Parameter: q (Suchtext), limit (Anzahl Treffer).
+    """
+    if 'user' not in session:
+        return jsonify({'error': 'Nicht eingeloggt', 'results': []}), 401
+
+    gdtf_user = session.get('gdtf_user', '')
+    gdtf_password = session.get('gdtf_password', '')
+
+    if not _gdtf_available(gdtf_user, gdtf_password):
+        return jsonify({'error': 'GDTF Login fehlt', 'results': []}), 400
+
+    query = request.args.get('q', '')
+    limit = request.args.get('limit', gdtf_search.DEFAULT_LIMIT, type=int)
+    def build():
+        results = gdtf_search.search_fixtures(gdtf_user, gdtf_password, query, limit)
+        return {
+            'query': query,
+            'results': results,
+            'count': len(results)
+        }
+
+    try:
+        return _gdtf_catalog_response(gdtf_user, gdtf_password, build)
+    except Exception as e:
+        return jsonify({'error': str(e), 'results': []}), 500
+
+
 # GDTF API Endpoint: Modes für ein spezifisches Fixture
 @main_bp.route('/api/gdtf/modes/<manufacturer>/<fixture_name>')
 def api_gdtf_modes(manufacturer, fixture_name):
@@ -52,16 +128,18 @@ def api_gdtf_modes(manufacturer, fixture_name):
     gdtf_user = session.get('gdtf_user', '')
     gdtf_password = session.get('gdtf_password', '')
     
-    if not gdtf_user or not gdtf_password:
+    if not _gdtf_available(gdtf_user, gdtf_password):
         return jsonify({'error': 'GDTF Login fehlt', 'modes': []}), 400
     
-    try:
-        modes = gdtf_api.get_modes_for_fixture(gdtf_user, gdtf_password, manufacturer, fixture_name)
-        return jsonify({
+    def build():
+        return {
             'manufacturer': manufacturer,
             'fixture': fixture_name,
-            'modes': modes
-        })
+            'modes': gdtf_api.get_modes_for_fixture(gdtf_user, gdtf_password, manufacturer, fixture_name)
+        }
+
+    try:
+        return _gdtf_catalog_response(gdtf_user, gdtf_password, build)
     except Exception as e:
         return jsonify({'error': str(e), 'modes': []}), 500
 
@@ -75,7 +153,7 @@ def gdtf_fixture_search():
     gdtf_user = session.get('gdtf_user', '')
     gdtf_password = session.get('gdtf_password', '')
     
-    if not gdtf_user or not gdtf_password:
+    if not _gdtf_available(gdtf_user, gdtf_password):
         flash('Bitte zuerst GDTF Login-Daten in den Einstellungen hinterlegen.', 'warning')
         return redirect(url_for('main.settings'))
     
@@ -102,6 +180,9 @@ def settings():
         autosave_interval = request.form.get('autosave_interval', '0')
         session['autosave_interval'] = autosave_interval
         gdtf_api.clear_cache()  # Cache leeren bei neuen Credentials
+        if gdtf_user and gdtf_password:
+            # Katalog schon jetzt im Hintergrund laden, damit die Autovervollständigung nicht wartet
+            gdtf_api.prefetch_catalog(gdtf_user, gdtf_password)
         saved = True
     gdtf_user = session.get('gdtf_user', '')
     gdtf_password = session.get('gdtf_password', '')
@@ -109,66 +190,30 @@ def settings():
     return render_template('settings.html', 
                            gdtf_user=gdtf_user, 
                            gdtf_password=gdtf_password,
+                           gdtf_library_count=len(gdtf_library.entries()),
+                           gdtf_library_dir=gdtf_library.LIBRARY_DIR,
                            autosave_interval=autosave_interval, 
                            saved=saved,
                            gdtf_error=gdtf_error)
 
-# Helper: Lampen zählen
+# Lokale GDTF-Bibliothek neu einlesen (Offline-Betrieb)
+@main_bp.route('/settings/gdtf_library', methods=['POST'])
+def ingest_gdtf_library():
+    if 'user' not in session:
+        return redirect(url_for('main.login'))
+    stats = gdtf_library.ingest()
+    message = f"GDTF-Bibliothek eingelesen: {stats['files']} Dateien, {stats['parsed']} neu"
+    if stats['failed']:
+        flash(f"{message}, {stats['failed']} fehlerhaft.", 'warning')
+    else:
+        flash(f"{message}.", 'success')
+    return redirect(url_for('main.settings'))
+
+# Helper: Lampen zählen (Summe der Anzahl-Spalte der Fixture-Tabelle)
 def calculate_total_lamps(rig):
     if not rig:
         return 0
-    total = 0
-    
-    # Helper to safe-int
-    def safe_int(val):
-        try:
-            return int(val)
-        except (ValueError, TypeError):
-            return 0
-
-    # 1. Spots
-    if rig.get('spots_items'):
-        for it in rig['spots_items']:
-            total += safe_int(it.get('count'))
-    else:
-        total += safe_int(rig.get('spots'))
-
-    # 2. Washes
-    if rig.get('washes_items'):
-        for it in rig['washes_items']:
-            total += safe_int(it.get('count'))
-    else:
-        total += safe_int(rig.get('washes'))
-
-    # 3. Beams
-    if rig.get('beams_items'):
-        for it in rig['beams_items']:
-            total += safe_int(it.get('count'))
-    else:
-        total += safe_int(rig.get('beams'))
-
-    # 4. Blinders
-    if rig.get('blinders_items'):
-        for it in rig['blinders_items']:
-            total += safe_int(it.get('count'))
-    else:
-        # Blinder legacy input was named rig_blinders__count[] originally too? 
-        # Check show_logic: "blinders": "" defaults to string.
-        total += safe_int(rig.get('blinders'))
-
-    # 5. Strobes
-    if rig.get('strobes_items'):
-        for it in rig['strobes_items']:
-            total += safe_int(it.get('count'))
-    else:
-        total += safe_int(rig.get('strobes'))
-
-    # 6. Custom Devices
-    if rig.get('custom_devices'):
-        for it in rig['custom_devices']:
-            total += safe_int(it.get('count'))
-
-    return total
+    return fixture_table.get_table(rig).total_count()
 
 # Dashboard: Show creation form + show list
 @main_bp.route('/', methods=['GET', 'POST'])
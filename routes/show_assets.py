@@ -1,12 +1,59 @@
-from flask import Blueprint, request, redirect, url_for, abort, current_app
+from flask import Blueprint, request, redirect, url_for, abort, current_app, jsonify, send_file
 from pathlib import Path
 import werkzeug
-import uuid
 from core.show_logic import find_show, save_data
+from services import media_service, media_store, upload_service
 
 
 show_assets_bp = Blueprint('show_assets', __name__)
 
+
+def _props_dir() -> Path:
+    return Path(current_app.root_path) / "static" / "props"
+
+
+def _videos_dir() -> Path:
+    return Path(current_app.root_path) / "static" / "videos"
+
+
+def _video_upload_dir() -> Path:
+    # Teildateien liegen außerhalb von static/ (nicht öffentlich erreichbar)
+    return Path(current_app.config.get("VIDEO_UPLOAD_DIR") or Path(current_app.instance_path) / "video_uploads")
+
+
+@show_assets_bp.app_template_global("prop_image_url")
+def prop_image_url(filename: str, variant: str = "thumb") -> str:
+    """URL eines Requisiten-Bildes in der gewünschten Variante (thumb | medium | original)."""
+    name = media_service.variant_filename(_props_dir(), filename, variant)
+    return url_for("show_assets.serve_media", kind="props", filename=name)
+
+
+@show_assets_bp.route("/media/<kind>/<path:filename>", methods=["GET"])
+def serve_media(kind: str, filename: str):
+    """
+    Liefert Requisiten-Bilder und Videos aus:
+    - Range-Requests (206) fürs Spulen im Video-Player
+    - starker ETag aus dem Inhalt -> 304 bei If-None-Match
+    - Cache-Control: public, immutable (Dateinamen sind eindeutig)
+    Ohne Range nutzt Werkzeug `wsgi.file_wrapper` (sendfile beim WSGI-Server),
+    mit USE_X_SENDFILE übernimmt der vorgeschaltete Webserver die Auslieferung.
+    """
+    base_dir = {"props": _props_dir, "videos": _videos_dir}.get(kind)
+    if base_dir is None:
+        abort(404)
+    path = werkzeug.security.safe_join(str(base_dir()), filename)
+    if path is None or not Path(path).is_file():
+        abort(404)
+
+    response = send_file(
+        path,
+        conditional=True,
+        etag=media_service.content_etag(Path(path)),
+        max_age=media_service.MEDIA_MAX_AGE,
+    )
+    response.cache_control.immutable = True
+    return response
+
 @show_assets_bp.route("/show/<int:show_id>/upload_prop_image", methods=["POST"])
 def upload_prop_image(show_id: int):
     show = find_show(show_id)
@@ -16,17 +63,19 @@ def upload_prop_image(show_id: int):
     file = request.files.get("prop_image")
     if file and file.filename:
         ext = werkzeug.utils.secure_filename(file.filename).rsplit(".", 1)[-1].lower()
-        fname = f"{show_id}_{uuid.uuid4().hex[:8]}.{ext}"
-        save_path = Path(current_app.root_path) / "static" / "props" / fname
-        file.save(str(save_path))
-        
+        # Inhaltsadressiert: gleiches Bild -> gleiche Datei (nur einmal gespeichert)
+        fname, created = media_store.store_stream(file.stream, "props", _props_dir(), ext)
+        if created:
+            # Thumbnail + Vorschau im Hintergrund erzeugen (Original bleibt erhalten)
+            media_service.schedule_derivatives(_props_dir() / fname)
+
+        target = show
         if song_id:
-            for song in show.get("songs", []):
-                if song.get("id") == song_id:
-                    song.setdefault("prop_images", []).append(fname)
-                    break
-        else:
-            show.setdefault("prop_images", []).append(fname)
+            target = next((s for s in show.get("songs", []) if s.get("id") == song_id), None)
+        if target is not None:
+            images = target.setdefault("prop_images", [])
+            if fname not in images:
+                images.append(fname)
         
         save_data()
     return redirect(url_for("show_details.show_detail", show_id=show_id, tab="props"))
@@ -54,7 +103,8 @@ def delete_prop_image(show_id: int, filename: str):
     if found:
         save_data()
         try:
-            (Path(current_app.root_path) / "static" / "props" / filename).unlink(missing_ok=True)
+            # Datei erst löschen, wenn keine andere Show/kein Song mehr darauf verweist
+            media_store.release("props", filename, _props_dir())
         except Exception:
             pass
             
@@ -71,10 +121,9 @@ def upload_video(show_id: int):
     file = request.files.get("video")
     if file and file.filename:
         ext = werkzeug.utils.secure_filename(file.filename).rsplit(".", 1)[-1].lower()
-        fname = f"{show_id}_{uuid.uuid4().hex[:8]}.{ext}"
-        save_path = Path(current_app.root_path) / "static" / "videos" / fname
-        file.save(str(save_path))
-        show["videos"].append(fname)
+        fname, _ = media_store.store_stream(file.stream, "videos", _videos_dir(), ext)
+        if fname not in show["videos"]:
+            show["videos"].append(fname)
         save_data()
     return redirect(url_for("show_details.show_detail", show_id=show_id, tab="videos"))
 
@@ -88,7 +137,95 @@ def delete_video(show_id: int, filename: str):
         show["videos"].remove(filename)
         save_data()
         try:
-            (Path(current_app.root_path) / "static" / "videos" / filename).unlink(missing_ok=True)
+            media_store.release("videos", filename, _videos_dir())
         except Exception:
             pass
     return redirect(url_for("show_details.show_detail", show_id=show_id, tab="videos"))
+
+
+# ---------------------------------------------------------------------------
+# Chunked / fortsetzbarer Video-Upload (ohne 100-MB-Grenze)
+# ---------------------------------------------------------------------------
+
+def _upload_error(e: upload_service.UploadError):
+    payload = {"error": str(e)}
+    if e.offset is not None:
+        payload["offset"] = e.offset
+    return jsonify(payload), e.status
+
+
+@show_assets_bp.route("/show/<int:show_id>/video_uploads", methods=["POST"])
+def create_video_upload(show_id: int):
+    """Startet einen Upload. JSON: {filename, size, sha256 (optional, ganze Datei)}"""
+    if not find_show(show_id):
+        abort(404)
+    data = request.get_json(silent=True) or {}
+    try:
+        status = upload_service.create_upload(
+            _video_upload_dir(), show_id, data.get("filename", ""), data.get("size"), data.get("sha256", "")
+        )
+    except upload_service.UploadError as e:
+        return _upload_error(e)
+    return jsonify(status), 201
+
+
+@show_assets_bp.route("/show/<int:show_id>/video_uploads/<upload_id>", methods=["GET"])
+def video_upload_status(show_id: int, upload_id: str):
+    """Offset, ab dem ein abgebrochener Upload fortgesetzt werden kann."""
+    try:
+        return jsonify(upload_service.get_status(_video_upload_dir(), upload_id, show_id))
+    except upload_service.UploadError as e:
+        return _upload_error(e)
+
+
+@show_assets_bp.route("/show/<int:show_id>/video_uploads/<upload_id>", methods=["PUT"])
+def upload_video_chunk(show_id: int, upload_id: str):
+    """
+    Ein Chunk als Roh-Body. Header:
+      Upload-Offset   – Byte-Position des Chunks in der Datei
+      X-Chunk-SHA256  – Prüfsumme des Chunks (hex)
+    """
+    # Eigene Obergrenze pro Chunk statt der globalen MAX_CONTENT_LENGTH
+    request.max_content_length = upload_service.MAX_CHUNK_BYTES
+    offset = request.headers.get("Upload-Offset", type=int)
+    if offset is None:
+        return jsonify({"error": "Upload-Offset fehlt"}), 400
+    try:
+        status = upload_service.write_chunk(
+            _video_upload_dir(),
+            upload_id,
+            show_id,
+            offset,
+            request.stream,
+            request.content_length or 0,
+            request.headers.get("X-Chunk-SHA256", ""),
+        )
+    except upload_service.UploadError as e:
+        return _upload_error(e)
+    return jsonify(status)
+
+
+@show_assets_bp.route("/show/<int:show_id>/video_uploads/<upload_id>/complete", methods=["POST"])
+def complete_video_upload(show_id: int, upload_id: str):
+    """Setzt die Datei zusammen und hängt sie an die Show an."""
+    show = find_show(show_id)
+    if not show:
+        abort(404)
+    try:
+        fname = upload_service.complete_upload(_video_upload_dir(), upload_id, show_id, _videos_dir())
+    except upload_service.UploadError as e:
+        return _upload_error(e)
+    videos = show.setdefault("videos", [])
+    if fname not in videos:
+        videos.append(fname)
+    save_data()
+    return jsonify({"filename": fname})
+
+
+@show_assets_bp.route("/show/<int:show_id>/video_uploads/<upload_id>", methods=["DELETE"])
+def abort_video_upload(show_id: int, upload_id: str):
+    try:
+        upload_service.abort_upload(_video_upload_dir(), upload_id, show_id)
+    except upload_service.UploadError as e:
+        return _upload_error(e)
+    return jsonify({"status": "aborted"})
@@ -1,16 +1,114 @@
+from collections import OrderedDict
+import threading
+
 from flask import Blueprint, render_template, request, redirect, url_for, abort, session, current_app, jsonify
-from core.show_logic import find_show, save_data, sync_entire_show_to_db, MANUFACTURERS, create_song, create_check_item, toggle_check_item, remove_show, delete_check_item
+from markupsafe import Markup
+from core.show_logic import find_show, save_data, sync_entire_show_to_db, sync_songs_to_db, sync_checklist_to_db, MANUFACTURERS, create_song, remove_song_from_show, create_check_item, toggle_check_item, remove_show, delete_check_item, show_version
 from core.models import db, Show as ShowModel, ContactPersonModel
+from core import rig_model, show_logic
 
 from services.power_service import calculate_rig_power
+from services import cue_list, fixture_table, gdtf_api, media_index, media_service, patch_service
 
 show_details_bp = Blueprint('show_details', __name__)
 
+# Tab -> (Partial, Modul, das den Tab freischaltet; None = immer vorhanden)
+TABS = {
+    "meta": ("partials/show_meta_tab.html", "stammdaten"),
+    "rig": ("partials/show_rig_tab.html", "patch"),
+    "rig_plan": ("partials/rig_editor_tab.html", None),
+    "songs": ("partials/show_songs_tab.html", "cuelist"),
+    "contacts": ("partials/show_contacts_tab.html", "kontakte"),
+    "regie": ("partials/show_regie_tab.html", None),
+    "props": ("partials/show_props_tab.html", "requisiten"),
+    "videos": ("partials/show_videos_tab.html", "video"),
+}
+DEFAULT_MODULES = "stammdaten,cuelist,patch,kontakte,requisiten,video"
+CHECKLIST_CATEGORIES = ("preproduction", "aufbau", "show")
+
+# Formularfeld -> Song-Feld (Songs-Tab und Regie-Ansicht)
+SONG_FORM_FIELDS = (
+    ("song_name", "name"),
+    ("song_mood", "mood"),
+    ("song_colors", "colors"),
+    ("song_movement_style", "movement_style"),
+    ("song_eye_candy", "eye_candy"),
+    ("song_special_notes", "special_notes"),
+    ("song_general_notes", "general_notes"),
+)
+
+# Gerenderte Tab-Fragmente pro (Show, Show-Version, Tab, …). Das CSRF-Token
+# wird erst beim Ausliefern eingesetzt, damit ein Fragment für alle Sessions gilt.
+_FRAGMENT_CACHE_SIZE = 64
+_fragment_cache: "OrderedDict[tuple, str]" = OrderedDict()
+_fragment_lock = threading.Lock()
+_CSRF_PLACEHOLDER = "__CUEX_CSRF_TOKEN__"
+
+
+def _enabled_tabs(show) -> list:
+    modules = (show.get("modules") or DEFAULT_MODULES).split(",")
+    return [tab for tab, (_, module) in TABS.items() if module is None or module in modules]
+
+
+def _tab_data(show, tab: str):
+    """
+    (zusätzliche Key-Teile, Kontext-Builder) für einen Tab. Teure Daten
+    (Strom, Patch) berechnet der Builder erst, wenn das Fragment fehlt.
+    """
+    if tab == "rig":
+        rig = show.get("rig_setup", {}) or {}
+        # Footprints im Patch-Bericht hängen vom GDTF-Katalog ab
+        return (gdtf_api.catalog_version(),), lambda: {
+            "rig_power_summary": calculate_rig_power(rig),
+            "patch_report": patch_service.analyze_rig(rig),
+        }
+    if tab == "contacts":
+        db_show = db.session.get(ShowModel, show["id"])
+        contacts = list(db_show.contacts) if db_show else []
+        key = tuple((c.id, c.role, c.name, c.company, c.phone, c.email, c.notes) for c in contacts)
+        return key, lambda: {"contacts": contacts}
+    if tab == "props":
+        # Bild-URLs zeigen aufs Original, bis Thumbnail/Vorschau erzeugt sind
+        return (request.args.get("song_id", ""), media_service.derivatives_version()), dict
+    return (), dict
+
+
+def render_tab(show, tab: str) -> Markup:
+    """HTML eines Tabs, gecacht pro Show-Version."""
+    extra_key, build_context = _tab_data(show, tab)
+    key = (show["id"], show_version(show), tab, extra_key)
+    with _fragment_lock:
+        html = _fragment_cache.get(key)
+        if html is not None:
+            _fragment_cache.move_to_end(key)
+    if html is None:
+        html = render_template(
+            TABS[tab][0],
+            show=show,
+            manufacturers=MANUFACTURERS,
+            active_tab=tab,
+            csrf_token=lambda: _CSRF_PLACEHOLDER,
+            **build_context(),
+        )
+        with _fragment_lock:
+            _fragment_cache[key] = html
+            while len(_fragment_cache) > _FRAGMENT_CACHE_SIZE:
+                _fragment_cache.popitem(last=False)
+    csrf_token = current_app.jinja_env.globals.get("csrf_token")
+    return Markup(html.replace(_CSRF_PLACEHOLDER, str(csrf_token()) if csrf_token else ""))
+
+
+def clear_fragment_cache() -> None:
+    with _fragment_lock:
+        _fragment_cache.clear()
+
 @show_details_bp.route("/show/<int:show_id>", methods=["GET"])
 def show_detail(show_id: int):
     """
     Show-Detailseite: Stammdaten, Songs, Rig, Checklisten.
-    Mit Tab-Logik: active_tab = meta | rig | songs | regie
+    Mit Tab-Logik: active_tab = meta | rig | songs | regie …
+    Serverseitig gerendert wird nur der aktive Tab; die übrigen lädt die
+    Seite beim Anklicken über show_tab_fragment nach.
     """
     show = find_show(show_id)
     if not show:
@@ -18,31 +116,32 @@ def show_detail(show_id: int):
 
     # Aktiven Tab aus Query-Parameter lesen (Standard: meta/Stammdaten)
     active_tab = request.args.get("tab", "meta")
-
-    # ---------------- GET: Rig-Power-Berechnung ----------------
-    rig = show.get("rig_setup", {}) or {}
-    rig_power_summary = calculate_rig_power(rig)
-
-    # Kontakte (aus der DB) holen
-    db_show = db.session.get(ShowModel, show_id)
-    contacts = db_show.contacts if db_show else []
+    enabled_tabs = _enabled_tabs(show)
 
     # Optional: restore values set by POST handlers (stored in session)
-    restore_scroll = session.pop('restore_scroll', None)
-    restore_tab = session.pop('restore_tab', None)
+    session.pop('restore_scroll', None)
+    session.pop('restore_tab', None)
 
-    # Template bekommt Show + Herstellerliste + aktiven Tab + Kontakte
     return render_template(
         "show_detail.html",
         show=show,
-        manufacturers=MANUFACTURERS,
         active_tab=active_tab,
-        rig_power_summary=rig_power_summary,
-        contacts=contacts,
-        restore_scroll=restore_scroll,
-        restore_tab=restore_tab,
+        enabled_tabs=enabled_tabs,
+        active_tab_html=render_tab(show, active_tab) if active_tab in enabled_tabs else "",
     )
 
+
+@show_details_bp.route("/show/<int:show_id>/tab/<tab>", methods=["GET"])
+def show_tab_fragment(show_id: int, tab: str):
+    """Ein Tab der Detailseite als HTML-Fragment (für das Nachladen beim Tab-Wechsel)."""
+    show = find_show(show_id)
+    if not show or tab not in TABS or tab not in _enabled_tabs(show):
+        abort(404)
+    response = current_app.make_response(render_tab(show, tab))
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
 @show_details_bp.route("/show/<int:show_id>/update_meta", methods=["POST"])
 def update_meta(show_id: int):
     show = find_show(show_id)
@@ -99,10 +198,10 @@ def update_rig(show_id: int):
     if not show:
         abort(404)
 
-    rig = show.setdefault("rig_setup", {})
+    rig = rig_model.upgrade(show.setdefault("rig_setup", {}))
     rig["main_brand"] = request.form.get("rig_main_brand", "").strip()
 
-    for prefix in ("spots", "washes", "beams", "blinders", "strobes"):
+    for prefix in rig_model.CATEGORIES:
         counts = request.form.getlist(f"rig_{prefix}__count[]")
         manufacturers = request.form.getlist(f"rig_{prefix}__manufacturer[]")
         models = request.form.getlist(f"rig_{prefix}__model[]")
@@ -112,28 +211,20 @@ def update_rig(show_id: int):
         watts = request.form.getlist(f"rig_{prefix}__watt[]")
         phases = request.form.getlist(f"rig_{prefix}__phase[]")
 
+        # Zahlen werden beim Speichern geparst (rig_model.normalize_item)
         items = []
         for i, c in enumerate(counts):
-            item = {
-                "count": c.strip() if c else "",
-                "manufacturer": (manufacturers[i].strip() if i < len(manufacturers) else ""),
-                "model": (models[i].strip() if i < len(models) else ""),
-                "mode": (modes[i].strip() if i < len(modes) else ""),
-                "universe": (universes[i].strip() if i < len(universes) else ""),
-                "address": (addresses[i].strip() if i < len(addresses) else ""),
-                "watt": (watts[i].strip() if i < len(watts) else ""),
-                "phase": (phases[i].strip() if i < len(phases) else ""),
-            }
-            items.append(item)
-        if items:
-            rig[f"{prefix}_items"] = items
-        else:
-            rig[f"{prefix}"] = request.form.get(f"rig_{prefix}", "").strip()
-            rig[f"manufacturer_{prefix}"] = request.form.get(f"rig_manufacturer_{prefix}", "").strip()
-            rig[f"universe_{prefix}"] = request.form.get(f"rig_universe_{prefix}", "").strip()
-            rig[f"address_{prefix}"] = request.form.get(f"rig_address_{prefix}", "").strip()
-            rig[f"watt_{prefix}"] = request.form.get(f"rig_watt_{prefix}", "").strip()
-            rig[f"phase_{prefix}"] = request.form.get(f"rig_phase_{prefix}", "").strip()
+            items.append(rig_model.normalize_item({
+                "count": c,
+                "manufacturer": manufacturers[i] if i < len(manufacturers) else "",
+                "model": models[i] if i < len(models) else "",
+                "mode": modes[i] if i < len(modes) else "",
+                "universe": universes[i] if i < len(universes) else "",
+                "address": addresses[i] if i < len(addresses) else "",
+                "watt": watts[i] if i < len(watts) else "",
+                "phase": phases[i] if i < len(phases) else "",
+            }))
+        rig[f"{prefix}_items"] = items
 
     rig["positions"] = request.form.get("rig_positions", "").strip()
     rig["notes"] = request.form.get("rig_notes", "").strip()
@@ -161,24 +252,45 @@ def update_rig(show_id: int):
             (custom_names[i] and custom_names[i].strip()) or
             (custom_manufacturers[i] and custom_manufacturers[i].strip())
         ):
-            custom_devices.append({
-                "count": custom_counts[i].strip() if i < len(custom_counts) else "",
-                "name": custom_names[i].strip() if i < len(custom_names) else "",
-                "manufacturer": custom_manufacturers[i].strip() if i < len(custom_manufacturers) else "",
-                "model": custom_models[i].strip() if i < len(custom_models) else "",
-                "mode": custom_modes[i].strip() if i < len(custom_modes) else "",
-                "universe": custom_universes[i].strip() if i < len(custom_universes) else "",
-                "address": custom_addresses[i].strip() if i < len(custom_addresses) else "",
-                "watt": custom_watts[i].strip() if i < len(custom_watts) else "",
-                "phase": custom_phases[i].strip() if i < len(custom_phases) else "",
-            })
+            custom_devices.append(rig_model.normalize_item({
+                "count": custom_counts[i],
+                "name": custom_names[i] if i < len(custom_names) else "",
+                "manufacturer": custom_manufacturers[i] if i < len(custom_manufacturers) else "",
+                "model": custom_models[i] if i < len(custom_models) else "",
+                "mode": custom_modes[i] if i < len(custom_modes) else "",
+                "universe": custom_universes[i] if i < len(custom_universes) else "",
+                "address": custom_addresses[i] if i < len(custom_addresses) else "",
+                "watt": custom_watts[i] if i < len(custom_watts) else "",
+                "phase": custom_phases[i] if i < len(custom_phases) else "",
+            }, custom=True))
     rig["custom_devices"] = custom_devices
+    rig_model.touch(rig)
 
     save_data()
     sync_entire_show_to_db(show)
     return redirect(url_for("show_details.show_detail", show_id=show_id, tab="rig"))
 
 
+@show_details_bp.route("/show/<int:show_id>/rig/auto_patch", methods=["POST"])
+def auto_patch_rig(show_id: int):
+    """Ungepatchte Rig-Einträge automatisch in freie DMX-Bereiche legen."""
+    show = find_show(show_id)
+    if not show:
+        abort(404)
+
+    strategy = request.form.get("strategy", "first_fit")
+    if strategy not in patch_service.STRATEGIES:
+        abort(400)
+
+    rig = show.setdefault("rig_setup", {})
+    assignments = patch_service.auto_patch(rig, strategy)
+    if assignments:
+        print(f"[PATCH] Show {show_id}: {len(assignments)} Eintrag/Einträge gepatcht ({strategy})")
+        save_data()
+        sync_entire_show_to_db(show)
+    return redirect(url_for("show_details.show_detail", show_id=show_id, tab="rig"))
+
+
 @show_details_bp.route("/show/<int:show_id>/add_song", methods=["POST"])
 def add_song_route(show_id: int):
     show = find_show(show_id)
@@ -206,7 +318,7 @@ def add_check_item_route(show_id: int):
         abort(404)
     category = request.form.get("category", "")
     text = request.form.get("text", "").strip()
-    if category in ("preproduction", "aufbau", "show") and text:
+    if category in CHECKLIST_CATEGORIES and text:
         create_check_item(show, category, text)
         save_data()
         sync_entire_show_to_db(show)
@@ -225,10 +337,10 @@ def toggle_check_item_route(show_id: int):
     except (TypeError, ValueError):
         item_id = None
 
-    if category in ("preproduction", "aufbau", "show") and item_id is not None:
+    if category in CHECKLIST_CATEGORIES and item_id is not None:
         toggle_check_item(show, category, item_id)
         save_data()
-        sync_entire_show_to_db(show)
+        sync_checklist_to_db(show, category)
     return redirect(url_for("show_details.show_detail", show_id=show_id, tab="meta") + "#checklists")
 
 
@@ -246,7 +358,7 @@ def update_check_item_route(show_id: int):
     text = request.form.get("text", "").strip()
 
     if (
-        category in ("preproduction", "aufbau", "show")
+        category in CHECKLIST_CATEGORIES
         and item_id is not None
         and "checklists" in show
         and isinstance(show["checklists"], dict)
@@ -290,20 +402,136 @@ def show_regie_view(show_id: int):
     return render_template("regie_view.html", show=show, songs=songs)
 
 
+def _find_song(show, song_id):
+    return next((s for s in show.get("songs", []) if s.get("id") == song_id), None)
+
+
+def _apply_song_form(song, form) -> None:
+    """Übernimmt mitgeschickte Formularfelder; ein leerer Name lässt den alten stehen."""
+    for field, key in SONG_FORM_FIELDS:
+        if field not in form:
+            continue
+        value = form.get(field, "").strip()
+        if key == "name" and not value:
+            continue
+        song[key] = value
+
+
+def _move_song(show, form) -> list:
+    """
+    Verschiebt den Song aus dem Formular: direction=up/down (ein Platz) oder
+    position=<Zielposition, 0-basiert>. Gibt [(alter order_index, Song)] zurück.
+    """
+    song_id = form.get("song_id", type=int)
+    index = next((i for i, s in enumerate(show.get("songs", [])) if s.get("id") == song_id), None)
+    if index is None:
+        return []
+    position = form.get("position", type=int)
+    if position is None:
+        direction = form.get("direction", "")
+        position = {"up": index - 1, "down": index + 1}.get(direction, index)
+    return show_logic.move_song(show, song_id, position)
+
+
+def _api_show(show_id: int):
+    """(Show, None) oder (None, Fehlerantwort) für die JSON-Endpunkte."""
+    if 'user' not in session:
+        return None, (jsonify({'error': 'Nicht eingeloggt'}), 401)
+    show = find_show(show_id)
+    if not show:
+        return None, (jsonify({'error': 'Show nicht gefunden'}), 404)
+    return show, None
+
+
+@show_details_bp.route("/api/show/<int:show_id>/cues", methods=["GET"])
+def api_show_cues(show_id: int):
+    """
+    Ausschnitt der Cue-Liste als JSON für die virtualisierten Listen.
+    Parameter: offset + limit (Positionen) oder from/to (order_index),
+    around (Song-ID), q (Suche).
+    """
+    show, error = _api_show(show_id)
+    if error:
+        return error
+    args = request.args
+    page = cue_list.cue_page(
+        show,
+        offset=args.get("offset", 0, type=int),
+        limit=args.get("limit", cue_list.DEFAULT_LIMIT, type=int),
+        start=args.get("from", type=float),
+        end=args.get("to", type=float),
+        around=args.get("around", type=int),
+        query=args.get("q", ""),
+    )
+    response = jsonify(page)
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+# --- JSON-Änderungen (Antwort: nur das geänderte Objekt + neue Show-Version) ---
+
+@show_details_bp.route("/api/show/<int:show_id>/checklists/toggle", methods=["POST"])
+def api_toggle_check_item(show_id: int):
+    show, error = _api_show(show_id)
+    if error:
+        return error
+    category = request.form.get("category", "")
+    item_id = request.form.get("item_id", type=int)
+    item = None
+    if category in CHECKLIST_CATEGORIES and item_id is not None:
+        item = toggle_check_item(show, category, item_id)
+    if item is None:
+        return jsonify({'error': 'Eintrag nicht gefunden'}), 404
+    save_data()
+    sync_checklist_to_db(show, category)
+    return jsonify({"category": category, "item": item, "version": show_version(show)})
+
+
+@show_details_bp.route("/api/show/<int:show_id>/songs/update", methods=["POST"])
+def api_update_song(show_id: int):
+    show, error = _api_show(show_id)
+    if error:
+        return error
+    song_id = request.form.get("song_id", type=int)
+    song = _find_song(show, song_id)
+    if song is None:
+        return jsonify({'error': 'Song nicht gefunden'}), 404
+    _apply_song_form(song, request.form)
+    save_data()
+    sync_songs_to_db(show, [(song.get("order_index"), song)])
+    return jsonify({"cue": cue_list.cue_for(show, song_id), "version": show_version(show)})
+
+
+@show_details_bp.route("/api/show/<int:show_id>/songs/move", methods=["POST"])
+def api_move_song(show_id: int):
+    """Verschiebt um einen Platz (direction) oder an eine beliebige Stelle (position)."""
+    show, error = _api_show(show_id)
+    if error:
+        return error
+    song_id = request.form.get("song_id", type=int)
+    if _find_song(show, song_id) is None:
+        return jsonify({'error': 'Song nicht gefunden'}), 404
+    changed = _move_song(show, request.form)
+    if changed:
+        save_data()
+        sync_songs_to_db(show, changed)
+    return jsonify({
+        "cue": cue_list.cue_for(show, song_id),
+        "changed": [cue_list.cue_for(show, s.get("id")) for _, s in changed],
+        "version": show_version(show),
+    })
+
+
 @show_details_bp.route("/show/<int:show_id>/regie/update_cue", methods=["POST"])
 def regie_update_cue(show_id: int):
     show = find_show(show_id)
     if not show:
         abort(404)
-    song_id = request.form.get("song_id", type=int)
-    name = request.form.get("song_name", "").strip()
-    special_notes = request.form.get("song_special_notes", "").strip()
-    for song in show.get("songs", []):
-        if song.get("id") == song_id:
-            song["name"] = name
-            song["special_notes"] = special_notes
-            break
-    save_data()
+    song = _find_song(show, request.form.get("song_id", type=int))
+    if song is not None:
+        _apply_song_form(song, request.form)
+        save_data()
+        sync_songs_to_db(show, [(song.get("order_index"), song)])
     return redirect(url_for("show_details.show_regie_view", show_id=show_id))
 
 
@@ -312,18 +540,10 @@ def regie_move_cue(show_id: int):
     show = find_show(show_id)
     if not show:
         abort(404)
-    song_id = request.form.get("song_id", type=int)
-    direction = request.form.get("direction")
-    songs = show.get("songs", [])
-    idx = next((i for i, s in enumerate(songs) if s.get("id") == song_id), None)
-    if idx is not None:
-        if direction == "up" and idx > 0:
-            songs[idx], songs[idx-1] = songs[idx-1], songs[idx]
-        elif direction == "down" and idx < len(songs)-1:
-            songs[idx], songs[idx+1] = songs[idx+1], songs[idx]
-        for i, s in enumerate(songs, 1):
-            s["order_index"] = i
+    changed = _move_song(show, request.form)
+    if changed:
         save_data()
+        sync_songs_to_db(show, changed)
     return redirect(url_for("show_details.show_regie_view", show_id=show_id))
 
 
@@ -332,30 +552,12 @@ def update_song(show_id: int):
     show = find_show(show_id)
     if not show:
         abort(404)
-    song_id_raw = request.form.get("song_id", "")
-    from_regie = request.form.get("from_regie")
-    try:
-        song_id = int(song_id_raw)
-    except (TypeError, ValueError):
-        if from_regie:
-            return redirect(url_for("show_details.show_regie_view", show_id=show_id))
-        return redirect(url_for("show_details.show_detail", show_id=show_id, tab="songs"))
-
-    for song in show.get("songs", []):
-        if song.get("id") == song_id:
-            name = request.form.get("song_name", "").strip()
-            if name:
-                song["name"] = name
-            song["mood"] = request.form.get("song_mood", "").strip()
-            song["colors"] = request.form.get("song_colors", "").strip()
-            song["movement_style"] = request.form.get("song_movement_style", "").strip()
-            song["eye_candy"] = request.form.get("song_eye_candy", "").strip()
-            song["special_notes"] = request.form.get("song_special_notes", "").strip()
-            song["general_notes"] = request.form.get("song_general_notes", "").strip()
-            break
-    save_data()
-    sync_entire_show_to_db(show)
-    if from_regie:
+    song = _find_song(show, request.form.get("song_id", type=int))
+    if song is not None:
+        _apply_song_form(song, request.form)
+        save_data()
+        sync_songs_to_db(show, [(song.get("order_index"), song)])
+    if request.form.get("from_regie"):
         return redirect(url_for("show_details.show_regie_view", show_id=show_id))
     return redirect(url_for("show_details.show_detail", show_id=show_id, tab="songs"))
 
@@ -365,41 +567,11 @@ def move_song(show_id: int):
     show = find_show(show_id)
     if not show:
         abort(404)
-    song_id_raw = request.form.get("song_id", "")
-    direction = request.form.get("direction", "")
-    from_regie = request.form.get("from_regie")
-
-    try:
-        song_id = int(song_id_raw)
-    except (TypeError, ValueError):
-        if from_regie:
-            return redirect(url_for("show_details.show_regie_view", show_id=show_id))
-        return redirect(url_for("show_details.show_detail", show_id=show_id, tab="songs"))
-
-    songs_list = show.get("songs", [])
-    index = None
-    for i, s in enumerate(songs_list):
-        if s.get("id") == song_id:
-            index = i
-            break
-    if index is None:
-        if from_regie:
-            return redirect(url_for("show_details.show_regie_view", show_id=show_id))
-        return redirect(url_for("show_details.show_detail", show_id=show_id, tab="songs"))
-
-    if direction == "up" and index > 0:
-        songs_list[index - 1], songs_list[index] = songs_list[index], songs_list[index - 1]
-    elif direction == "down" and index < len(songs_list) - 1:
-        songs_list[index + 1], songs_list[index] = songs_list[index], songs_list[index + 1]
-
-    for idx, s in enumerate(songs_list, start=1):
-        s["order_index"] = idx
-
-    show["songs"] = songs_list
-    save_data()
-    sync_entire_show_to_db(show)
-
-    if from_regie:
+    changed = _move_song(show, request.form)
+    if changed:
+        save_data()
+        sync_songs_to_db(show, changed)
+    if request.form.get("from_regie"):
         return redirect(url_for("show_details.show_regie_view", show_id=show_id))
     return redirect(url_for("show_details.show_detail", show_id=show_id, tab="songs"))
 
@@ -427,16 +599,10 @@ def delete_song(show_id: int):
     except (TypeError, ValueError):
         return redirect(url_for("show_details.show_detail", show_id=show_id, tab="songs"))
 
-    songs = show.get("songs", [])
-    # Filter out the song with the matching ID
-    show["songs"] = [s for s in songs if s.get("id") != song_id]
-    
-    # Re-index
-    for idx, s in enumerate(show["songs"], start=1):
-        s["order_index"] = idx
-        
-    save_data()
-    sync_entire_show_to_db(show)
+    removed = remove_song_from_show(show, song_id)
+    if removed is not None:
+        save_data()
+        sync_songs_to_db(show, [], removed=[removed.get("order_index")])
     return redirect(url_for("show_details.show_detail", show_id=show_id, tab="songs"))
 
 # --- Contact Routes ---
@@ -502,6 +668,8 @@ def delete_show(show_id: int):
     if not show:
         abort(404)
     
+    media_keys = media_index.show_keys(show)
+
     # Remove from JSON memory and save
     remove_show(show_id)
     save_data()
@@ -514,6 +682,10 @@ def delete_show(show_id: int):
             db.session.commit()
     except Exception as e:
         print(f"Error deleting show from DB: {e}")
+
+    # Bilder/Videos, die nur diese Show nutzte, im Hintergrund löschen
+    if media_keys:
+        media_index.schedule_garbage_collection(keys=media_keys)
     return redirect(url_for("main.dashboard"))
 
 
@@ -524,39 +696,23 @@ def api_get_rig(show_id: int):
         return jsonify({"error": "Show not found"}), 404
         
     rig = show.get("rig_setup", {}) or {}
-    
-    # Flatten items for the frontend
-    items = []
-    
-    # Helper to add items
-    def add_items(prefix):
-        raw_items = rig.get(f"{prefix}_items", [])
-        for it in raw_items:
-            # Check if this item group has saved positions
-            # For simplicity in V1, we might need to store positions IN the item dict.
-            # But the item dict in JSON is a list of dicts. 
-            # We need to ensure we can map them back.
-            # Ideally, we used a unique ID per fixture, but we generated them on the fly in MVR export.
-            # Here we might need to stick to the list index or add IDs if missing.
-            
-            count = 0
-            try: count = int(it.get("count", 0))
-            except: pass
-            
-            # Position data might be stored in a separate list or inside the item?
-            # Let's say we store 'positions_data': { 'spots_items_0_0': {x:100, y:100}, ... }
-            # Or we enrich the items directly in the backend if we saved them there.
-            pass
-            
-    # Actually, let's keep it simple:
-    # We return the whole rig object. The frontend can parse count/watt etc.
-    # But for positions: where do we store them?
-    # Let's verify where 'update_rig' saves data. It saves to 'rig_setup'.
-    # We can add a 'visual_plan' dict to rig_setup where keys are stable IDs.
-    
+
+    # Geräte-Gruppen aus der Fixture-Tabelle (Anzahl bereits geparst),
+    # Positionen stehen im `visual_plan` unter stabilen Keys (z.B. spots_0_3)
+    table = fixture_table.get_table(rig)
+    groups = [
+        {
+            "category": fixture_table.CATEGORIES[table.category[row]],
+            "item_idx": table.item_idx[row],
+            "count": table.count[row],
+        }
+        for row in table.rows()
+    ]
+
     visual_plan = rig.get("visual_plan", {})
     return jsonify({
         "rig": rig,
+        "groups": groups,
         "visual_plan": visual_plan
     })
 
@@ -1,4 +1,4 @@
-from flask import Blueprint, request, redirect, url_for, abort, send_file, render_template, current_app
+from flask import Blueprint, request, redirect, url_for, abort, send_file, render_template, current_app, jsonify, Response, stream_with_context
 from core.show_logic import find_show, save_data, sync_entire_show_to_db, ensure_show_in_db
 from core.models import Show as ShowModel, db
 from services.exporters.export_nomad_csv import export_cues_to_csv, export_cues_to_xlsx
@@ -10,9 +10,11 @@ from services.exporters import ma3_export
 from services.exporters import ma3_export
 from services.exporters import eos_macro
 from services.exporters import mvr_export
+from services.exporters import batch_export
 
 import io
 import json
+import math
 import html
 import re
 
@@ -93,7 +95,7 @@ def import_cuelist_pdf_commit(show_id: int):
     
     if "songs" not in show:
         show["songs"] = []
-    order_index = max([s.get("order_index", 0) for s in show["songs"]], default=0) + 1
+    order_index = math.floor(max([s.get("order_index", 0) for s in show["songs"]], default=0)) + 1
     for cue in cues:
         show["songs"].append({
             "id": int(1e6) + order_index,
@@ -162,5 +164,57 @@ def export_mvr(show_id: int):
     show = find_show(show_id)
     if not show:
         abort(404)
-    file_path = mvr_export.export_mvr_to_file(show)
+    # ?mode=update -> nur geänderte/neue Fixtures seit dem letzten Export
+    incremental = request.args.get("mode") == "update"
+    file_path = mvr_export.export_mvr_to_file(show, incremental=incremental)
     return send_file(file_path, as_attachment=True, download_name=file_path.name, mimetype="application/zip")
+
+
+@show_io_bp.route("/shows/batch_export", methods=["POST"])
+def batch_export_shows():
+    """
+    Tour-Paket: Exportiert mehrere Shows in einem ZIP-Stream.
+    Erwartet JSON (oder Formularfelder):
+      show_ids: [1, 2, ...]          – optional, sonst alle Shows
+      query, date_from, date_to      – optionale Filter
+      exporters: ["mvr", "ma3", ...] – optional, sonst alle Exporter
+    """
+    data = request.get_json(silent=True) or {}
+    if not data:
+        data = {
+            "show_ids": request.form.getlist("show_ids", type=int),
+            "query": request.form.get("query", ""),
+            "date_from": request.form.get("date_from", ""),
+            "date_to": request.form.get("date_to", ""),
+            "exporters": request.form.getlist("exporters"),
+        }
+
+    exporters = data.get("exporters") or list(batch_export.EXPORTERS.keys())
+    unknown = [e for e in exporters if e not in batch_export.EXPORTERS]
+    if unknown:
+        return jsonify({"error": f"Unbekannte Exporter: {', '.join(unknown)}"}), 400
+
+    try:
+        show_ids = [int(sid) for sid in (data.get("show_ids") or [])]
+    except (TypeError, ValueError):
+        return jsonify({"error": "Ungültige Show-IDs"}), 400
+
+    selected = batch_export.select_shows(
+        show_ids=show_ids,
+        query=data.get("query", ""),
+        date_from=data.get("date_from", ""),
+        date_to=data.get("date_to", ""),
+    )
+    if not selected:
+        return jsonify({"error": "Keine passenden Shows gefunden"}), 404
+
+    stream = batch_export.iter_batch_export_zip(
+        selected,
+        exporters=exporters,
+        app=current_app._get_current_object(),
+    )
+    return Response(
+        stream_with_context(stream),
+        mimetype="application/zip",
+        headers={"Content-Disposition": "attachment; filename=CueX_Tour_Export.zip"},
+    )
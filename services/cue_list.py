@@ -0,0 +1,169 @@
+"""
+Cue-Liste einer Show in Ausschnitten (für die virtualisierten Listen im
+Songs-Tab und in der Regie-Ansicht).
+
+Die Reihenfolge (nach order_index) wird pro Datenstand einmal indiziert.
+Eine Bereichsabfrage – nach Position oder nach order_index (bisect) – kostet
+danach nur so viel wie der Ausschnitt, egal wie lang die Cue-Liste ist.
+Suchen filtern einmal über alle Cues und werden pro Suchbegriff gemerkt.
+Cue-Nummern (1..n) werden aus dieser Reihenfolge abgeleitet, auch für die
+Exporte – order_index selbst ist nur ein Sortierschlüssel.
+"""
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import threading
+
+from core import show_logic
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+_CACHE_SIZE = 32
+_SEARCH_CACHE_SIZE = 16
+_cache: "OrderedDict[tuple, _CueIndex]" = OrderedDict()
+_lock = threading.Lock()
+
+# Felder, die eine Zeile der Liste braucht (Kopf + Bearbeiten-Formular)
+CUE_FIELDS = ("name", "mood", "colors", "movement_style", "eye_candy", "special_notes", "general_notes")
+
+
+def _to_number(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class _CueIndex:
+    """Songs einer Show sortiert nach order_index, mit Such-Cache."""
+
+    def __init__(self, songs: List[Dict]):
+        order = sorted(range(len(songs)), key=lambda i: (_to_number(songs[i].get("order_index")), i))
+        self.songs = [songs[i] for i in order]
+        self.keys = [_to_number(s.get("order_index")) for s in self.songs]
+        self.positions = {s.get("id"): pos for pos, s in enumerate(self.songs)}
+        self._haystack: Optional[List[str]] = None
+        self._searches: "OrderedDict[str, List[int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def matches(self, query: str) -> List[int]:
+        """Positionen aller Cues, deren Nummer oder Texte den Suchbegriff enthalten."""
+        with self._lock:
+            hits = self._searches.get(query)
+            if hits is not None:
+                self._searches.move_to_end(query)
+                return hits
+            if self._haystack is None:
+                self._haystack = [
+                    " ".join([str(pos + 1)] + [str(s.get(f) or "") for f in CUE_FIELDS]).lower()
+                    for pos, s in enumerate(self.songs)
+                ]
+            hits = [pos for pos, text in enumerate(self._haystack) if query in text]
+            self._searches[query] = hits
+            while len(self._searches) > _SEARCH_CACHE_SIZE:
+                self._searches.popitem(last=False)
+            return hits
+
+
+def _index_for(show: Dict) -> _CueIndex:
+    songs = show.get("songs") or []
+    # Neu indizieren nach jedem Speichern/Laden oder wenn die Liste ersetzt/verlängert wurde
+    key = (show.get("id"), show_logic.data_generation, id(songs), len(songs))
+    with _lock:
+        index = _cache.get(key)
+        if index is not None:
+            _cache.move_to_end(key)
+            return index
+    index = _CueIndex(songs)
+    with _lock:
+        _cache[key] = index
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return index
+
+
+def _cue_json(song: Dict, position: int, sort_pos: int) -> Dict:
+    cue = {
+        "id": song.get("id"),
+        "position": position,
+        "number": sort_pos + 1,
+        "order_index": song.get("order_index"),
+    }
+    for field in CUE_FIELDS:
+        cue[field] = song.get(field) or ""
+    return cue
+
+
+def cue_page(
+    show: Dict,
+    offset: int = 0,
+    limit: int = DEFAULT_LIMIT,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    around: Optional[int] = None,
+    query: str = "",
+) -> Dict:
+    """
+    Ausschnitt der Cue-Liste.
+
+    Args:
+        offset/limit: Positionen (0-basiert) in der sortierten Liste
+        start/end:    Bereich nach order_index (inklusive); ersetzt offset
+        around:       Song-ID, deren Ausschnitt geliefert wird (z.B. nach dem Speichern)
+        query:        Suchbegriff; Positionen zählen dann in der Trefferliste
+
+    Returns:
+        {"total", "offset", "cues"} (+ "focus": Position von `around`);
+        "position" jedes Cues bezieht sich auf die (ggf. gefilterte) Liste
+    """
+    index = _index_for(show)
+    limit = max(1, min(int(limit or DEFAULT_LIMIT), MAX_LIMIT))
+    query = (query or "").strip().lower()
+    hits = index.matches(query) if query else None
+    total = len(hits) if hits is not None else len(index.songs)
+
+    focus = None
+    if around is not None and around in index.positions:
+        focus = index.positions[around]
+        if hits is not None:
+            i = bisect_left(hits, focus)
+            focus = i if i < len(hits) and hits[i] == focus else None
+        offset = max(0, (focus or 0) - limit // 2)
+    elif start is not None or end is not None:
+        lo = bisect_left(index.keys, start) if start is not None else 0
+        hi = bisect_right(index.keys, end) if end is not None else len(index.keys)
+        if hits is not None:
+            lo, hi = bisect_left(hits, lo), bisect_left(hits, hi)
+        offset = lo
+        limit = min(limit, max(0, hi - lo))
+    offset = max(0, min(int(offset or 0), total))
+
+    end_pos = min(offset + limit, total)
+    if hits is None:
+        cues = [_cue_json(index.songs[p], p, p) for p in range(offset, end_pos)]
+    else:
+        cues = [_cue_json(index.songs[hits[p]], p, hits[p]) for p in range(offset, end_pos)]
+    page = {"total": total, "offset": offset, "cues": cues}
+    if focus is not None:
+        page["focus"] = focus
+    return page
+
+
+def numbered_songs(show: Dict) -> List[Tuple[int, Dict]]:
+    """(Cue-Nummer, Song) in Show-Reihenfolge, aus der gecachten Sortierung."""
+    return list(enumerate(_index_for(show).songs, start=1))
+
+
+def cue_for(show: Dict, song_id: int) -> Optional[Dict]:
+    """Einzelner Cue mit Position in der ungefilterten Liste (für Antworten nach Änderungen)."""
+    index = _index_for(show)
+    pos = index.positions.get(song_id)
+    if pos is None:
+        return None
+    return _cue_json(index.songs[pos], pos, pos)
+
+
+def clear_cache() -> None:
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,273 @@
+# batch_export.py
+"""
+Batch-Export für Tour-Pakete.
+
+Führt die gewählten Exporter für mehrere Shows aus (begrenzter Thread-Pool),
+dedupliziert identische Artefakte per SHA-256 und streamt alles als ein
+einziges ZIP-Archiv. Im Speicher liegen nie mehr als `max_workers * 2`
+fertige Artefakte gleichzeitig.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import tempfile
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core import show_logic
+from core.show_logic import find_show, ensure_show_in_db
+from services.exporters.export_nomad_csv import export_cues_to_csv, export_cues_to_xlsx
+from services.exporters.export_asc import export_show_to_asc
+from services.exporters.pdf_export import build_show_report_pdf, build_techrider_pdf
+from services.exporters.pdf_export_cuelist import build_cuelist_pdf
+from services.exporters import ma3_export, eos_macro, mvr_export
+
+Show = Dict
+
+# Anzahl paralleler Export-Jobs
+BATCH_MAX_WORKERS = 4
+
+# Bereits komprimierte Formate werden im ZIP nur abgelegt (nicht erneut deflated)
+_STORED_EXTENSIONS = {".zip", ".mvr", ".xlsx", ".pdf"}
+
+
+# -----------------------------------------------------------------------------#
+# Exporter-Adapter: (show, tmp_dir) -> (Dateiname, Bytes)
+# -----------------------------------------------------------------------------#
+
+
+def _export_nomad_csv(show: Show, tmp_dir: Path) -> Tuple[str, bytes]:
+    path = tmp_dir / f"nomad_show_{show['id']}.csv"
+    export_cues_to_csv(show["id"], str(path))
+    return path.name, path.read_bytes()
+
+
+def _export_eos_xlsx(show: Show, tmp_dir: Path) -> Tuple[str, bytes]:
+    path = tmp_dir / f"eos_show_{show['id']}.xlsx"
+    export_cues_to_xlsx(show["id"], str(path))
+    return path.name, path.read_bytes()
+
+
+def _export_asc(show: Show, tmp_dir: Path) -> Tuple[str, bytes]:
+    path = tmp_dir / f"show_{show['id']}.asc"
+    export_show_to_asc(show["id"], str(path))
+    return path.name, path.read_bytes()
+
+
+def _export_cuelist_pdf(show: Show, tmp_dir: Path) -> Tuple[str, bytes]:
+    buffer, filename = build_cuelist_pdf(show)
+    return filename, buffer.getvalue()
+
+
+def _export_show_pdf(show: Show, tmp_dir: Path) -> Tuple[str, bytes]:
+    buffer, filename = build_show_report_pdf(show)
+    return filename, buffer.getvalue()
+
+
+def _export_techrider_pdf(show: Show, tmp_dir: Path) -> Tuple[str, bytes]:
+    buffer, filename = build_techrider_pdf(show)
+    return filename, buffer.getvalue()
+
+
+def _export_ma3(show: Show, tmp_dir: Path) -> Tuple[str, bytes]:
+    db_show = ensure_show_in_db(show["id"])
+    if not db_show:
+        raise ValueError("Show not found in DB")
+    path = ma3_export.export_ma3_plugin_to_file(db_show, export_dir=tmp_dir)
+    return path.name, path.read_bytes()
+
+
+def _export_eos_macro(show: Show, tmp_dir: Path) -> Tuple[str, bytes]:
+    db_show = ensure_show_in_db(show["id"])
+    if not db_show:
+        raise ValueError("Show not found in DB")
+    content = eos_macro.build_eos_macro(db_show)
+    safe_title = re.sub(r"[^\w\-]+", "_", str(show.get("name") or "Show"))
+    return f"{safe_title}_EOS_Macro.txt", content.encode("utf-8")
+
+
+def _export_mvr(show: Show, tmp_dir: Path) -> Tuple[str, bytes]:
+    path = mvr_export.export_mvr_to_file(show, export_dir=tmp_dir)
+    return path.name, path.read_bytes()
+
+
+EXPORTERS: Dict[str, Callable[[Show, Path], Tuple[str, bytes]]] = {
+    "nomad_csv": _export_nomad_csv,
+    "eos_xlsx": _export_eos_xlsx,
+    "asc": _export_asc,
+    "cuelist_pdf": _export_cuelist_pdf,
+    "show_pdf": _export_show_pdf,
+    "techrider_pdf": _export_techrider_pdf,
+    "ma3": _export_ma3,
+    "eos_macro": _export_eos_macro,
+    "mvr": _export_mvr,
+}
+
+# Exporter, die auf die SQLite-DB zugreifen (brauchen App-Context + DB-Eintrag)
+_DB_EXPORTERS = {"ma3", "eos_macro"}
+
+
+# -----------------------------------------------------------------------------#
+# Show-Auswahl
+# -----------------------------------------------------------------------------#
+
+
+def select_shows(
+    show_ids: Optional[Iterable[int]] = None,
+    query: str = "",
+    date_from: str = "",
+    date_to: str = "",
+) -> List[Show]:
+    """
+    Wählt Shows per ID-Liste oder Filter aus.
+    - query: Teilstring in Name oder Artist (ohne Groß-/Kleinschreibung)
+    - date_from / date_to: ISO-Datum (YYYY-MM-DD), Grenzen inklusive
+    """
+    if show_ids:
+        selected = [find_show(int(sid)) for sid in show_ids]
+        candidates = [s for s in selected if s]
+    else:
+        candidates = list(show_logic.shows)
+
+    q = (query or "").strip().lower()
+    result = []
+    for show in candidates:
+        if q and q not in (show.get("name") or "").lower() and q not in (show.get("artist") or "").lower():
+            continue
+        date = show.get("date") or ""
+        if date_from and (not date or date < date_from):
+            continue
+        if date_to and (not date or date > date_to):
+            continue
+        result.append(show)
+    return result
+
+
+# -----------------------------------------------------------------------------#
+# Streaming-ZIP
+# -----------------------------------------------------------------------------#
+
+
+class _ZipStreamBuffer:
+    """
+    Schreibziel für zipfile, das nicht seekbar ist.
+    zipfile schreibt dann Data-Descriptors; die Bytes werden nach jedem
+    Eintrag mit `pop()` abgeholt und an den Client gestreamt.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def write(self, data) -> int:
+        self._buffer.extend(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def pop(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _show_folder(show: Show) -> str:
+    name = re.sub(r"[^\w\-]+", "_", str(show.get("name") or "Show")).strip("_")
+    return f"{show['id']}_{name[:60] or 'Show'}"
+
+
+def _run_job(app, show: Show, exporter: str) -> Tuple[str, bytes]:
+    func = EXPORTERS[exporter]
+    with tempfile.TemporaryDirectory() as tmp:
+        if app is not None:
+            with app.app_context():
+                return func(show, Path(tmp))
+        return func(show, Path(tmp))
+
+
+def iter_batch_export_zip(
+    selected_shows: List[Show],
+    exporters: Optional[Iterable[str]] = None,
+    max_workers: int = BATCH_MAX_WORKERS,
+    app=None,
+) -> Iterator[bytes]:
+    """
+    Erzeugt das Tour-Paket als ZIP-Stream (Generator über Byte-Chunks).
+
+    Jedes Artefakt landet unter `<show_id>_<name>/<datei>`. Artefakte mit
+    identischem Inhalt werden nur einmal abgelegt; `manifest.json` listet
+    alle Artefakte inkl. Hash und Verweis auf die gespeicherte Datei.
+    `app` wird für DB-basierte Exporter (MA3, EOS-Macro) in den Worker-Threads
+    als App-Context genutzt.
+    """
+    names = [e for e in (exporters or EXPORTERS.keys()) if e in EXPORTERS]
+
+    # DB-Einträge vorab im aufrufenden Thread sicherstellen,
+    # damit die Worker nur noch lesen (keine parallelen SQLite-Writes)
+    if _DB_EXPORTERS.intersection(names):
+        for show in selected_shows:
+            ensure_show_in_db(show["id"])
+
+    jobs = [(show, name) for show in selected_shows for name in names]
+
+    out = _ZipStreamBuffer()
+    stored_by_hash: Dict[str, str] = {}
+    manifest: List[Dict] = []
+    window = max(1, max_workers) * 2
+
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zf, \
+            ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        pending: deque = deque()
+        job_iter = iter(jobs)
+
+        def _fill() -> None:
+            while len(pending) < window:
+                try:
+                    show, name = next(job_iter)
+                except StopIteration:
+                    return
+                pending.append((show, name, pool.submit(_run_job, app, show, name)))
+
+        _fill()
+        while pending:
+            show, name, future = pending.popleft()
+            entry = {"show_id": show["id"], "exporter": name}
+            try:
+                filename, data = future.result()
+            except Exception as e:
+                print(f"[BATCH] Export {name} für Show {show['id']} fehlgeschlagen: {e}")
+                entry["error"] = str(e)
+                manifest.append(entry)
+                _fill()
+                continue
+
+            arcname = f"{_show_folder(show)}/{filename}"
+            digest = hashlib.sha256(data).hexdigest()
+            entry.update({"path": arcname, "sha256": digest, "size": len(data)})
+
+            if digest in stored_by_hash:
+                entry["stored_as"] = stored_by_hash[digest]
+            else:
+                stored_by_hash[digest] = arcname
+                entry["stored_as"] = arcname
+                compress = zipfile.ZIP_STORED if Path(filename).suffix.lower() in _STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+                zf.writestr(arcname, data, compress_type=compress)
+            manifest.append(entry)
+            del data
+
+            # Nächsten Job erst nachschieben, wenn ein Ergebnis abgeholt wurde
+            _fill()
+            chunk = out.pop()
+            if chunk:
+                yield chunk
+
+        zf.writestr("manifest.json", json.dumps(manifest, ensure_ascii=False, indent=2))
+
+    chunk = out.pop()
+    if chunk:
+        yield chunk
@@ -58,8 +58,8 @@ def build_eos_macro(db_show: Any) -> str:
     lines.append("")
 
     for i, it in enumerate(items, start=1):
-        # Wir nutzen den order_index oder die Schleifen-Variable
-        cue_num = _get_attr(it, "order_index", default=i)
+        # Cue-Nummer = Position (Songs kommen nach order_index sortiert; der ist nur Sortierschlüssel)
+        cue_num = i
         cue_name = _safe_text(_get_attr(it, "title", "name", default=f"Cue {cue_num}"))
         mood = _safe_text(_get_attr(it, "mood", "stimmung", default=""))
         colors = _safe_text(_get_attr(it, "colors", "farben", default=""))
@@ -1,4 +1,5 @@
 from core.show_logic import find_show
+from services import cue_list
 
 
 def export_show_to_asc(show_id: int, file_path: str):
@@ -10,7 +11,6 @@ def export_show_to_asc(show_id: int, file_path: str):
     if not show:
         raise ValueError("Show not found")
         
-    songs = show.get("songs", [])
     cuelist_id = show.get("eos_cuelist_id", 1)
     
     lines = []
@@ -24,8 +24,7 @@ def export_show_to_asc(show_id: int, file_path: str):
     lines.append("! Cues")
     lines.append("! -------------------------------------------------")
     
-    for idx, song in enumerate(songs, 1):
-        cue_num = song.get("order_index", idx)
+    for cue_num, song in cue_list.numbered_songs(show):
         name = song.get("name", f"Cue {cue_num}")
         mood = song.get("mood", "")
         colors = song.get("colors", "")
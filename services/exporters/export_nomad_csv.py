@@ -1,7 +1,44 @@
 import csv
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font
 from core.show_logic import find_show
+from services import cue_list
+
+
+HEADERS = ["Cue", "Label", "Notes", "Up Time", "Down Time"]
+
+# Ein gemeinsames Font-Objekt für alle Header-Zellen (openpyxl legt sonst pro Zelle einen Style an)
+_HEADER_FONT = Font(bold=True)
+
+
+def _iter_cue_rows(show):
+    """
+    Liefert die Cue-Zeilen (Cue, Label, Notes, Up Time, Down Time) einer Show.
+    Wird von CSV- und XLSX-Export gemeinsam genutzt.
+    """
+    cuelist_id = show.get("eos_cuelist_id", 1)
+
+    for cue_num, song in cue_list.numbered_songs(show):
+        name = song.get("name", f"Cue {cue_num}")
+        mood = song.get("mood", "")
+        colors = song.get("colors", "")
+        notes = (song.get("special_notes") or "") + " " + (song.get("general_notes") or "")
+
+        # WICHTIG: Listen-Nummer/Cue-Nummer Format (z.B. "1/10")
+        cue_ident = f"{cuelist_id}/{cue_num}"
+
+        label = name
+        if mood or colors:
+            label += f" [{mood}|{colors}]"
+
+        yield [
+            cue_ident,
+            label.strip(),
+            notes.strip(),
+            "",  # Up Time default
+            "",  # Down Time default
+        ]
 
 
 def export_cues_to_csv(show_id: int, file_path: str):
@@ -14,82 +51,39 @@ def export_cues_to_csv(show_id: int, file_path: str):
     show = find_show(show_id)
     if not show:
         raise ValueError("Show not found")
-        
-    songs = show.get("songs", [])
-    cuelist_id = show.get("eos_cuelist_id", 1)
-    
-    # Simple Header für Generic CSV Import
-    headers = ["Cue", "Label", "Notes", "Up Time", "Down Time"]
-    
+
     # Windows-Style Zeilenenden (\r\n) und UTF-8 BOM
     with open(file_path, "w", newline='\r\n', encoding='utf-8-sig') as csvfile:
         writer = csv.writer(csvfile, delimiter=',')
-        writer.writerow(headers)
-        
-        for idx, song in enumerate(songs, 1):
-            cue_num = song.get("order_index", idx)
-            name = song.get("name", f"Cue {cue_num}")
-            mood = song.get("mood", "")
-            colors = song.get("colors", "")
-            notes = (song.get("special_notes") or "") + " " + (song.get("general_notes") or "")
-            
-            # WICHTIG: Listen-Nummer/Cue-Nummer Format (z.B. "1/10")
-            cue_ident = f"{cuelist_id}/{cue_num}"
-            
-            label = name
-            if mood or colors:
-                label += f" [{mood}|{colors}]"
-                
-            writer.writerow([
-                cue_ident,
-                label.strip(),
-                notes.strip(),
-                "", # Up Time default
-                ""  # Down Time default
-            ])
+        writer.writerow(HEADERS)
+        writer.writerows(_iter_cue_rows(show))
+
 
 def export_cues_to_xlsx(show_id: int, file_path: str):
     """
     Exportiert die Cuelist als Excel-Datei im 'Simple' Format.
     Import in EOS via: File -> Import -> CSV -> Cues (XLSX wählen).
+
+    Nutzt den Write-Only-Modus von openpyxl: Zeilen werden direkt in die
+    Datei gestreamt, statt das komplette Sheet im Speicher aufzubauen.
     """
     show = find_show(show_id)
     if not show:
         raise ValueError("Show not found")
-        
-    songs = show.get("songs", [])
-    cuelist_id = show.get("eos_cuelist_id", 1)
-    
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "EOS_Cues"
-    
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("EOS_Cues")
+
     # Header
-    headers = ["Cue", "Label", "Notes", "Up Time", "Down Time"]
-    
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True)
-        
+    header_row = []
+    for header in HEADERS:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = _HEADER_FONT
+        header_row.append(cell)
+    ws.append(header_row)
+
     # Daten
-    for idx, song in enumerate(songs, 2):
-        cue_num = song.get("order_index", idx - 1)
-        name = song.get("name", f"Cue {cue_num}")
-        mood = song.get("mood", "")
-        colors = song.get("colors", "")
-        notes = (song.get("special_notes") or "") + " " + (song.get("general_notes") or "")
-        
-        # WICHTIG: Listen-Nummer/Cue-Nummer Format
-        cue_ident = f"{cuelist_id}/{cue_num}"
-        
-        label = name
-        if mood or colors:
-            label += f" [{mood}|{colors}]"
-            
-        ws.cell(row=idx, column=1, value=cue_ident)
-        ws.cell(row=idx, column=2, value=label.strip())
-        ws.cell(row=idx, column=3, value=notes.strip())
-        ws.cell(row=idx, column=4, value="") # Up Time
-        ws.cell(row=idx, column=5, value="") # Down Time
-        
+    for row in _iter_cue_rows(show):
+        ws.append(row)
+
     wb.save(file_path)
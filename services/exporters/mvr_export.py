@@ -1,14 +1,34 @@
 from __future__ import annotations
+import hashlib
+import io
+import json
+import math
+import uuid
 import zipfile
-import xml.etree.ElementTree as ET
+from array import array
 from pathlib import Path
-from datetime import datetime
+from xml.sax.saxutils import quoteattr
 import re
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional, TextIO, Tuple
+
+from services import fixture_table, gdtf_library, patch_service
 
 # Export Directory
 EXPORT_DIR = (Path(__file__).resolve().parent.parent.parent / "exports" / "mvr").resolve()
 
+MVR_NAMESPACE = "https://github.com/mvr-development/mvr/wiki/General-Scene-Description-1.6"
+
+# Abstand der automatisch aufgereihten Fixtures auf der X-Achse (mm)
+AUTO_SPACING_MM = 1000
+# Y-Versatz für Custom Devices (mm)
+CUSTOM_Y_OFFSET_MM = 2000
+# Rig-Editor: 1 Canvas-Pixel entspricht 1 cm (GRID_SIZE = 20 px = 20 cm)
+PLAN_PX_TO_MM = 10
+
+# Namespace für deterministische UUIDs (uuid5). NICHT ändern, sonst erzeugen
+# Re-Imports in Vectorworks / grandMA3 wieder Duplikate.
+CUEX_UUID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://cuex.lightblast/mvr")
+
 def _safe_filename(name: str) -> str:
     name = (name or "show").strip()
     name = re.sub(r"[^\w\-. ]+", "_", name, flags=re.UNICODE)
@@ -25,165 +45,259 @@ def _get_attr(obj: Any, *names: str, default: Any = "") -> Any:
                 return v
     return default
 
-def export_mvr_to_file(show: Dict | Any, export_dir: str | Path | None = None) -> Path:
+def fixture_uuid(show_id: Any, key: str) -> str:
+    """
+    Stabile UUID pro Fixture, abgeleitet aus Show-ID und Rig-Editor-Key
+    (z.B. `spots_0_3`). Gleiche Eingabe -> gleiche UUID bei jedem Export.
+    """
+    return str(uuid.uuid5(CUEX_UUID_NAMESPACE, f"show/{show_id}/{key}")).upper()
+
+
+def _plan_positions(visual_plan: Dict) -> Dict[str, tuple]:
+    """
+    Baut einmalig die Map Key -> (x_mm, y_mm, rotation_deg) aus dem
+    `visual_plan` des Rig-Editors. Canvas-Y zeigt nach unten, MVR-Y nach hinten.
+    """
+    positions: Dict[str, tuple] = {}
+    if not isinstance(visual_plan, dict):
+        return positions
+    for key, pos in visual_plan.items():
+        if not isinstance(pos, dict):
+            continue
+        try:
+            x = float(pos.get("x", 0)) * PLAN_PX_TO_MM
+            y = 0.0 - float(pos.get("y", 0)) * PLAN_PX_TO_MM
+            rot = float(pos.get("rotation", 0) or 0)
+        except (TypeError, ValueError):
+            continue
+        positions[key] = (x, y, rot)
+    return positions
+
+
+def _matrix(x: float, y: float, z: float, rotation_deg: float) -> str:
+    """Matrix 4x4 (zeilenweise): Rotation um Z + Translation (mm)."""
+    if rotation_deg:
+        # Canvas dreht im Uhrzeigersinn -> mathematisch negative Drehung um Z
+        rad = math.radians(-rotation_deg)
+        c, s = math.cos(rad), math.sin(rad)
+    else:
+        c, s = 1.0, 0.0
+    return (
+        f"{c:.6f} {s:.6f} 0.000000 0.000000 {0.0 - s:.6f} {c:.6f} 0.000000 0.000000"
+        f" 0.000000 0.000000 1.000000 0.000000 {x:.6f} {y:.6f} {z:.6f} 1.000000"
+    )
+
+
+def _collect_fixture_groups(rig: Dict) -> List[Dict]:
+    """
+    Fasst die Rig-Einträge (`*_items` + `custom_devices`, Zeilen der
+    Fixture-Tabelle) zu Gruppen zusammen.
+    Pro Gruppe werden die Fixture-IDs und Positionen als Arrays berechnet,
+    statt für jedes einzelne Fixture ein eigenes Dict anzulegen.
+    Positionen kommen aus dem `visual_plan` (Rig-Editor); nicht platzierte
+    Fixtures werden wie bisher auf der X-Achse aufgereiht.
+    """
+    groups: List[Dict] = []
+    next_id = 1
+    plan = _plan_positions(rig.get("visual_plan") or {})
+    table = fixture_table.get_table(rig)
+
+    for row in table.rows():
+        count = table.count[row]
+        cat = table.category[row]
+        prefix = fixture_table.CATEGORIES[cat]
+        item_idx = table.item_idx[row]
+        it = table.items[row]
+        if cat == fixture_table.CUSTOM:
+            base_name, y = it.get("name") or "", CUSTOM_Y_OFFSET_MM
+        else:
+            base_name, y = it.get("model") or prefix.capitalize(), 0
+
+        ids = array("q", range(next_id, next_id + count))
+        keys = [f"{prefix}_{item_idx}_{i}" for i in range(count)]
+        xs = array("d", ((i - 1) * AUTO_SPACING_MM for i in ids))
+        ys = array("d", [y]) * count
+        rots = array("d", [0.0]) * count
+        for n, key in enumerate(keys):
+            pos = plan.get(key)
+            if pos:
+                xs[n], ys[n], rots[n] = pos
+        # DMX-Adresse pro Fixture (fortlaufend ab Startadresse, 0 = ungepatcht)
+        universes = array("l", [0]) * count
+        addresses = array("l", [0]) * count
+        if table.patched[row]:
+            start = (table.universe[row], table.address[row])
+            for n, (uni, addr) in enumerate(patch_service.layout(start, count, table.footprint[row])):
+                universes[n], addresses[n] = uni, addr
+        groups.append({
+            "prefix": prefix,
+            "item_idx": item_idx,
+            "base_name": base_name,
+            "manufacturer": it.get("manufacturer", ""),
+            "model": it.get("model", ""),
+            "mode": it.get("mode", ""),
+            "universes": universes,
+            "addresses": addresses,
+            "ids": ids,
+            "keys": keys,
+            "x": xs,
+            "y": ys,
+            "z": array("d", [0.0]) * count,
+            "rotation": rots,
+        })
+        next_id += count
+
+    return groups
+
+
+def _gdtf_spec(group: Dict) -> Tuple[str, str, Optional[Path]]:
+    """
+    (gdtfSpec, gdtfMode, lokale Datei) einer Gruppe. Liegt das Gerät in der
+    lokalen GDTF-Bibliothek, wird deren Datei referenziert (und eingebettet)
+    und der Mode-Name aus der Datei übernommen.
+    """
+    mode = str(group["mode"])
+    entry = gdtf_library.find(group["manufacturer"], group["model"])
+    if entry:
+        for m in entry.get("modes", []):
+            for mode_data in m.values():
+                if mode_data.get("name", "").lower() == mode.lower():
+                    mode = mode_data["name"]
+        return Path(entry["file"]).name, mode, gdtf_library.file_path(entry)
+    gdtf_name = f"{group['manufacturer']} {group['model']}".strip() or "Generic Fixture"
+    return gdtf_name + ".gdtf", mode, None
+
+
+def _iter_fixture_fragments(group: Dict, show_id: Any, gdtf_files: Optional[Dict[str, Path]] = None):
+    """
+    Liefert (uuid, XML-Fragment) pro Fixture einer Gruppe.
+    Gruppenweite Teile werden nur einmal formatiert. Lokale GDTF-Dateien
+    der Gruppe landen in `gdtf_files` (Name im Archiv -> Pfad).
+    """
+    spec, mode, local_file = _gdtf_spec(group)
+    if local_file is not None and gdtf_files is not None:
+        gdtf_files.setdefault(spec, local_file)
+    spec_attrs = f" gdtfSpec={quoteattr(spec)} gdtfMode={quoteattr(mode)}"
+
+    base_name = group["base_name"]
+    xs, ys, zs, rots = group["x"], group["y"], group["z"], group["rotation"]
+    universes, dmx_addresses = group["universes"], group["addresses"]
+    for n, fid in enumerate(group["ids"]):
+        name = f"{base_name} {n + 1}" if group["prefix"] != "custom" else (base_name or f"Custom {fid}")
+        fix_uuid = fixture_uuid(show_id, group["keys"][n])
+        addresses = ""
+        if universes[n]:
+            addresses = (
+                "\n            <Addresses>"
+                f"\n              <Address break=\"1\" universe=\"{universes[n]}\" address=\"{dmx_addresses[n]}\" />"
+                "\n            </Addresses>"
+            )
+        yield fix_uuid, (
+            f"\n          <Fixture name={quoteattr(name)} uuid=\"{fix_uuid}\""
+            f" fixtureId=\"{fid}\"{spec_attrs}>"
+            f"\n            <Matrix>{_matrix(xs[n], ys[n], zs[n], rots[n])}</Matrix>"
+            f"{addresses}"
+            "\n          </Fixture>"
+        )
+
+
+def _fingerprint(fragment: str) -> str:
+    return hashlib.blake2b(fragment.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def write_scene_description(out: TextIO, show: Dict | Any, previous_state: Dict | None = None,
+                            gdtf_files: Dict[str, Path] | None = None) -> Dict[str, str]:
+    """
+    Schreibt die GeneralSceneDescription.xml inkrementell in `out`,
+    ohne vorher einen ElementTree aufzubauen.
+
+    Mit `previous_state` (UUID -> Fingerprint des letzten Exports) werden nur
+    neue oder geänderte Fixtures geschrieben (Update-Modus).
+    Gibt den neuen Zustand (alle Fixtures) zurück. Referenzierte Dateien der
+    lokalen GDTF-Bibliothek werden in `gdtf_files` gesammelt.
+    """
+    rig = show.get("rig_setup", {}) if isinstance(show, dict) else getattr(show, "rig_setup", {})
+    if not rig:
+        rig = {}
+    show_id = _get_attr(show, "id", default=0)
+
+    out.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    out.write(f'<GeneralSceneDescription xmlns={quoteattr(MVR_NAMESPACE)} verMajor="1" verMinor="6">\n')
+    out.write("  <UserData>\n")
+    out.write('    <Data provider="CueX Lichtassistent" ver="4.0.1" />\n')
+    out.write("  </UserData>\n")
+    out.write("  <Scene>\n")
+    out.write("    <Layers>\n")
+    out.write(f'      <Layer name="Rig" uuid="{fixture_uuid(show_id, "layer_rig")}">\n')
+    out.write("        <ChildList>")
+
+    state: Dict[str, str] = {}
+    for group in _collect_fixture_groups(rig):
+        for fix_uuid, fragment in _iter_fixture_fragments(group, show_id, gdtf_files):
+            fp = _fingerprint(fragment)
+            state[fix_uuid] = fp
+            if previous_state is not None and previous_state.get(fix_uuid) == fp:
+                continue
+            out.write(fragment)
+
+    out.write("\n        </ChildList>\n")
+    out.write("      </Layer>\n")
+    out.write("    </Layers>\n")
+    out.write("  </Scene>\n")
+    out.write("</GeneralSceneDescription>")
+    return state
+
+
+def _state_path(out_dir: Path, show_id: Any) -> Path:
+    return out_dir / ".state" / f"show_{show_id}.json"
+
+
+def _load_state(path: Path) -> Dict[str, str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def export_mvr_to_file(show: Dict | Any, export_dir: str | Path | None = None, incremental: bool = False) -> Path:
     """
     Generates an MVR file (ZIP containing GeneralSceneDescription.xml) from the show data.
+    Das XML wird direkt in den ZIP-Eintrag gestreamt.
+
+    incremental=True erzeugt `<name>_update.mvr` nur mit den Fixtures, die sich
+    seit dem letzten Export geändert haben (bzw. neu sind). Der Zustand wird pro
+    Show unter `<export_dir>/.state/` abgelegt.
     """
     out_dir = Path(export_dir).resolve() if export_dir else EXPORT_DIR
     out_dir.mkdir(parents=True, exist_ok=True)
 
     show_name = _get_attr(show, "name", default="Show")
     safe_name = _safe_filename(show_name)
-    zip_filename = f"{safe_name}.mvr"
+    zip_filename = f"{safe_name}_update.mvr" if incremental else f"{safe_name}.mvr"
     zip_path = (out_dir / zip_filename).resolve()
 
-    # Create XML Structure
-    root = ET.Element("GeneralSceneDescription")
-    root.set("xmlns", "https://github.com/mvr-development/mvr/wiki/General-Scene-Description-1.6")
-    root.set("verMajor", "1")
-    root.set("verMinor", "6")
-
-    # UserData
-    user_data = ET.SubElement(root, "UserData")
-    provider = ET.SubElement(user_data, "Data")
-    provider.set("provider", "CueX Lichtassistent")
-    provider.set("ver", "4.0.1")
-
-    # Scene
-    scene = ET.SubElement(root, "Scene")
-    layers = ET.SubElement(scene, "Layers")
-    
-    # Create a default Layer for the Rig
-    layer = ET.SubElement(layers, "Layer")
-    layer.set("name", "Rig")
-    layer.set("uuid", "00000000-0000-0000-0000-000000000001") # Static UUID for now, should be unique ideally
-    
-    child_list = ET.SubElement(layer, "ChildList")
-
-    # Collect fixtures from Rig data
-    # We support keys from the standard structure: spots_items, washes_items, etc.
-    rig = show.get("rig_setup", {}) if isinstance(show, dict) else getattr(show, "rig_setup", {})
-    if not rig:
-        rig = {}
+    state_path = _state_path(out_dir, _get_attr(show, "id", default=0))
+    previous_state = _load_state(state_path) if incremental else None
 
-    fixture_id_counter = 1
-    
-    all_items = []
-    
-    prefixes = ("spots", "washes", "beams", "blinders", "strobes")
-    for p in prefixes:
-        items = rig.get(f"{p}_items", [])
-        for it in items:
-            count = 0
-            try:
-                count = int(it.get("count", 0))
-            except: pass
-            
-            man = it.get("manufacturer", "")
-            mod = it.get("model", "")
-            mode = it.get("mode", "")
-            uni = it.get("universe", "")
-            addr = it.get("address", "")
-            
-            for i in range(count):
-                item_data = {
-                    "name": f"{p.capitalize()} {i+1}" if not mod else f"{mod} {i+1}",
-                    "id": fixture_id_counter,
-                    "fixture_id": fixture_id_counter, # Use same for now
-                    "manufacturer": man,
-                    "model": mod,
-                    "mode": mode,
-                    "universe": uni,
-                    "address": addr,
-                    # Simple automated positioning (line up on X axis)
-                    "x": (fixture_id_counter - 1) * 1000, # mm
-                    "y": 0,
-                    "z": 0
-                }
-                all_items.append(item_data)
-                fixture_id_counter += 1
-
-    # Add Custom Devices
-    custom_devs = rig.get("custom_devices", [])
-    for cd in custom_devs:
-         count = 0
-         try:
-             count = int(cd.get("count", 0))
-         except: pass
-         for i in range(count):
-             item_data = {
-                 "name": cd.get("name") or f"Custom {fixture_id_counter}",
-                 "id": fixture_id_counter,
-                 "fixture_id": fixture_id_counter,
-                 "manufacturer": cd.get("manufacturer", ""),
-                 "model": cd.get("model", ""),
-                 "mode": cd.get("mode", ""),
-                 "universe": cd.get("universe", ""),
-                 "address": cd.get("address", ""),
-                 "x": (fixture_id_counter - 1) * 1000,
-                 "y": 2000, # Offset custom devices slightly
-                 "z": 0
-             }
-             all_items.append(item_data)
-             fixture_id_counter += 1
-
-    # Write items to XML
-    for it in all_items:
-        fix = ET.SubElement(child_list, "Fixture")
-        fix.set("name", str(it["name"]))
-        fix.set("uuid", f"00000000-0000-0000-0000-{it['id']:012d}") # Fake UUIDs
-        fix.set("fixtureId", str(it["fixture_id"]))
-        
-        # GDTF Spec / Mode usually requires a GDTF file application, 
-        # but for MVR we can provide basic info in the GDTFSpec attribute or leave it empty if unknown.
-        # We will put Manufacturer + Model as placeholders
-        gdtf_name = f"{it['manufacturer']} {it['model']}".strip()
-        if not gdtf_name:
-            gdtf_name = "Generic Fixture"
-        fix.set("gdtfSpec", f"{gdtf_name}.gdtf")
-        fix.set("gdtfMode", str(it["mode"]))
-
-        # Matrix (Position/Rotation)
-        # Matrix 4x4 flattened: 
-        # 1 0 0 0
-        # 0 1 0 0 
-        # 0 0 1 0
-        # x y z 1
-        # MVR expects "1,0,0,0}{0,1,0,0}{0,0,1,0}{x,y,z,1" format usually? 
-        # Actually GDTF uses space separated values usually or braces?
-        # Checked MVR spec: It uses a child element <Matrix>1 0 0 0 0 1 0 0 0 0 1 0 x y z 1</Matrix> (in mm usually)
-        
-        matrix = ET.SubElement(fix, "Matrix")
-        # Ensure mm (CueX uses usually internal units? Assuming user input is generic, we just verify relative spacing)
-        # Using basic identity matrix with translation
-        x = it["x"]
-        y = it["y"]
-        z = it["z"]
-        matrix.text = f"1.000000 0.000000 0.000000 0.000000 0.000000 1.000000 0.000000 0.000000 0.000000 0.000000 1.000000 0.000000 {x}.000000 {y}.000000 {z}.000000 1.000000"
-
-        # Addresses
-        # <Addresses><Address break="1" universe="1" address="1" /></Addresses>
-        uni_str = str(it["universe"]).strip()
-        addr_str = str(it["address"]).strip()
-        
-        if uni_str and addr_str:
+    gdtf_files: Dict[str, Path] = {}
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        with zf.open("GeneralSceneDescription.xml", "w") as raw:
+            with io.TextIOWrapper(raw, encoding="utf-8") as out:
+                state = write_scene_description(out, show, previous_state, gdtf_files)
+        # GDTF-Dateien aus der lokalen Bibliothek mitliefern (.gdtf ist schon ein ZIP)
+        for name, path in sorted(gdtf_files.items()):
             try:
-                # MVR/GDTF spec uses 'Addresses' container
-                addresses = ET.SubElement(fix, "Addresses")
-                address_node = ET.SubElement(addresses, "Address")
-                address_node.set("break", "1")
-                address_node.set("universe", uni_str)
-                address_node.set("address", addr_str)
-            except:
-                pass
+                zf.write(path, arcname=name, compress_type=zipfile.ZIP_STORED)
+            except OSError as e:
+                print(f"[MVR] GDTF-Datei {name} konnte nicht eingebettet werden: {e}")
 
-
-    # Format XML
-    ET.indent(root, space="  ", level=0)
-    xml_str = ET.tostring(root, encoding="utf-8", xml_declaration=True)
-
-    # Wrap in ZIP
-    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
-        zf.writestr("GeneralSceneDescription.xml", xml_str)
+    try:
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(state_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+    except OSError as e:
+        print(f"[MVR] Export-Zustand konnte nicht gespeichert werden: {e}")
 
     return zip_path
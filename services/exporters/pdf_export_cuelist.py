@@ -2,6 +2,7 @@ from typing import Dict, Tuple
 import io
 from reportlab.lib.pagesizes import A4  # type: ignore
 from reportlab.pdfgen import canvas  # type: ignore
+from services import cue_list
 
 Show = Dict
 
@@ -19,9 +20,9 @@ def build_cuelist_pdf(show: Show) -> Tuple[io.BytesIO, str]:
     y = height - 90
     line_height = 18
 
-    songs = show.get("songs") or []
+    songs = cue_list.numbered_songs(show)
     if songs:
-        for song in songs:
+        for number, song in songs:
             if y < 80:
                 pdf.showPage()
                 y = height - 60
@@ -34,7 +35,7 @@ def build_cuelist_pdf(show: Show) -> Tuple[io.BytesIO, str]:
             pdf.circle(50, y + 6, 5, fill=1)
             pdf.setFillColorRGB(0, 0, 0)
             pdf.setFont("Helvetica-Bold", 12)
-            pdf.drawString(65, y, f"{song.get('order_index', '')} – {song.get('name', '')}")
+            pdf.drawString(65, y, f"{number} – {song.get('name', '')}")
             y -= line_height
             pdf.setFont("Helvetica", 10)
             if song.get("mood"):
@@ -0,0 +1,268 @@
+"""
+Gemeinsame PDF-Layout-Engine für die Report-Exporte.
+
+- Modulweite Caches für Logo und vorskalierte Requisiten-Thumbnails
+  (ein Bild wird nur einmal dekodiert, nicht bei jedem Export / jeder Seite)
+- Kopfbereich (Logo + Titel) auf der ersten Seite; jede Folgeseite erhält
+  einen schmalen Seitenkopf als reportlab-Form, die pro Dokument einmal
+  definiert und per `doForm` auf jeder Seite platziert wird
+- `PdfLayout` kapselt Canvas und y-Cursor inkl. Seitenumbruch-Logik
+"""
+from typing import Dict, Optional, Tuple
+from collections import OrderedDict
+from functools import lru_cache
+import os
+import threading
+
+from PIL import Image  # type: ignore
+from reportlab.lib.pagesizes import A4  # type: ignore
+from reportlab.lib.utils import ImageReader  # type: ignore
+from reportlab.pdfgen import canvas  # type: ignore
+
+from services.media_service import derivative_name
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "static")
+PROPS_DIR = os.path.join(STATIC_DIR, "props")
+
+# Kantenlänge der vorskalierten Thumbnails in Pixel (≈ 2x der Darstellungsgröße im PDF)
+PROP_THUMB_PX = 240
+# Maximale Anzahl gecachter Thumbnails (LRU)
+THUMB_CACHE_SIZE = 256
+# Caches abschaltbar (z.B. für Benchmarks: Verhalten wie vor der Engine)
+CACHE_ENABLED = True
+
+LOGO_WIDTH = 110.0
+
+_thumb_cache: "OrderedDict[Tuple[str, int, int], ImageReader]" = OrderedDict()
+_thumb_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def find_logo_path() -> Optional[str]:
+    """
+    Sucht nach einem geeigneten Logo im static/staticimg-Verzeichnis.
+    Gibt den absoluten Pfad zurück oder None, falls kein Logo gefunden wird.
+    Das Ergebnis wird gecacht (Dateisystem wird nur einmal durchsucht).
+    """
+    staticimg_dir = os.path.join(STATIC_DIR, "staticimg")
+
+    candidates = [
+        os.path.join(staticimg_dir, "LightBlastblack .png"),
+        os.path.join(staticimg_dir, "LightBlastblack.png"),
+        os.path.join(staticimg_dir, "LightBlast_Logo_B_1024.png"),
+        os.path.join(staticimg_dir, "staticimglogo.png"),
+    ]
+
+    for path in candidates:
+        if os.path.exists(path):
+            return os.path.abspath(path)
+
+    if os.path.isdir(staticimg_dir):
+        for fname in sorted(os.listdir(staticimg_dir)):
+            if fname.lower().endswith(".png"):
+                return os.path.abspath(os.path.join(staticimg_dir, fname))
+
+    print("[PDF] Kein Logo gefunden")
+    return None
+
+
+@lru_cache(maxsize=1)
+def get_logo() -> Optional[Tuple[ImageReader, float, float]]:
+    """Dekodiertes Logo + Zielgröße (Breite fix, Höhe proportional). Gecacht."""
+    logo_path = find_logo_path()
+    if not logo_path:
+        return None
+    try:
+        with Image.open(logo_path) as img:
+            img.load()
+            width = LOGO_WIDTH * 2
+            scaled = img.copy()
+            scaled.thumbnail((int(width), int(width * img.height / img.width) + 1))
+        logo = ImageReader(scaled)
+        orig_w, orig_h = logo.getSize()
+        return logo, LOGO_WIDTH, orig_h * (LOGO_WIDTH / float(orig_w))
+    except Exception as e:  # nur Logging
+        print("[PDF] Fehler beim Laden des Logos:", e)
+        return None
+
+
+def get_prop_image(img_name: str) -> ImageReader:
+    """
+    Liefert das Requisiten-Bild als vorskaliertes Thumbnail (gecacht nach
+    Pfad + Änderungszeit). Nutzt das beim Upload erzeugte `.thumb.jpg`,
+    falls vorhanden. Wirft eine Exception, wenn das Bild fehlt/defekt ist.
+    """
+    path = os.path.abspath(os.path.join(PROPS_DIR, img_name))
+    if not CACHE_ENABLED:
+        return ImageReader(path)
+
+    thumb_path = os.path.abspath(os.path.join(PROPS_DIR, derivative_name(img_name, "thumb")))
+    if os.path.exists(thumb_path):
+        path = thumb_path
+
+    mtime = os.stat(path).st_mtime_ns
+    key = (path, mtime, PROP_THUMB_PX)
+    with _thumb_lock:
+        cached = _thumb_cache.get(key)
+        if cached is not None:
+            _thumb_cache.move_to_end(key)
+            return cached
+
+    with Image.open(path) as img:
+        img.draft("RGB", (PROP_THUMB_PX, PROP_THUMB_PX))  # JPEG: direkt verkleinert dekodieren
+        if img.mode not in ("RGB", "RGBA", "L"):
+            img = img.convert("RGBA")
+        thumb = img.copy()
+        thumb.thumbnail((PROP_THUMB_PX, PROP_THUMB_PX))
+    reader = ImageReader(thumb)
+
+    with _thumb_lock:
+        _thumb_cache[key] = reader
+        while len(_thumb_cache) > THUMB_CACHE_SIZE:
+            _thumb_cache.popitem(last=False)
+    return reader
+
+
+def clear_caches() -> None:
+    """Leert alle Bild-Caches (Logo, Thumbnails)."""
+    find_logo_path.cache_clear()
+    get_logo.cache_clear()
+    with _thumb_lock:
+        _thumb_cache.clear()
+
+
+class PdfLayout:
+    """
+    Canvas + y-Cursor für zeilenbasierte Reports (A4, Helvetica).
+    Alle Builder nutzen dieselben Ränder und Zeilenhöhen.
+    """
+
+    TOP = 60
+    LEFT = 40
+    BOTTOM_MARGIN = 40
+    # Höhe des Logos im Seitenkopf der Folgeseiten (pt)
+    PAGE_HEADER_LOGO_HEIGHT = 16
+
+    def __init__(self, buffer, line_height: float = 18):
+        self.pdf = canvas.Canvas(buffer, pagesize=A4)
+        self.width, self.height = A4
+        self.line_height = line_height
+        self.y = self.height - 140
+        self._forms: Dict[str, bool] = {}
+        self._title: Optional[str] = None
+
+    # ------------------------------------------------------------------ #
+    # Kopfbereich: erste Seite direkt, Folgeseiten als Form (Seitenvorlage)
+    # ------------------------------------------------------------------ #
+
+    def draw_header(self, title: str) -> None:
+        """Logo + Titel oben auf der aktuellen Seite; Folgeseiten erhalten den Seitenkopf."""
+        pdf = self.pdf
+        logo = get_logo()
+        if logo:
+            reader, w, h = logo
+            pdf.drawImage(
+                reader,
+                40.0,
+                self.height - 40.0 - h,
+                width=w,
+                height=h,
+                mask="auto",
+                preserveAspectRatio=True,
+            )
+        pdf.setFont("Helvetica-Bold", 18)
+        pdf.drawString(180, self.height - 60, title)
+        self._title = title
+
+    def _page_header(self) -> None:
+        """
+        Schmaler Seitenkopf (kleines Logo + Titel + Linie) für jede Folgeseite.
+        Wird einmal pro Dokument als Form definiert und danach nur platziert.
+        """
+        if self._title is None:
+            return
+        form_name = "cuex_page_header"
+        if form_name not in self._forms:
+            pdf = self.pdf
+            pdf.beginForm(form_name)
+            top = self.height - 22
+            logo = get_logo()
+            if logo:
+                reader, w, h = logo
+                scale = self.PAGE_HEADER_LOGO_HEIGHT / h
+                pdf.drawImage(reader, self.LEFT, top - h * scale + 8, width=w * scale,
+                              height=h * scale, mask="auto", preserveAspectRatio=True)
+            pdf.setFont("Helvetica", 8)
+            pdf.drawRightString(self.width - self.LEFT, top, self._title)
+            pdf.line(self.LEFT, top - 8, self.width - self.LEFT, top - 8)
+            pdf.endForm()
+            self._forms[form_name] = True
+        self.pdf.doForm(form_name)
+
+    # ------------------------------------------------------------------ #
+    # Cursor / Seitenumbruch
+    # ------------------------------------------------------------------ #
+
+    def new_page(self, heading: Optional[str] = None, body_font: Optional[Tuple[str, float]] = None) -> None:
+        """Neue Seite; optional mit Fortsetzungs-Überschrift und Body-Font."""
+        self.pdf.showPage()
+        self._page_header()
+        self.y = self.height - self.TOP
+        if heading:
+            self.pdf.setFont("Helvetica-Bold", 14)
+            self.pdf.drawString(self.LEFT, self.y, heading)
+            self.y -= self.line_height
+        if body_font:
+            self.pdf.setFont(*body_font)
+
+    def ensure_space(
+        self,
+        min_y: float,
+        heading: Optional[str] = None,
+        body_font: Optional[Tuple[str, float]] = None,
+    ) -> None:
+        if self.y < min_y:
+            self.new_page(heading, body_font)
+
+    def text(self, x: float, text: str, font: Optional[Tuple[str, float]] = None, step: float = 1.0) -> None:
+        """Eine Zeile schreiben und den Cursor um `step` Zeilen verschieben."""
+        if font:
+            self.pdf.setFont(*font)
+        self.pdf.drawString(x, self.y, text)
+        self.y -= self.line_height * step
+
+    def heading(self, text: str, size: float = 14, x: Optional[float] = None) -> None:
+        self.text(self.LEFT if x is None else x, text, ("Helvetica-Bold", size))
+
+    def rule(self) -> None:
+        self.pdf.line(self.LEFT, self.y, self.width - self.LEFT, self.y)
+        self.y -= self.line_height
+
+    def skip(self, lines: float) -> None:
+        self.y -= self.line_height * lines
+
+    # ------------------------------------------------------------------ #
+    # Bilder
+    # ------------------------------------------------------------------ #
+
+    def image_grid(self, img_names, thumb_size: float = 90, margin: float = 20) -> None:
+        """Requisiten-Bilder als Raster (Thumbnails aus dem Cache), zeilenweise umbrechend."""
+        pdf = self.pdf
+        per_row = max(1, int((self.width - 2 * self.LEFT + margin) // (thumb_size + margin)))
+        for start in range(0, len(img_names), per_row):
+            # Jede Zeile muss komplett über den unteren Rand passen
+            self.ensure_space(self.BOTTOM_MARGIN + thumb_size, "Requisiten-Bilder (Fortsetzung)")
+            x = self.LEFT
+            for img_name in img_names[start:start + per_row]:
+                try:
+                    img = get_prop_image(img_name)
+                    pdf.drawImage(img, x, self.y - thumb_size, width=thumb_size, height=thumb_size,
+                                  preserveAspectRatio=True, mask='auto')
+                except Exception:
+                    pdf.setFont("Helvetica-Oblique", 8)
+                    pdf.drawString(x, self.y, f"[Fehler beim Laden: {img_name}]")
+                x += thumb_size + margin
+            self.y -= thumb_size + margin
+
+    def finish(self) -> None:
+        self.pdf.save()
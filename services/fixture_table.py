@@ -0,0 +1,203 @@
+"""
+Spaltenbasierte Fixture-Tabelle für Rig-Berechnungen.
+
+Alle Rig-Auswertungen (Strom, Lampenzahl, DMX-Patch, MVR-Export) brauchen
+dieselben Werte aus den fünf `*_items`-Listen und `custom_devices`. Statt
+dass jede Auswertung die Listen selbst durchläuft und die String-Felder neu
+parst, wird pro Rig-Stand einmal eine Tabelle aufgebaut: eine Zeile pro
+Rig-Eintrag, eine `array`-Spalte pro Kennzahl.
+
+    category   Kategorie-Code (Index in CATEGORIES)
+    item_idx   Index in der Ursprungsliste
+    count      Anzahl Geräte
+    watt       Leistung pro Gerät
+    load       Gesamtleistung des Eintrags
+    patched    1 = Universe/Adresse gesetzt
+    universe   Start-Universe
+    address    Startadresse
+    footprint  DMX-Kanäle pro Gerät
+    estimated  1 = Footprint geschätzt
+
+Summen und Zählungen sind damit Reduktionen über eine Spalte.
+
+`get_table()` ist der einzige Lesezugriff auf Rig-Zahlen. Das Rig liegt
+normalisiert vor (core/rig_model.py: Zahlen beim Schreiben geparst); ältere,
+nicht migrierte Dicts werden vorher in einer Kopie migriert.
+
+Gecacht wird pro Rig-Objekt, bis es per `rig_model.touch` (update_rig,
+auto_patch) als geändert gemeldet wird: ein Zugriff kostet dann O(1), die
+Einträge werden nicht durchlaufen. Nur nicht migrierte Dicts werden über
+ihre Rohwerte gefunden. Außerhalb des LRU wird nichts pro Rig gehalten.
+"""
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional
+import itertools
+import threading
+
+from core import rig_model
+from services import gdtf_api, patch_service
+
+FIXTURE_PREFIXES = rig_model.CATEGORIES
+CATEGORIES = FIXTURE_PREFIXES + ("custom",)
+CUSTOM = len(FIXTURE_PREFIXES)
+
+_CACHE_SIZE = 32
+_cache: "OrderedDict[tuple, FixtureTable]" = OrderedDict()
+_lock = threading.Lock()
+# Fortlaufende Tabellen-Version (`FixtureTable.key`), wird nie wiederverwendet
+_versions = itertools.count(1)
+# Zählt `touch`-Meldungen; eine währenddessen gebaute Tabelle wird nicht gecacht
+_touches = 0
+
+# Felder eines Eintrags, die in die Tabelle eingehen (Key für nicht migrierte Dicts)
+_ITEM_FIELDS = ("count", "watt", "phase", "universe", "address", "mode",
+                "manufacturer", "model", "name", "dmx_footprint")
+
+
+class FixtureTable:
+    """Eine Zeile pro Rig-Eintrag, Kennzahlen als Spalten."""
+
+    def __init__(self, key: int = 0, source: Optional[Dict] = None):
+        # Eindeutige Version dieser Tabelle (Cache-Key für Strom/Patch)
+        self.key = key
+        # Rig, zu dessen Revision die Tabelle gehört (hält dessen id() belegt)
+        self.source = source
+        self.category = array("b")
+        self.item_idx = array("l")
+        self.count = array("l")
+        self.watt = array("d")
+        self.load = array("d")
+        self.patched = array("b")
+        self.universe = array("l")
+        self.address = array("l")
+        self.footprint = array("l")
+        self.estimated = array("b")
+        # Nicht-numerische Spalten
+        self.keys: List[str] = []
+        self.labels: List[str] = []
+        self.phases: List[Optional[str]] = []
+        # Einträge des Rigs, aus dem die Tabelle gebaut wurde (nur lesen: ein
+        # gleichwertiges Rig mit denselben Rohwerten bekommt dieselbe Tabelle)
+        self.items: List[Dict] = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _append(self, category: int, item_idx: int, key: str, label: str, item: Dict) -> None:
+        count = item.get("count") or 0
+        watt = item.get("watt") or 0.0
+        universe, address = item.get("universe"), item.get("address")
+        footprint, estimated = patch_service.resolve_footprint(item)
+
+        self.category.append(category)
+        self.item_idx.append(item_idx)
+        self.count.append(count)
+        self.watt.append(watt)
+        self.load.append(watt * count)
+        self.patched.append(universe is not None and address is not None)
+        self.universe.append(universe or 0)
+        self.address.append(address or 0)
+        self.footprint.append(footprint)
+        self.estimated.append(estimated)
+        self.keys.append(key)
+        self.labels.append(label)
+        self.phases.append(item.get("phase"))
+        self.items.append(item)
+
+    def source_item(self, rig: Dict, row: int) -> Dict:
+        """Eintrag einer Zeile im übergebenen Rig (zum Ändern)."""
+        cat = self.category[row]
+        field = "custom_devices" if cat == CUSTOM else f"{CATEGORIES[cat]}_items"
+        return rig[field][self.item_idx[row]]
+
+    # ------------------------------------------------------------------ #
+    # Reduktionen
+    # ------------------------------------------------------------------ #
+
+    def total_count(self) -> int:
+        return sum(self.count)
+
+    def total_load(self) -> float:
+        return sum(self.load)
+
+    def count_by_category(self) -> Dict[str, int]:
+        totals = [0] * len(CATEGORIES)
+        for cat, n in zip(self.category, self.count):
+            totals[cat] += n
+        return dict(zip(CATEGORIES, totals))
+
+    def rows(self) -> Iterator[int]:
+        """Zeilen mit Anzahl > 0."""
+        return (i for i, n in enumerate(self.count) if n > 0)
+
+
+def _rig_key(rig: Dict) -> tuple:
+    parts: List = [
+        tuple(tuple(it.get(f) for f in _ITEM_FIELDS) for it in rig.get(f"{prefix}_items") or [])
+        for prefix in FIXTURE_PREFIXES
+    ]
+    parts.append(tuple(tuple(cd.get(f) for f in _ITEM_FIELDS) for cd in rig.get("custom_devices") or []))
+    return tuple(parts)
+
+
+def build(rig: Dict, key: int = 0, source: Optional[Dict] = None) -> FixtureTable:
+    """Tabelle aus einem normalisierten Rig (siehe rig_model.current)."""
+    table = FixtureTable(key, source)
+    for cat, prefix in enumerate(FIXTURE_PREFIXES):
+        for idx, it in enumerate(rig.get(f"{prefix}_items") or []):
+            table._append(cat, idx, f"{prefix}_{idx}", it.get("model") or prefix.capitalize(), it)
+    for idx, cd in enumerate(rig.get("custom_devices") or []):
+        label = cd.get("name") or cd.get("model") or f"Custom {idx + 1}"
+        table._append(CUSTOM, idx, f"custom_{idx}", label, cd)
+    return table
+
+
+def get_table(rig: Optional[Dict]) -> FixtureTable:
+    """
+    Tabelle für den aktuellen Rig-Stand: gecacht pro Rig-Objekt bis zum
+    nächsten `rig_model.touch`, bei nicht migrierten Dicts pro Rohwerten. Footprints aus dem GDTF-Katalog (inkl.
+    lokaler Bibliothek) ändern sich mit dessen Version.
+    Die Tabelle ist geteilt und darf nicht verändert werden.
+    """
+    rig = rig or {}
+    catalog = gdtf_api.catalog_version()
+    if rig_model.is_current(rig):
+        source: Optional[Dict] = rig
+        key: tuple = ("rig", id(rig), catalog)
+    else:
+        source = None
+        rig = rig_model.current(rig)
+        key = ("raw", _rig_key(rig), catalog)
+    with _lock:
+        table = _cache.get(key)
+        if table is not None and table.source is source:
+            _cache.move_to_end(key)
+            return table
+        touches = _touches
+    table = build(rig, next(_versions), source)
+    with _lock:
+        if source is not None and touches != _touches:
+            # Rig wurde während des Aufbaus geändert: Tabelle evtl. veraltet
+            return table
+        _cache[key] = table
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return table
+
+
+def _forget(rig: Dict) -> None:
+    """`rig_model.touch`: gecachte Tabellen dieses Rigs verwerfen."""
+    global _touches
+    with _lock:
+        _touches += 1
+        for key in [k for k, t in _cache.items() if t.source is rig]:
+            del _cache[key]
+
+
+rig_model.on_touch(_forget)
+
+
+def clear_cache() -> None:
+    with _lock:
+        _cache.clear()
@@ -3,122 +3,437 @@ GDTF Share API Client
 Kommuniziert mit der GDTF Share API für Fixture-Daten.
 
 API-Dokumentation: https://github.com/mvrdevelopment/tools/blob/main/GDTF_Share_API/GDTF%20Share%20API.md
+
+Der Fixture-Katalog wird zusätzlich auf der Platte gehalten
+(`data/gdtf_catalog.json.gz`, nur die öffentliche Liste – keine Zugangsdaten)
+und nach dem Prinzip "stale-while-revalidate" ausgeliefert: ist der Katalog
+älter als CACHE_DURATION, wird sofort der vorhandene Stand zurückgegeben und
+im Hintergrund neu geladen (bedingt per ETag / Last-Modified, falls GDTF Share
+die Header liefert). Nur beim allerersten Abruf ohne jede Kopie wird
+auf das Netzwerk gewartet. Netzwerkzugriffe (Session, Re-Login,
+Wiederholungen, Circuit Breaker) kapselt services/gdtf_client.py.
+
+Einträge der lokalen Bibliothek (services/gdtf_library.py, eingelesene
+.gdtf-Dateien) stehen vor der GDTF-Share-Liste; ohne GDTF-Login oder
+Internet wird nur mit ihnen (und der vorhandenen Kopie) gearbeitet.
+
+Abfragen (Hersteller, Fixtures, Modes, Footprints) laufen über einen Index,
+der einmal pro geladenem Katalog aufgebaut wird (`_CatalogIndex`).
 """
 
 import requests
-from typing import List, Dict, Optional
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
+import gzip
+import heapq
+import json
+import os
+import threading
 import time
 
-# Cache-Dauer in Sekunden (1 Stunde)
+from services import gdtf_library
+from services.gdtf_client import GdtfClient
+
+# Cache-Dauer in Sekunden (1 Stunde) – danach wird im Hintergrund aktualisiert
 CACHE_DURATION = 3600
 
 # GDTF Share API Base URL
 GDTF_API_BASE = "https://gdtf-share.com/apis/public"
 
+# Katalog auf der Platte (überlebt Neustarts)
+CATALOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "gdtf_catalog.json.gz")
+
 # Globaler Cache für Fixture-Liste
 _fixtures_cache: Dict = {
     "data": None,
     "timestamp": 0,
-    "session": None
+    "etag": None,
+    "last_modified": None,
+    "changed_at": 0,
+    "disk_checked": False,
 }
 
+# Gepoolte Session mit Re-Login, Backoff und Circuit Breaker
+_client = GdtfClient()
 
-def _login(username: str, password: str) -> Optional[requests.Session]:
-    """
-    Login bei GDTF Share mit Username und Password.
-    
-    Args:
-        username: GDTF Share Username
-        password: GDTF Share Password
-        
-    Returns:
-        Session-Objekt bei Erfolg, None bei Fehler
-    """
-    session = requests.Session()
-    
+# Höchstens ein Abruf gleichzeitig (Vordergrund oder Hintergrund)
+_refresh_lock = threading.Lock()
+_refresh_thread: Optional[threading.Thread] = None
+
+
+def _load_catalog() -> bool:
+    """Katalog von der Platte in den Speicher laden (einmal pro Prozess)."""
+    _fixtures_cache["disk_checked"] = True
     try:
-        response = session.post(
-            f"{GDTF_API_BASE}/login.php",
-            json={"user": username, "password": password},
-            headers={"Content-Type": "application/json"},
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("result") == True:
-                print(f"[GDTF] Login erfolgreich: {data.get('notice', '')}")
-                return session
-        
-        print(f"[GDTF] Login fehlgeschlagen: {response.status_code}")
-        return None
-        
-    except Exception as e:
-        print(f"[GDTF] Login-Fehler: {e}")
-        return None
+        with gzip.open(CATALOG_FILE, "rt", encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return False
+    fixtures = stored.get("list") if isinstance(stored, dict) else None
+    if not isinstance(fixtures, list):
+        return False
+    _fixtures_cache["data"] = fixtures
+    _fixtures_cache["timestamp"] = stored.get("fetched_at", 0)
+    _fixtures_cache["etag"] = stored.get("etag")
+    _fixtures_cache["last_modified"] = stored.get("last_modified")
+    _fixtures_cache["changed_at"] = stored.get("changed_at") or _fixtures_cache["timestamp"]
+    print(f"[GDTF] {len(fixtures)} Fixtures aus dem lokalen Katalog geladen")
+    return True
 
 
-def _get_all_fixtures(username: str, password: str) -> List[Dict]:
+def _save_catalog() -> None:
+    """Aktuellen Katalog atomar auf die Platte schreiben."""
+    stored = {
+        "version": 1,
+        "fetched_at": _fixtures_cache["timestamp"],
+        "etag": _fixtures_cache.get("etag"),
+        "last_modified": _fixtures_cache.get("last_modified"),
+        "changed_at": _fixtures_cache.get("changed_at"),
+        "list": _fixtures_cache["data"],
+    }
+    tmp = CATALOG_FILE + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(CATALOG_FILE), exist_ok=True)
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(stored, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, CATALOG_FILE)
+    except OSError as e:
+        print(f"[GDTF] Katalog konnte nicht gespeichert werden: {e}")
+
+
+def _fetch_list(username: str, password: str) -> bool:
     """
-    Holt alle Fixtures von GDTF Share.
-    Nutzt Cache um API-Aufrufe zu minimieren.
-    
-    Args:
-        username: GDTF Share Username
-        password: GDTF Share Password
-        
-    Returns:
-        Liste aller Fixtures mit Manufacturer, Fixture, Modes, etc.
+    Lädt die Fixture-Liste von GDTF Share (bedingt, falls ETag/Last-Modified
+    bekannt sind). Gibt True zurück, wenn der Katalog jetzt aktuell ist.
     """
-    global _fixtures_cache
-    
-    now = time.time()
-    
-    # Cache prüfen (1 Stunde gültig)
-    if _fixtures_cache["data"] and (now - _fixtures_cache["timestamp"]) < CACHE_DURATION:
-        return _fixtures_cache["data"]
-    
-    # Login
-    session = _login(username, password)
-    if not session:
-        return []
-    
+    headers = {}
+    if _fixtures_cache["data"] is not None:
+        if _fixtures_cache.get("etag"):
+            headers["If-None-Match"] = _fixtures_cache["etag"]
+        if _fixtures_cache.get("last_modified"):
+            headers["If-Modified-Since"] = _fixtures_cache["last_modified"]
+
     try:
-        response = session.get(
-            f"{GDTF_API_BASE}/getList.php",
-            timeout=60
-        )
-        
+        # Session-Wiederverwendung, Re-Login bei 401, Wiederholungen: siehe gdtf_client
+        response = _client.get(GDTF_API_BASE, "/getList.php", username, password, headers=headers)
+        if response is None:
+            return False
+
         if response.status_code == 401:
             print("[GDTF] Nicht autorisiert - Session ungültig")
-            return []
-        
+            return False
+
+        if response.status_code == 304:
+            _fixtures_cache["timestamp"] = time.time()
+            _save_catalog()
+            print("[GDTF] Katalog unverändert")
+            return True
+
         if response.status_code != 200:
             print(f"[GDTF] API-Fehler: {response.status_code}")
-            return []
-        
+            return False
+
         data = response.json()
-        
+
         if not data.get("result"):
             print(f"[GDTF] API-Fehler: {data.get('error', 'Unbekannt')}")
-            return []
-        
+            return False
+
         fixtures = data.get("list", [])
-        
+
         # Cache aktualisieren
         _fixtures_cache["data"] = fixtures
-        _fixtures_cache["timestamp"] = now
-        _fixtures_cache["session"] = session
-        
+        _fixtures_cache["timestamp"] = _fixtures_cache["changed_at"] = time.time()
+        _fixtures_cache["etag"] = response.headers.get("ETag")
+        _fixtures_cache["last_modified"] = response.headers.get("Last-Modified")
+        _save_catalog()
+
         print(f"[GDTF] {len(fixtures)} Fixtures geladen")
-        return fixtures
-        
+        return True
+
     except requests.RequestException as e:
         print(f"[GDTF] Verbindungsfehler: {e}")
-        return []
+        return False
     except Exception as e:
         print(f"[GDTF] Fehler: {e}")
-        return []
+        return False
+
+
+def refresh_catalog(username: str, password: str) -> bool:
+    """Katalog jetzt aktualisieren (wartet auf einen bereits laufenden Abruf)."""
+    started = time.time()
+    with _refresh_lock:
+        # Während des Wartens hat ein anderer Abruf den Katalog schon erneuert
+        if _fixtures_cache["data"] is not None and _fixtures_cache["timestamp"] >= started:
+            return True
+        return _fetch_list(username, password)
+
+
+def _refresh_in_background(username: str, password: str) -> None:
+    if refresh_catalog(username, password):
+        _warm_indexes()
+
+
+def refresh_catalog_async(username: str, password: str) -> Optional[threading.Thread]:
+    """Aktualisierung im Hintergrund starten (höchstens ein Thread gleichzeitig)."""
+    global _refresh_thread
+    if _refresh_thread is not None and _refresh_thread.is_alive():
+        return _refresh_thread
+    _refresh_thread = threading.Thread(
+        target=_refresh_in_background, args=(username, password), name="gdtf-refresh", daemon=True
+    )
+    _refresh_thread.start()
+    return _refresh_thread
+
+
+def prefetch_catalog(username: str, password: str) -> None:
+    """Katalog bereitstellen, ohne zu warten: fehlt er oder ist er veraltet, im Hintergrund laden."""
+    if _fixtures_cache["data"] is None and not _fixtures_cache["disk_checked"]:
+        _load_catalog()
+    if not (username and password):
+        return
+    if _fixtures_cache["data"] is None or time.time() - _fixtures_cache["timestamp"] >= CACHE_DURATION:
+        refresh_catalog_async(username, password)
+
+
+def _get_all_fixtures(username: str, password: str) -> List[Dict]:
+    """
+    Holt alle Fixtures von GDTF Share.
+    Liefert sofort den gespeicherten Katalog (Speicher, sonst Platte); ist er
+    veraltet, wird er im Hintergrund erneuert. Nur ohne jede Kopie wird gewartet.
+    
+    Args:
+        username: GDTF Share Username
+        password: GDTF Share Password
+        
+    Returns:
+        Liste aller Fixtures mit Manufacturer, Fixture, Modes, etc.
+    """
+    if _fixtures_cache["data"] is None and not _fixtures_cache["disk_checked"]:
+        _load_catalog()
+
+    if not (username and password):
+        # Ohne GDTF-Login (offline): vorhandene Kopie + lokale Bibliothek
+        return _with_library(_fixtures_cache["data"])
+
+    if _fixtures_cache["data"] is None:
+        if gdtf_library.entries():
+            # Lokale Bibliothek vorhanden: nicht auf GDTF Share warten
+            refresh_catalog_async(username, password)
+        else:
+            # Kaltstart ohne lokalen Katalog: nichts, was ausgeliefert werden könnte
+            refresh_catalog(username, password)
+        return _with_library(_fixtures_cache["data"])
+
+    if time.time() - _fixtures_cache["timestamp"] >= CACHE_DURATION:
+        refresh_catalog_async(username, password)
+    return _with_library(_fixtures_cache["data"])
+
+
+# Zuletzt zusammengeführter Katalog: (GDTF-Share-Liste, Bibliothek) -> Ergebnis
+_merged: Dict = {"share": None, "library": None, "data": []}
+
+
+def _with_library(data: Optional[List[Dict]]) -> List[Dict]:
+    """
+    GDTF-Share-Liste mit der lokalen Bibliothek davor (services/gdtf_library.py).
+    Bleibt dasselbe Objekt, solange sich keine der beiden Listen ändert
+    (die Indizes hängen an dieser Identität).
+    """
+    local = gdtf_library.entries()
+    if not local:
+        return data if data is not None else []
+    if _merged["share"] is not data or _merged["library"] is not local:
+        _merged.update(share=data, library=local, data=local + (data or []))
+    return _merged["data"]
+
+
+def catalog_version() -> Optional[str]:
+    """
+    Version des Katalogs für HTTP-ETags: ändert sich nur, wenn eine neue
+    Liste geladen wurde (nicht bei 304) oder sich die lokale Bibliothek
+    ändert. None, solange kein Katalog vorliegt.
+    """
+    if _fixtures_cache["data"] is None and not _fixtures_cache["disk_checked"]:
+        _load_catalog()
+    local = gdtf_library.version()
+    if _fixtures_cache["data"] is None:
+        return f"local-{local}" if local else None
+    version = format(int(_fixtures_cache["changed_at"] * 1000), "x")
+    return f"{version}-{local}" if local else version
+
+
+def _parse_modes(fixture: Dict) -> List[Dict]:
+    """Modes eines Katalog-Eintrags als [{name, dmx_footprint}]."""
+    modes = []
+    for mode_entry in fixture.get("modes", []):
+        if isinstance(mode_entry, dict):
+            for key, mode_data in mode_entry.items():
+                if isinstance(mode_data, dict):
+                    modes.append({
+                        "name": mode_data.get("name", ""),
+                        "dmx_footprint": mode_data.get("dmxfootprint", 0)
+                    })
+                elif isinstance(mode_data, list) and len(mode_data) >= 2:
+                    modes.append({
+                        "name": mode_data[0] if isinstance(mode_data[0], str) else mode_data[0].get("name", ""),
+                        "dmx_footprint": mode_data[1] if isinstance(mode_data[1], int) else 0
+                    })
+    return modes
+
+
+def _normalize_name(name: str) -> str:
+    """Vergleichsform für Herstellernamen: klein, "-" wie Leerzeichen ("JB-Lighting" ~ "JB Lighting")."""
+    return " ".join((name or "").lower().replace("-", " ").split())
+
+
+class _CatalogIndex:
+    """
+    Nachschlage-Strukturen für einen geladenen Katalog (einmal pro Ladevorgang
+    aufgebaut, danach nur gelesen):
+
+        manufacturers    sortierte Herstellernamen
+        by_manufacturer  Hersteller (klein) -> Fixtures, nach Name sortiert
+        modes            Fixture-Name (klein) -> [(Hersteller (klein), Modes)]
+        footprints       (Hersteller, Fixture, Mode) (klein) -> DMX-Footprint
+        prefixes         sortierte (Name ab Wortanfang, Hersteller) für Teiltreffer
+
+    Ergebnisse pro Suchbegriff werden zusätzlich gemerkt. Die gelieferten
+    Listen sind geteilt und dürfen nicht verändert werden.
+    """
+
+    _MATCH_CACHE_SIZE = 256
+
+    def __init__(self, data: List[Dict]):
+        self.source = data
+        self.by_manufacturer: Dict[str, List[Dict]] = {}
+        self._rows: Dict[str, List[Tuple[str, int, Dict]]] = {}  # (Name klein, Katalog-Position, Fixture)
+        self.modes: Dict[str, List[Tuple[str, List[Dict]]]] = {}
+        self.footprints: Dict[Tuple[str, str, str], int] = {}
+        self._normalized: Dict[str, str] = {}
+        self._matches: "OrderedDict[str, Tuple[frozenset, List[Dict]]]" = OrderedDict()
+        self._matches_lock = threading.Lock()
+
+        names = set()
+        for pos, fixture in enumerate(data):
+            manufacturer = fixture.get("manufacturer", "") or ""
+            name = fixture.get("fixture", "") or ""
+            mfr_key, name_key = manufacturer.lower(), name.lower()
+            modes = _parse_modes(fixture)
+            entry = {
+                "fixture": name,
+                "manufacturer": manufacturer,
+                "revision": fixture.get("revision", ""),
+                "rid": fixture.get("rid", 0),
+                "modes": modes,
+                "rating": fixture.get("rating", 0),
+                "uploader": fixture.get("uploader", "")
+            }
+            if manufacturer:
+                names.add(manufacturer)
+            self._rows.setdefault(mfr_key, []).append((name_key, pos, entry))
+            self.modes.setdefault(name_key, []).append((mfr_key, modes))
+            for mode in modes:
+                footprint = mode.get("dmx_footprint") or 0
+                if isinstance(footprint, int) and footprint > 0:
+                    self.footprints.setdefault((mfr_key, name_key, (mode.get("name") or "").lower()), footprint)
+
+        self.manufacturers: List[str] = sorted(names)
+        prefixes = []
+        for mfr_key, rows in self._rows.items():
+            rows.sort(key=lambda row: row[:2])
+            self.by_manufacturer[mfr_key] = [row[2] for row in rows]
+            words = _normalize_name(mfr_key).split(" ")
+            self._normalized[mfr_key] = " ".join(words)
+            for i in range(len(words)):
+                prefixes.append((" ".join(words[i:]), mfr_key))
+        prefixes.sort()
+        self.prefixes = prefixes
+        self._prefix_keys = [p[0] for p in prefixes]
+
+    def _match_manufacturers(self, query: str) -> frozenset:
+        """
+        Hersteller, bei denen der Suchbegriff an einem Wortanfang beginnt
+        ("Astera" -> "Astera LED Technology", "Lighting" -> "JB Lighting").
+        Nur ohne solchen Treffer wird mitten im Namen gesucht.
+        """
+        q = _normalize_name(query)
+        found = set()
+        i = bisect_left(self._prefix_keys, q)
+        while i < len(self.prefixes) and self._prefix_keys[i].startswith(q):
+            found.add(self.prefixes[i][1])
+            i += 1
+        if not found:
+            found = {key for key, norm in self._normalized.items() if q in norm}
+        return frozenset(found)
+
+    def match(self, query: str) -> Tuple[frozenset, List[Dict]]:
+        """(Hersteller-Keys, Fixtures sortiert nach Name) für einen Suchbegriff (gemerkt)."""
+        with self._matches_lock:
+            hit = self._matches.get(query)
+            if hit is not None:
+                self._matches.move_to_end(query)
+                return hit
+        keys = self._match_manufacturers(query)
+        if len(keys) == 1:
+            fixtures = self.by_manufacturer[next(iter(keys))]
+        else:
+            # Vorsortierte Listen zusammenführen (gleiche Namen in Katalog-Reihenfolge)
+            merged = heapq.merge(*(self._rows[key] for key in keys), key=lambda row: row[:2])
+            fixtures = [row[2] for row in merged]
+        hit = (keys, fixtures)
+        with self._matches_lock:
+            self._matches[query] = hit
+            while len(self._matches) > self._MATCH_CACHE_SIZE:
+                self._matches.popitem(last=False)
+        return hit
+
+
+_catalog_index: Optional[_CatalogIndex] = None
+_index_lock = threading.Lock()
+
+
+def _index_for(data: List[Dict]) -> _CatalogIndex:
+    """
+    Index zum übergebenen Katalog (neu aufgebaut, sobald ein anderer Katalog
+    geladen ist). Gebaut wird höchstens in einem Thread, die anderen warten.
+    """
+    global _catalog_index
+    index = _catalog_index
+    if index is not None and index.source is data:
+        return index
+    with _index_lock:
+        index = _catalog_index
+        if index is None or index.source is not data:
+            index = _catalog_index = _CatalogIndex(data)
+        return index
+
+
+def _warm_indexes() -> None:
+    """Indizes zum frisch geladenen Katalog bauen (im Hintergrund-Thread, nicht im Request)."""
+    from services import gdtf_search
+
+    data = _with_library(_fixtures_cache["data"])
+    if data:
+        _index_for(data)
+        gdtf_search.warm_index(data)
+
+
+def cached_dmx_footprint(manufacturer: str, fixture_name: str, mode: str) -> Optional[int]:
+    """
+    DMX-Footprint aus dem lokalen Katalog (Speicher, sonst Platte, plus
+    lokale Bibliothek) – ohne Login/Netzwerk. Gibt None zurück, wenn kein Katalog vorliegt oder der
+    Mode unbekannt ist.
+    """
+    if _fixtures_cache.get("data") is None and not _fixtures_cache.get("disk_checked"):
+        _load_catalog()
+    data = _with_library(_fixtures_cache.get("data"))
+    if not data:
+        return None
+    return _index_for(data).footprints.get(
+        ((manufacturer or "").lower(), (fixture_name or "").lower(), (mode or "").lower())
+    )
 
 
 def get_manufacturers(username: str, password: str) -> List[str]:
@@ -132,20 +447,14 @@ def get_manufacturers(username: str, password: str) -> List[str]:
     Returns:
         Sortierte Liste der Hersteller-Namen
     """
-    fixtures = _get_all_fixtures(username, password)
-    manufacturers = set()
-    
-    for fixture in fixtures:
-        manufacturer = fixture.get("manufacturer")
-        if manufacturer:
-            manufacturers.add(manufacturer)
-    
-    return sorted(manufacturers)
+    return list(_index_for(_get_all_fixtures(username, password)).manufacturers)
 
 
 def get_fixtures_by_manufacturer(username: str, password: str, manufacturer: str) -> List[Dict]:
     """
     Gibt alle Fixtures eines bestimmten Herstellers zurück.
+    Partielles Matching: "Astera" findet auch "Astera LED Technology",
+    "JB-Lighting" findet auch "JB Lighting GmbH".
     
     Args:
         username: GDTF Share Username
@@ -154,55 +463,9 @@ def get_fixtures_by_manufacturer(username: str, password: str, manufacturer: str
         
     Returns:
         Liste der Fixtures mit Name, Modes, DMX-Footprint, etc.
+        (nach Fixture-Name sortiert; geteilt, nicht verändern)
     """
-    fixtures = _get_all_fixtures(username, password)
-    result = []
-    
-    manufacturer_lower = manufacturer.lower()
-    
-    for fixture in fixtures:
-        fix_manufacturer = fixture.get("manufacturer", "")
-        fix_manufacturer_lower = fix_manufacturer.lower()
-        
-        # Partielles Matching: "Astera" findet auch "Astera LED Technology"
-        # oder "JB-Lighting" findet auch "JB Lighting GmbH"
-        matches = (
-            fix_manufacturer_lower == manufacturer_lower or  # Exakter Match
-            manufacturer_lower in fix_manufacturer_lower or   # Hersteller enthält Suchbegriff
-            fix_manufacturer_lower.startswith(manufacturer_lower.replace("-", " ").replace("-", ""))  # Start-Match
-        )
-        
-        if matches:
-            # Modes extrahieren
-            modes_raw = fixture.get("modes", [])
-            modes = []
-            for mode_entry in modes_raw:
-                if isinstance(mode_entry, dict):
-                    for key, mode_data in mode_entry.items():
-                        if isinstance(mode_data, dict):
-                            modes.append({
-                                "name": mode_data.get("name", ""),
-                                "dmx_footprint": mode_data.get("dmxfootprint", 0)
-                            })
-                        elif isinstance(mode_data, list) and len(mode_data) >= 2:
-                            modes.append({
-                                "name": mode_data[0] if isinstance(mode_data[0], str) else mode_data[0].get("name", ""),
-                                "dmx_footprint": mode_data[1] if isinstance(mode_data[1], int) else 0
-                            })
-            
-            result.append({
-                "fixture": fixture.get("fixture", ""),
-                "manufacturer": fix_manufacturer,
-                "revision": fixture.get("revision", ""),
-                "rid": fixture.get("rid", 0),
-                "modes": modes,
-                "rating": fixture.get("rating", 0),
-                "uploader": fixture.get("uploader", "")
-            })
-    
-    # Nach Fixture-Name sortieren
-    result.sort(key=lambda x: x["fixture"].lower())
-    return result
+    return _index_for(_get_all_fixtures(username, password)).match(manufacturer)[1]
 
 
 def get_model_names_by_manufacturer(username: str, password: str, manufacturer: str) -> List[str]:
@@ -218,15 +481,7 @@ def get_model_names_by_manufacturer(username: str, password: str, manufacturer:
         Sortierte Liste der Fixture-Namen (ohne Duplikate)
     """
     fixtures = get_fixtures_by_manufacturer(username, password, manufacturer)
-    
-    # Einzigartige Namen sammeln
-    names = set()
-    for fixture in fixtures:
-        name = fixture.get("fixture", "")
-        if name:
-            names.add(name)
-    
-    return sorted(names)
+    return sorted({f["fixture"] for f in fixtures if f["fixture"]})
 
 
 def get_modes_for_fixture(username: str, password: str, manufacturer: str, fixture_name: str) -> List[Dict]:
@@ -242,17 +497,29 @@ def get_modes_for_fixture(username: str, password: str, manufacturer: str, fixtu
     Returns:
         Liste der Modes mit Name und DMX-Footprint
     """
-    fixtures = get_fixtures_by_manufacturer(username, password, manufacturer)
-    
-    for fixture in fixtures:
-        if fixture.get("fixture", "").lower() == fixture_name.lower():
-            return fixture.get("modes", [])
-    
+    index = _index_for(_get_all_fixtures(username, password))
+    keys = index.match(manufacturer)[0]
+    # Erster Treffer in Katalog-Reihenfolge
+    for mfr_key, modes in index.modes.get(fixture_name.lower(), ()):
+        if mfr_key in keys:
+            return modes
     return []
 
 
 def clear_cache():
-    """Cache leeren (z.B. nach Credential-Änderung)."""
+    """
+    Cache leeren (z.B. nach Credential-Änderung): Session und Speicher-Kopie
+    verwerfen, Circuit Breaker zurücksetzen. Der Katalog auf der Platte bleibt und wird beim nächsten
+    Zugriff wieder geladen.
+    """
     global _fixtures_cache
-    _fixtures_cache = {"data": None, "timestamp": 0, "session": None}
+    _client.reset()
+    _fixtures_cache = {
+        "data": None,
+        "timestamp": 0,
+        "etag": None,
+        "last_modified": None,
+        "changed_at": 0,
+        "disk_checked": False,
+    }
     print("[GDTF] Cache geleert")
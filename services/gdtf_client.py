@@ -0,0 +1,166 @@
+"""
+HTTP-Client für GDTF Share.
+
+Eine Session (mit Connection-Pool) wird über alle Abrufe hinweg
+wiederverwendet; neu eingeloggt wird nur, wenn GDTF Share mit 401 antwortet.
+Verbindungsfehler, Timeouts und 5xx/429 werden mit exponentiellem Backoff
+wiederholt. Nach mehreren Fehlschlägen in Folge öffnet ein Circuit Breaker:
+für COOLDOWN Sekunden geht keine Anfrage mehr raus, Aufrufer bekommen sofort
+None und liefern den vorhandenen Katalog aus. Danach darf ein Versuch durch;
+klappt er, ist der Breaker wieder zu.
+"""
+from typing import Dict, Optional, Tuple
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Wiederholungen nach dem ersten Versuch; Wartezeit BACKOFF * 2^n (+ Zufall)
+RETRIES = 2
+BACKOFF = 0.5
+# Fehlschläge in Folge, nach denen der Breaker öffnet, und dessen Dauer
+FAILURE_THRESHOLD = 3
+COOLDOWN = 60
+# (Verbindungsaufbau, Lesen) in Sekunden
+TIMEOUT: Tuple[float, float] = (5, 30)
+
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class _Retryable(Exception):
+    """Antwort, die einen neuen Versuch rechtfertigt (5xx/429)."""
+
+
+class GdtfClient:
+    """Wiederverwendete, gepoolte Session mit Re-Login, Backoff und Circuit Breaker."""
+
+    def __init__(self, retries: int = RETRIES, backoff: float = BACKOFF,
+                 failure_threshold: int = FAILURE_THRESHOLD, cooldown: float = COOLDOWN,
+                 timeout: Tuple[float, float] = TIMEOUT):
+        self.retries = retries
+        self.backoff = backoff
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+        self._failures = 0
+        self._open_until = 0.0
+
+    # ------------------------------------------------------------------ #
+    # Circuit Breaker
+    # ------------------------------------------------------------------ #
+
+    def is_open(self) -> bool:
+        """True, solange nach wiederholten Fehlschlägen keine Anfragen rausgehen."""
+        return time.time() < self._open_until
+
+    def _record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._open_until = 0.0
+
+    def _record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._open_until = time.time() + self.cooldown
+                print(f"[GDTF] GDTF Share nicht erreichbar - Pause für {self.cooldown:.0f}s")
+
+    def reset(self) -> None:
+        """Session verwerfen und Breaker schließen (z.B. nach neuen Zugangsdaten)."""
+        with self._lock:
+            session, self._session = self._session, None
+            self._failures = 0
+            self._open_until = 0.0
+        if session is not None:
+            session.close()
+
+    # ------------------------------------------------------------------ #
+    # Session
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _new_session() -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _login(self, base: str, username: str, password: str) -> Optional[requests.Session]:
+        """Login bei GDTF Share; None bei abgelehnten Zugangsdaten."""
+        session = self._new_session()
+        response = session.post(
+            f"{base}/login.php",
+            json={"user": username, "password": password},
+            headers={"Content-Type": "application/json"},
+            timeout=self.timeout,
+        )
+        if response.status_code in _RETRY_STATUS:
+            session.close()
+            raise _Retryable(f"Login: HTTP {response.status_code}")
+        if response.status_code == 200 and response.json().get("result") is True:
+            print(f"[GDTF] Login erfolgreich: {response.json().get('notice', '')}")
+            return session
+        print(f"[GDTF] Login fehlgeschlagen: {response.status_code}")
+        session.close()
+        return None
+
+    def _session_for(self, base: str, username: str, password: str) -> Optional[requests.Session]:
+        session = self._session
+        if session is None:
+            session = self._login(base, username, password)
+            with self._lock:
+                self._session = session
+        return session
+
+    # ------------------------------------------------------------------ #
+    # Anfragen
+    # ------------------------------------------------------------------ #
+
+    def get(self, base: str, path: str, username: str, password: str,
+            headers: Optional[Dict[str, str]] = None) -> Optional[requests.Response]:
+        """
+        GET auf `base + path` mit eingeloggter Session.
+
+        Returns:
+            Antwort (auch 304/4xx), oder None, wenn GDTF Share nicht erreichbar
+            ist, der Breaker offen ist oder der Login abgelehnt wurde
+        """
+        if self.is_open():
+            print("[GDTF] GDTF Share pausiert - vorhandener Katalog wird genutzt")
+            return None
+
+        relogged = False
+        attempt = 0
+        while True:
+            try:
+                session = self._session_for(base, username, password)
+                if session is None:
+                    # Zugangsdaten abgelehnt: kein Ausfall von GDTF Share
+                    self._record_success()
+                    return None
+                response = session.get(f"{base}{path}", headers=headers or {}, timeout=self.timeout)
+                if response.status_code == 401 and not relogged:
+                    # Session abgelaufen: einmal neu einloggen, zählt nicht als Versuch
+                    relogged = True
+                    with self._lock:
+                        if self._session is session:
+                            self._session = None
+                    continue
+                if response.status_code in _RETRY_STATUS:
+                    raise _Retryable(f"HTTP {response.status_code}")
+                self._record_success()
+                return response
+            except (requests.ConnectionError, requests.Timeout, _Retryable) as e:
+                if attempt >= self.retries:
+                    print(f"[GDTF] Verbindungsfehler: {e}")
+                    self._record_failure()
+                    return None
+                delay = self.backoff * (2 ** attempt)
+                attempt += 1
+                print(f"[GDTF] {e} - neuer Versuch in {delay:.1f}s")
+                time.sleep(delay + random.uniform(0, delay / 2))
@@ -0,0 +1,392 @@
+"""
+Lokale GDTF-Bibliothek für den Offline-Betrieb.
+
+`.gdtf`-Dateien (ZIP mit `description.xml`) aus LIBRARY_DIR werden gelesen
+und als Katalog im selben Format wie die GDTF-Share-Liste bereitgestellt
+(`manufacturer`, `fixture`, `revision`, `modes` …), ergänzt um Leistung,
+Gewicht, Abmessungen und den Dateinamen. services/gdtf_api.py stellt diese
+Einträge vor die GDTF-Share-Liste; Autovervollständigung, Suche,
+DMX-Footprints und der MVR-Export (`gdtfSpec` + eingebettete Datei)
+funktionieren damit ohne Internet.
+
+Geparste Ergebnisse werden nach SHA-256 des Dateiinhalts in INDEX_FILE
+gemerkt; eine unveränderte Datei (gleiche Größe + mtime) wird nicht einmal
+neu gehasht. Viele neue Dateien auf einmal werden in einem Prozess-Pool
+geparst (XML-Parsing ist CPU-lastig).
+
+Neue Dateien (auch in Unterordnern) werden automatisch eingelesen: höchstens
+alle LIBRARY_CHECK_INTERVAL Sekunden prüft ein Hintergrund-Thread die mtimes
+aller Verzeichnisse und liest bei einer Änderung neu ein (seriell, ohne
+Prozess-Pool). Bis dahin liefert die Bibliothek den bisherigen Stand.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+
+LIBRARY_DIR = Path(__file__).resolve().parent.parent / "data" / "gdtf_library"
+INDEX_FILE = Path(__file__).resolve().parent.parent / "data" / "gdtf_library_index.json"
+
+# Bei Änderungen am Parser erhöhen -> alle Dateien werden neu geparst
+PARSER_VERSION = 1
+# Ab so vielen neuen Dateien lohnt der Prozess-Pool
+POOL_MIN_FILES = 8
+# Abstand zwischen zwei automatischen Verzeichnis-Prüfungen (Sekunden)
+LIBRARY_CHECK_INTERVAL = 5.0
+
+_BLOCK = 1024 * 1024
+_NS_RE = re.compile(r"^\{[^}]*\}")
+
+_lock = threading.Lock()
+_refresh_lock = threading.Lock()
+_refresh_thread: Optional[threading.Thread] = None
+_state: Dict = {
+    "loaded": False,
+    "checked_at": 0.0,  # time.monotonic() der letzten automatischen Prüfung
+    "dir_mtime": None,  # neueste mtime aller Verzeichnisse der Bibliothek
+    "files": {},       # relativer Pfad -> {"size", "mtime_ns", "sha256"}
+    "parsed": {},      # sha256 -> geparster Eintrag (ohne Dateiname)
+    "entries": [],     # Katalog-Einträge (GDTF-Share-Format)
+    "by_name": {},     # (Hersteller, Fixture) klein -> Eintrag
+    "version": "",
+}
+
+
+# ---------------------------------------------------------------------- #
+# Parser (läuft auch in Worker-Prozessen)
+# ---------------------------------------------------------------------- #
+
+def _tag(el: ET.Element) -> str:
+    return _NS_RE.sub("", el.tag)
+
+
+def _children(el: Optional[ET.Element], name: str) -> List[ET.Element]:
+    return [c for c in el if _tag(c) == name] if el is not None else []
+
+
+def _child(el: Optional[ET.Element], name: str) -> Optional[ET.Element]:
+    found = _children(el, name)
+    return found[0] if found else None
+
+
+def _float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _offsets(value: Optional[str]) -> List[int]:
+    """DMX-Offsets eines Kanals ("1,2" bei 16 Bit, "None" bei virtuellen Kanälen)."""
+    return [int(p) for p in (value or "").split(",") if p.strip().isdigit()]
+
+
+def _mode_footprint(mode: ET.Element, references: Dict[str, List[ET.Element]]) -> int:
+    """
+    Kanäle im ersten DMX-Break. Kanäle auf referenzierten Geometrien
+    (Pixel-Bars: GeometryReference mit Break/DMXOffset) zählen pro Instanz.
+    """
+    footprint = 0
+    for channel in _children(_child(mode, "DMXChannels"), "DMXChannel"):
+        offsets = _offsets(channel.get("Offset"))
+        if not offsets:
+            continue
+        dmx_break = channel.get("DMXBreak", "1")
+        instances = references.get(channel.get("Geometry", ""))
+        if not instances:
+            if dmx_break == "1":
+                footprint = max(footprint, max(offsets))
+            continue
+        for ref in instances:
+            breaks = _children(ref, "Break")
+            if not breaks:
+                continue
+            if dmx_break == "Overwrite":
+                # "Overwrite": Break kommt aus der Referenz (letzter Eintrag)
+                brk = breaks[-1]
+            else:
+                brk = next((b for b in breaks if b.get("DMXBreak", "1") == dmx_break), None)
+            if brk is None or brk.get("DMXBreak", "1") != "1":
+                continue
+            base = int(_float(brk.get("DMXOffset")) or 1)
+            footprint = max(footprint, base + max(offsets) - 1)
+    return footprint
+
+
+def _dimensions(fixture_type: ET.Element) -> Optional[Dict[str, int]]:
+    """Abmessungen (mm) des Modells der obersten Geometrie."""
+    geometries = _child(fixture_type, "Geometries")
+    root = next(iter(geometries), None) if geometries is not None else None
+    if root is None:
+        return None
+    models = {m.get("Name"): m for m in _children(_child(fixture_type, "Models"), "Model")}
+    model = models.get(root.get("Model"))
+    if model is None:
+        return None
+    dims = {}
+    for key in ("Length", "Width", "Height"):
+        value = _float(model.get(key))
+        if value is not None:
+            dims[key.lower()] = int(round(value * 1000))
+    return dims or None
+
+
+def parse_description(xml: bytes) -> Dict:
+    """description.xml -> Katalog-Eintrag (ohne Dateiname)."""
+    root = ET.fromstring(xml)
+    fixture_type = root if _tag(root) == "FixtureType" else _child(root, "FixtureType")
+    if fixture_type is None:
+        raise ValueError("FixtureType fehlt")
+
+    references: Dict[str, List[ET.Element]] = {}
+    geometries = _child(fixture_type, "Geometries")
+    for el in (geometries.iter() if geometries is not None else ()):
+        if _tag(el) == "GeometryReference" and el.get("Geometry"):
+            references.setdefault(el.get("Geometry"), []).append(el)
+
+    modes = []
+    for i, mode in enumerate(_children(_child(fixture_type, "DMXModes"), "DMXMode")):
+        modes.append({str(i): {"name": mode.get("Name", ""),
+                               "dmxfootprint": _mode_footprint(mode, references)}})
+
+    physical = _child(fixture_type, "PhysicalDescriptions")
+    power = None
+    weight = None
+    for el in (physical.iter() if physical is not None else ()):
+        if _tag(el) == "PowerConsumption":
+            value = _float(el.get("Value"))
+            if value is not None:
+                power = max(power or 0.0, value)
+        elif _tag(el) == "Weight":
+            weight = _float(el.get("Value"))
+
+    revisions = _children(_child(fixture_type, "Revisions"), "Revision")
+    revision = ""
+    if revisions:
+        last = revisions[-1]
+        revision = last.get("Text") or last.get("Date") or ""
+
+    return {
+        "manufacturer": fixture_type.get("Manufacturer", ""),
+        "fixture": fixture_type.get("Name", "") or fixture_type.get("LongName", ""),
+        "short_name": fixture_type.get("ShortName", ""),
+        "fixture_type_id": fixture_type.get("FixtureTypeID", ""),
+        "revision": revision,
+        "modes": modes,
+        "power": int(power) if power is not None and power.is_integer() else power,
+        "weight": weight,
+        "dimensions": _dimensions(fixture_type),
+    }
+
+
+def parse_gdtf(path: str) -> Dict:
+    """Eine .gdtf-Datei parsen. Fehler kommen als {"error": ...} zurück (Pool-tauglich)."""
+    try:
+        with zipfile.ZipFile(path) as zf:
+            return parse_description(zf.read("description.xml"))
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile, ET.ParseError) as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# ---------------------------------------------------------------------- #
+# Bibliothek
+# ---------------------------------------------------------------------- #
+
+def _dir_mtime(directory: Path) -> Optional[int]:
+    """
+    Neueste mtime des Verzeichnisses und aller Unterordner (ändert sich, wenn
+    irgendwo eine Datei hinzukommt, umbenannt oder gelöscht wird).
+    """
+    try:
+        newest = directory.stat().st_mtime_ns
+    except OSError:
+        return None
+    for root, dirnames, _ in os.walk(directory):
+        for name in dirnames:
+            try:
+                newest = max(newest, os.stat(os.path.join(root, name)).st_mtime_ns)
+            except OSError:
+                pass
+    return newest
+
+
+def _parse_all(paths: List[str], workers: Optional[int]) -> List[Dict]:
+    if len(paths) >= POOL_MIN_FILES and workers != 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(parse_gdtf, paths, chunksize=4))
+        except (OSError, RuntimeError) as e:
+            # z.B. keine Prozesse erlaubt: seriell weiter
+            print(f"[GDTF-LIB] Prozess-Pool nicht verfügbar ({e}), parse seriell")
+    return [parse_gdtf(p) for p in paths]
+
+
+def _publish(files: Dict, parsed: Dict) -> None:
+    """Katalog-Einträge aus Dateiliste + geparsten Ergebnissen aufbauen."""
+    entries, by_name = [], {}
+    for rel in sorted(files):
+        record = parsed.get(files[rel]["sha256"])
+        if not record or record.get("error"):
+            continue
+        entry = dict(record, file=rel, source="local", rid=0, rating=0, uploader="")
+        entries.append(entry)
+        by_name.setdefault((entry["manufacturer"].lower(), entry["fixture"].lower()), entry)
+    _state["files"] = files
+    _state["parsed"] = parsed
+    _state["entries"] = entries
+    _state["by_name"] = by_name
+    _state["version"] = hashlib.blake2b(
+        "\n".join(f"{rel}:{files[rel]['sha256']}" for rel in sorted(files)).encode(), digest_size=6
+    ).hexdigest() if files else ""
+
+
+def _load_index() -> None:
+    _state["loaded"] = True
+    try:
+        with open(INDEX_FILE, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return
+    if not isinstance(stored, dict) or stored.get("parser") != PARSER_VERSION:
+        return
+    _state["dir_mtime"] = stored.get("dir_mtime")
+    _publish(stored.get("files") or {}, stored.get("parsed") or {})
+
+
+def _save_index() -> None:
+    stored = {
+        "version": 1,
+        "parser": PARSER_VERSION,
+        "dir_mtime": _state["dir_mtime"],
+        "files": _state["files"],
+        "parsed": _state["parsed"],
+    }
+    tmp = INDEX_FILE.with_suffix(".tmp")
+    try:
+        INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(stored, f, ensure_ascii=False)
+        os.replace(tmp, INDEX_FILE)
+    except OSError as e:
+        print(f"[GDTF-LIB] Index konnte nicht gespeichert werden: {e}")
+
+
+def ingest(workers: Optional[int] = None) -> Dict[str, int]:
+    """
+    Bibliotheksverzeichnis einlesen: neue/geänderte Dateien hashen, unbekannte
+    Inhalte parsen (ab POOL_MIN_FILES im Prozess-Pool), Index speichern.
+
+    Returns:
+        Zähler: files, parsed (neu geparst), cached (aus dem Hash-Cache), failed
+    """
+    directory = Path(LIBRARY_DIR)
+    with _lock:
+        if not _state["loaded"]:
+            _load_index()
+        old_files, parsed = _state["files"], dict(_state["parsed"])
+        mtime = _dir_mtime(directory)
+
+        files: Dict[str, Dict] = {}
+        todo: Dict[str, Path] = {}
+        for path in sorted(directory.rglob("*")) if mtime is not None else []:
+            if not path.is_file() or path.suffix.lower() != ".gdtf":
+                continue
+            rel = path.relative_to(directory).as_posix()
+            st = path.stat()
+            known = old_files.get(rel)
+            if known and known["size"] == st.st_size and known["mtime_ns"] == st.st_mtime_ns:
+                files[rel] = known
+                continue
+            sha = _sha256(path)
+            files[rel] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha}
+            if sha not in parsed:
+                todo[sha] = path
+
+        stats = {"files": len(files), "parsed": len(todo), "cached": len(files) - len(todo), "failed": 0}
+        for sha, record in zip(todo, _parse_all([str(p) for p in todo.values()], workers)):
+            parsed[sha] = record
+            if record.get("error"):
+                stats["failed"] += 1
+                print(f"[GDTF-LIB] {todo[sha].name}: {record['error']}")
+
+        # Nur noch Ergebnisse zu vorhandenen Dateien behalten
+        live = {f["sha256"] for f in files.values()}
+        parsed = {sha: rec for sha, rec in parsed.items() if sha in live}
+        _state["dir_mtime"] = mtime
+        _publish(files, parsed)
+        _save_index()
+    print(f"[GDTF-LIB] {stats['files']} Dateien, {stats['parsed']} neu geparst, {stats['failed']} fehlerhaft")
+    return stats
+
+
+def _refresh_if_changed() -> None:
+    if _dir_mtime(Path(LIBRARY_DIR)) != _state["dir_mtime"]:
+        ingest(workers=1)
+
+
+def refresh_async() -> threading.Thread:
+    """Verzeichnis im Hintergrund prüfen und ggf. neu einlesen (höchstens ein Thread)."""
+    global _refresh_thread
+    with _refresh_lock:
+        if _refresh_thread is None or not _refresh_thread.is_alive():
+            _refresh_thread = threading.Thread(target=_refresh_if_changed, name="gdtf-library", daemon=True)
+            _refresh_thread.start()
+        return _refresh_thread
+
+
+def entries() -> List[Dict]:
+    """
+    Katalog-Einträge der Bibliothek (GDTF-Share-Format). Die Liste bleibt
+    dasselbe Objekt, bis ein Einlesen einen neuen Stand veröffentlicht.
+    Änderungen im Verzeichnis werden im Hintergrund übernommen.
+    """
+    if not _state["loaded"]:
+        with _lock:
+            if not _state["loaded"]:
+                _load_index()
+    now = time.monotonic()
+    if now - _state["checked_at"] >= LIBRARY_CHECK_INTERVAL:
+        _state["checked_at"] = now
+        refresh_async()
+    return _state["entries"]
+
+
+def version() -> str:
+    """Inhaltsversion der Bibliothek ("" = leer), z.B. für ETags."""
+    entries()
+    return _state["version"]
+
+
+def find(manufacturer: str, fixture_name: str) -> Optional[Dict]:
+    """Bibliothekseintrag zu Hersteller + Modell (Groß-/Kleinschreibung egal)."""
+    entries()
+    return _state["by_name"].get(((manufacturer or "").lower(), (fixture_name or "").lower()))
+
+
+def file_path(entry: Dict) -> Path:
+    return LIBRARY_DIR / entry["file"]
+
+
+def clear_cache() -> None:
+    """Speicherstand verwerfen (der Index auf der Platte bleibt)."""
+    # Laufendes Einlesen abwarten (schreibt sonst in einen verworfenen Stand)
+    thread = _refresh_thread
+    if thread is not None:
+        thread.join(30)
+    with _lock:
+        _state.update(loaded=False, checked_at=0.0, dir_mtime=None, files={}, parsed={}, entries=[], by_name={}, version="")
@@ -0,0 +1,217 @@
+"""
+Fehlertolerante Volltextsuche über den GDTF-Katalog.
+
+Gesucht wird in "Hersteller + Fixture", damit Eingaben wie "robe megapointe"
+oder "mac aura xb" ohne exakten Herstellernamen treffen. Grundlage ist ein
+invertierter Trigramm-Index (wie pg_trgm: jedes Wort mit zwei Leerzeichen
+davor und einem danach), der einmal pro geladenem Katalog aufgebaut wird:
+
+    Trigramm -> Liste der Dokument-Nummern
+
+Ein Dokument ist ein Fixture (Hersteller + Name); mehrere Revisionen auf
+GDTF Share werden zusammengefasst, es gilt die am besten bewertete, bei
+Gleichstand die neueste. Der Treffer-Score ist der Anteil der Trigramme der
+Anfrage, die im Dokument vorkommen – Tippfehler kosten nur einzelne
+Trigramme. Sortiert wird nach Score, dann Bewertung, dann Aktualität.
+
+Kandidaten kommen nur aus den seltensten Trigrammen der Anfrage: wer den
+Mindest-Score erreicht, muss mindestens eines davon enthalten. Häufige
+Trigramme ("  m", "ing") werden so nie als ganze Liste durchlaufen, sondern
+nur für die aussichtsreichsten Kandidaten nachgeprüft.
+
+Bei Eingabe während des Tippens ist das letzte Wort meist unvollständig;
+dafür entfällt das abschließende Leerzeichen-Trigramm. Ergebnisse pro
+Anfrage werden gemerkt.
+"""
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+import heapq
+import math
+import re
+import sys
+import threading
+
+from services import gdtf_api
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+MIN_QUERY_LENGTH = 2
+# Mindestanteil der Anfrage-Trigramme, die ein Treffer enthalten muss
+MIN_SCORE = 0.5
+
+_WORD_RE = re.compile(r"[^\w]+", re.UNICODE)
+
+
+def normalize(text: str) -> str:
+    """Kleinschreibung, Satzzeichen/Bindestriche als Leerzeichen."""
+    return " ".join(_WORD_RE.sub(" ", (text or "").lower()).replace("_", " ").split())
+
+
+def trigrams(text: str, partial_last: bool = False) -> set:
+    """Trigramme eines Textes; `partial_last`: letztes Wort ist evtl. unvollständig."""
+    words = normalize(text).split(" ")
+    grams = set()
+    for i, word in enumerate(words):
+        if not word:
+            continue
+        padded = "  " + word + ("" if partial_last and i == len(words) - 1 else " ")
+        grams.update(padded[j:j + 3] for j in range(len(padded) - 2))
+    return grams
+
+
+def _number(value) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _recency(fixture: Dict) -> tuple:
+    """Aktualität einer Revision: Änderungsdatum, sonst Upload-Reihenfolge (rid)."""
+    return (_number(fixture.get("lastModified") or fixture.get("creationDate")), _number(fixture.get("rid")))
+
+
+class _SearchIndex:
+    """Trigramm-Index über einen geladenen Katalog (nur lesen)."""
+
+    _CACHE_SIZE = 512
+
+    def __init__(self, data: List[Dict]):
+        self.source = data
+        best: Dict[Tuple[str, str], Dict] = {}
+        for fixture in data:
+            manufacturer = fixture.get("manufacturer", "") or ""
+            name = fixture.get("fixture", "") or ""
+            if not name:
+                continue
+            key = (manufacturer.lower(), name.lower())
+            current = best.get(key)
+            if current is None or (_number(fixture.get("rating")), _recency(fixture)) > (
+                    _number(current.get("rating")), _recency(current)):
+                best[key] = fixture
+
+        self.docs: List[Dict] = []
+        self.rank: List[tuple] = []   # (Bewertung, Aktualität) pro Dokument
+        self.grams: List[Tuple[str, ...]] = []   # Trigramme pro Dokument
+        postings: Dict[str, List[int]] = {}
+        for doc_id, fixture in enumerate(best.values()):
+            self.docs.append({
+                "manufacturer": fixture.get("manufacturer", "") or "",
+                "fixture": fixture.get("fixture", "") or "",
+                "revision": fixture.get("revision", ""),
+                "rid": fixture.get("rid", 0),
+                "rating": fixture.get("rating", 0),
+                "modes": gdtf_api._parse_modes(fixture),
+            })
+            self.rank.append((_number(fixture.get("rating")), _recency(fixture)))
+            # intern: jedes Trigramm nur einmal im Speicher, auch in self.grams
+            doc_grams = tuple(sys.intern(g) for g in trigrams(
+                f"{fixture.get('manufacturer', '')} {fixture.get('fixture', '')}"))
+            for gram in doc_grams:
+                postings.setdefault(gram, []).append(doc_id)
+            self.grams.append(doc_grams)
+        self.postings = postings
+        self._results: "OrderedDict[tuple, List[Dict]]" = OrderedDict()
+        self._results_lock = threading.Lock()
+
+    def _top(self, grams: set, limit: int) -> List[Tuple[int, int]]:
+        """Beste `limit` Dokumente als (Anzahl gemeinsamer Trigramme, Dokument)."""
+        needed = max(1, math.ceil(len(grams) * MIN_SCORE))
+        # Ein Treffer fehlt in höchstens len - needed Trigrammen, enthält also
+        # mindestens eines der len - needed + 1 seltensten
+        ordered = sorted(grams, key=lambda g: len(self.postings.get(g, ())))
+        rare, common = ordered[:len(grams) - needed + 1], frozenset(ordered[len(grams) - needed + 1:])
+        rare_hits = Counter()
+        for gram in rare:
+            rare_hits.update(self.postings.get(gram, ()))
+        buckets: Dict[int, List[int]] = {}
+        for doc_id, n in rare_hits.items():
+            buckets.setdefault(n, []).append(doc_id)
+
+        # Kandidaten mit vielen seltenen Treffern zuerst; abbrechen, sobald
+        # auch alle häufigen Trigramme nicht mehr für die Bestenliste reichen
+        heap: List[tuple] = []
+        for n_rare in sorted(buckets, reverse=True):
+            bound = n_rare + len(common)
+            if bound < needed or (len(heap) == limit and bound < heap[0][0][0]):
+                break
+            for doc_id in buckets[n_rare]:
+                n = n_rare + len(common.intersection(self.grams[doc_id])) if common else n_rare
+                if n < needed:
+                    continue
+                entry = ((n, self.rank[doc_id]), doc_id)
+                if len(heap) < limit:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+        return [(key[0], doc_id) for key, doc_id in sorted(heap, reverse=True)]
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> List[Dict]:
+        partial = not query.endswith(" ")
+        cache_key = (normalize(query), partial, limit)
+        with self._results_lock:
+            hit = self._results.get(cache_key)
+            if hit is not None:
+                self._results.move_to_end(cache_key)
+                return hit
+
+        grams = trigrams(query, partial_last=partial)
+        results: List[Dict] = []
+        if len(cache_key[0]) >= MIN_QUERY_LENGTH and grams:
+            results = [
+                dict(self.docs[doc_id], score=round(n / len(grams), 3))
+                for n, doc_id in self._top(grams, limit)
+            ]
+
+        with self._results_lock:
+            self._results[cache_key] = results
+            while len(self._results) > self._CACHE_SIZE:
+                self._results.popitem(last=False)
+        return results
+
+
+_search_index: Optional[_SearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def _index_for(data: List[Dict]) -> _SearchIndex:
+    """
+    Index zum übergebenen Katalog (neu aufgebaut, sobald ein anderer Katalog
+    geladen ist). Gebaut wird höchstens in einem Thread, die anderen warten.
+    """
+    global _search_index
+    index = _search_index
+    if index is not None and index.source is data:
+        return index
+    with _index_lock:
+        index = _search_index
+        if index is None or index.source is not data:
+            index = _search_index = _SearchIndex(data)
+        return index
+
+
+def warm_index(data: List[Dict]) -> None:
+    """
+    Nach einer Katalog-Aktualisierung im Hintergrund: Suchindex neu bauen,
+    sofern die Suche schon benutzt wurde (sonst beim ersten Suchaufruf).
+    """
+    if _search_index is not None:
+        _index_for(data)
+
+
+def search_fixtures(username: str, password: str, query: str, limit: int = DEFAULT_LIMIT) -> List[Dict]:
+    """
+    Sucht Fixtures im GDTF-Katalog (Hersteller und Name, tippfehlertolerant).
+
+    Args:
+        username: GDTF Share Username
+        password: GDTF Share Password
+        query: Suchtext, z.B. "robe megapointe"
+        limit: Anzahl Treffer (höchstens MAX_LIMIT)
+
+    Returns:
+        Beste Treffer mit Hersteller, Fixture, Revision, Bewertung, Modes und
+        Score (0..1); geteilt, nicht verändern
+    """
+    limit = max(1, min(int(limit), MAX_LIMIT))
+    return _index_for(gdtf_api._get_all_fixtures(username, password)).search(query, limit)
@@ -0,0 +1,384 @@
+"""
+Medien-Index + Garbage Collector für Requisiten-Bilder und Videos.
+
+Der Index liegt neben der shows.json (`shows_media_index.json`) und ordnet
+jeder bekannten Datei ihre Referenzen zu:
+
+    "props/3f2a….png": {"refs": ["show:4", "song:4:17"], "orphan_since": null}
+
+- Neue Uploads werden beim Speichern registriert (noch ohne Referenz).
+- `save_data()` gleicht die Referenzen pro Show ab (nur geänderte Shows
+  erzeugen Schreibzugriffe).
+- Verliert eine Datei ihre letzte Referenz (Bild gelöscht, Show gelöscht,
+  Speichern nach dem Upload fehlgeschlagen), wird sie als verwaist markiert.
+- Beim Löschen einer Show werden ihre jetzt verwaisten Dateien sofort
+  abgeräumt; alles andere nach der Schonfrist beim nächsten Speichern.
+
+Die GC arbeitet nur diese Verwaist-Liste ab – kein Verzeichnis-Listing und
+kein Abgleich aller Dateien gegen alle Shows. Dateien, die der Index nicht
+kennt, werden nie angefasst (Altbestand: einmalig `--scan`).
+
+CLI:
+    python -m services.media_index            # GC-Lauf
+    python -m services.media_index --dry-run
+    python -m services.media_index --scan     # vorhandene Dateien aufnehmen
+"""
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import json
+import os
+import threading
+import time
+
+from core import show_logic
+from services import media_service
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+MEDIA_DIRS: Dict[str, Path] = {
+    "props": STATIC_DIR / "props",
+    "videos": STATIC_DIR / "videos",
+}
+
+# Verwaiste Dateien erst nach dieser Zeit löschen (Sekunden) – schützt
+# Uploads, deren Show gerade noch gespeichert wird
+GC_GRACE_SECONDS = 3600
+
+_lock = threading.RLock()
+_index: Optional["MediaIndex"] = None
+_gc_pending = False
+
+
+def index_path() -> Path:
+    base, _ = os.path.splitext(show_logic.DATA_FILE)
+    return Path(base + "_media_index.json")
+
+
+def _show_refs(show: Dict) -> Set[Tuple[str, str]]:
+    """(Datei-Key, Referenz) für eine Show inkl. ihrer Songs."""
+    show_id = show.get("id")
+    refs: Set[Tuple[str, str]] = set()
+    for fname in show.get("prop_images") or []:
+        refs.add((f"props/{fname}", f"show:{show_id}"))
+    for song in show.get("songs") or []:
+        for fname in song.get("prop_images") or []:
+            refs.add((f"props/{fname}", f"song:{show_id}:{song.get('id')}"))
+    for fname in show.get("videos") or []:
+        refs.add((f"videos/{fname}", f"show:{show_id}"))
+    return refs
+
+
+def _ref_show_id(ref: str) -> str:
+    return ref.split(":")[1]
+
+
+class MediaIndex:
+    """Datei -> Referenzen (Shows/Songs) + Liste verwaister Dateien."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.files: Dict[str, Dict] = {}
+        self.orphans: Dict[str, float] = {}
+        # Show-ID -> Referenzen beim letzten Abgleich (für den Diff)
+        self._by_show: Dict[str, Set[Tuple[str, str]]] = {}
+        self.dirty = False
+
+    # ------------------------------------------------------------------ #
+    # Laden / Speichern
+    # ------------------------------------------------------------------ #
+
+    @classmethod
+    def load(cls, path: Path) -> "MediaIndex":
+        index = cls(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # Noch kein Index: aus den Shows aufbauen (ohne Verzeichnis-Scan)
+            index.sync_shows(show_logic.shows)
+            return index
+
+        index.files = data.get("files", {}) if isinstance(data, dict) else {}
+        for key, entry in index.files.items():
+            for ref in entry.get("refs", []):
+                index._by_show.setdefault(_ref_show_id(ref), set()).add((key, ref))
+            if not entry.get("refs"):
+                index.orphans[key] = entry.get("orphan_since") or time.time()
+        return index
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "files": self.files}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+    # ------------------------------------------------------------------ #
+    # Pflege
+    # ------------------------------------------------------------------ #
+
+    def _entry(self, key: str) -> Dict:
+        entry = self.files.get(key)
+        if entry is None:
+            entry = self.files[key] = {"refs": [], "orphan_since": None}
+            self.dirty = True
+        return entry
+
+    def _mark(self, key: str, entry: Dict) -> None:
+        if entry["refs"]:
+            if entry.get("orphan_since") is not None:
+                entry["orphan_since"] = None
+            self.orphans.pop(key, None)
+        elif key not in self.orphans:
+            entry["orphan_since"] = self.orphans[key] = time.time()
+
+    def register(self, kind: str, fname: str) -> None:
+        """
+        Neue Datei aufnehmen (zunächst ohne Referenz). Ein erneuter Upload
+        einer verwaisten Datei (Dedup) startet die Schonfrist neu – sonst
+        könnte die GC sie vor dem Speichern der Show löschen.
+        """
+        key = f"{kind}/{fname}"
+        entry = self._entry(key)
+        if not entry["refs"]:
+            self.orphans.pop(key, None)
+            self.dirty = True
+        self._mark(key, entry)
+
+    def sync_shows(self, shows: Iterable[Dict]) -> None:
+        """Referenzen mit dem aktuellen Stand der Shows abgleichen (Diff pro Show)."""
+        seen: Set[str] = set()
+        for show in shows:
+            show_id = str(show.get("id"))
+            seen.add(show_id)
+            current = _show_refs(show)
+            previous = self._by_show.get(show_id, set())
+            if current != previous:
+                self._apply(previous - current, current - previous)
+                self._by_show[show_id] = current
+
+        for show_id in list(self._by_show):
+            if show_id not in seen:  # Show gelöscht
+                self._apply(self._by_show.pop(show_id), set())
+
+    def _apply(self, removed: Set[Tuple[str, str]], added: Set[Tuple[str, str]]) -> None:
+        touched = set()
+        for key, ref in removed:
+            entry = self.files.get(key)
+            if entry and ref in entry["refs"]:
+                entry["refs"].remove(ref)
+                touched.add(key)
+        for key, ref in added:
+            entry = self._entry(key)
+            if ref not in entry["refs"]:
+                entry["refs"].append(ref)
+                touched.add(key)
+        for key in touched:
+            self._mark(key, self.files[key])
+        if touched:
+            self.dirty = True
+
+    def ref_count(self, kind: str, fname: str) -> int:
+        entry = self.files.get(f"{kind}/{fname}")
+        return len(entry["refs"]) if entry else 0
+
+    def references(self, kind: str, fname: str) -> List[str]:
+        entry = self.files.get(f"{kind}/{fname}")
+        return list(entry["refs"]) if entry else []
+
+    def oldest_orphan(self) -> Optional[float]:
+        return min(self.orphans.values()) if self.orphans else None
+
+    def forget(self, key: str) -> None:
+        self.files.pop(key, None)
+        self.orphans.pop(key, None)
+        self.dirty = True
+
+    # ------------------------------------------------------------------ #
+    # Garbage Collection
+    # ------------------------------------------------------------------ #
+
+    def collect(
+        self,
+        dirs: Dict[str, Path],
+        grace: float = GC_GRACE_SECONDS,
+        limit: Optional[int] = None,
+        dry_run: bool = False,
+        keys: Optional[Iterable[str]] = None,
+        orphaned_before: Optional[float] = None,
+    ) -> List[str]:
+        """
+        Löscht verwaiste Dateien (älteste zuerst). `limit` begrenzt die Arbeit
+        pro Lauf; der Rest bleibt für den nächsten Lauf in der Liste.
+        `keys` beschränkt den Lauf auf bestimmte Dateien, `orphaned_before`
+        ersetzt die Schonfrist durch einen festen Zeitpunkt.
+        Gibt die Keys der gelöschten Dateien zurück.
+        """
+        cutoff = time.time() - grace if orphaned_before is None else orphaned_before
+        candidates = self.orphans.items()
+        if keys is not None:
+            candidates = [(key, self.orphans[key]) for key in set(keys) if key in self.orphans]
+        removed: List[str] = []
+        for key, since in sorted(candidates, key=lambda kv: kv[1]):
+            if since > cutoff or (limit is not None and len(removed) >= limit):
+                break
+            kind, fname = key.split("/", 1)
+            base_dir = dirs.get(kind)
+            if base_dir is None:
+                continue
+            removed.append(key)
+            if dry_run:
+                continue
+            path = Path(base_dir) / fname
+            if kind == "props":
+                media_service.delete_with_derivatives(path)
+            else:
+                path.unlink(missing_ok=True)
+            self.forget(key)
+        return removed
+
+    def scan(self, dirs: Dict[str, Path]) -> int:
+        """Einmalig: vorhandene Dateien aufnehmen (Altbestand vor dem Index)."""
+        added = 0
+        for kind, base_dir in dirs.items():
+            if not Path(base_dir).is_dir():
+                continue
+            for path in Path(base_dir).iterdir():
+                name = path.name
+                if not path.is_file() or name.startswith(".") or media_service.is_derivative(name):
+                    continue
+                if f"{kind}/{name}" not in self.files:
+                    self.register(kind, name)
+                    added += 1
+        return added
+
+
+# ---------------------------------------------------------------------- #
+# Modulweiter Zugriff (ein Index pro Datendatei)
+# ---------------------------------------------------------------------- #
+
+def get_index() -> MediaIndex:
+    global _index
+    with _lock:
+        path = index_path()
+        if _index is None or _index.path != path:
+            _index = MediaIndex.load(path)
+        return _index
+
+
+def register(kind: str, fname: str) -> None:
+    with _lock:
+        index = get_index()
+        index.register(kind, fname)
+        index.save()
+
+
+def sync_shows(shows: Iterable[Dict]) -> None:
+    """
+    Wird von `save_data()` aufgerufen. Liegen verwaiste Dateien länger als
+    die Schonfrist im Index, wird dabei ein GC-Lauf im Hintergrund gestartet.
+    """
+    with _lock:
+        index = get_index()
+        index.sync_shows(shows)
+        index.save()
+        oldest = index.oldest_orphan()
+    if oldest is not None and oldest <= time.time() - GC_GRACE_SECONDS:
+        schedule_garbage_collection()
+
+
+def show_keys(show: Dict) -> Set[str]:
+    """Datei-Keys (`props/…`, `videos/…`) einer Show inkl. ihrer Songs."""
+    return {key for key, _ in _show_refs(show)}
+
+
+def ref_count(kind: str, fname: str) -> int:
+    with _lock:
+        return get_index().ref_count(kind, fname)
+
+
+def forget(kind: str, fname: str) -> None:
+    """Datei wurde direkt gelöscht (z.B. letzte Referenz entfernt)."""
+    with _lock:
+        index = get_index()
+        index.forget(f"{kind}/{fname}")
+        index.save()
+
+
+def collect_garbage(
+    dirs: Optional[Dict[str, Path]] = None,
+    grace: float = GC_GRACE_SECONDS,
+    limit: Optional[int] = None,
+    dry_run: bool = False,
+    index: Optional[MediaIndex] = None,
+    keys: Optional[Iterable[str]] = None,
+    orphaned_before: Optional[float] = None,
+) -> List[str]:
+    """Ein inkrementeller GC-Lauf über die verwaisten Dateien des Index."""
+    with _lock:
+        index = index or get_index()
+        removed = index.collect(
+            dirs or MEDIA_DIRS, grace=grace, limit=limit, dry_run=dry_run,
+            keys=keys, orphaned_before=orphaned_before,
+        )
+        index.save()
+    if removed:
+        print(f"[MEDIA] GC: {len(removed)} verwaiste Datei(en) {'gefunden' if dry_run else 'gelöscht'}")
+    return removed
+
+
+def schedule_garbage_collection(
+    dirs: Optional[Dict[str, Path]] = None, keys: Optional[Iterable[str]] = None
+) -> Optional[Future]:
+    """
+    GC-Lauf im Hintergrund-Pool des Medien-Service.
+
+    Ohne `keys`: alle verwaisten Dateien nach Ablauf der Schonfrist (höchstens
+    ein Lauf gleichzeitig, sonst None). Mit `keys` (z.B. Dateien einer gerade
+    gelöschten Show): diese Dateien sofort, sofern sie jetzt verwaist sind –
+    ein zwischenzeitlicher Upload derselben Datei startet ihre Frist neu.
+    """
+    global _gc_pending
+    # Index jetzt festhalten: der Lauf gehört zu der Datendatei, die gerade aktiv ist
+    index = get_index()
+    if keys is not None:
+        return media_service._executor.submit(
+            collect_garbage, dirs, index=index, keys=list(keys), orphaned_before=time.time()
+        )
+    with _lock:
+        if _gc_pending:
+            return None
+        _gc_pending = True
+
+    def run() -> List[str]:
+        global _gc_pending
+        try:
+            return collect_garbage(dirs, index=index)
+        finally:
+            with _lock:
+                _gc_pending = False
+
+    return media_service._executor.submit(run)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Medien-Index / GC für static/props + static/videos")
+    parser.add_argument("--scan", action="store_true", help="vorhandene Dateien in den Index aufnehmen")
+    parser.add_argument("--dry-run", action="store_true", help="nur anzeigen, nichts löschen")
+    parser.add_argument("--grace", type=float, default=GC_GRACE_SECONDS, help="Schonfrist in Sekunden")
+    parser.add_argument("--limit", type=int, default=None, help="max. Dateien pro Lauf")
+    args = parser.parse_args()
+
+    show_logic.load_data()
+    with _lock:
+        idx = get_index()
+        idx.sync_shows(show_logic.shows)
+        if args.scan:
+            print(f"[MEDIA] Scan: {idx.scan(MEDIA_DIRS)} Datei(en) neu im Index")
+        idx.save()
+    for key in collect_garbage(grace=args.grace, limit=args.limit, dry_run=args.dry_run):
+        print(("  würde löschen: " if args.dry_run else "  gelöscht: ") + key)
@@ -0,0 +1,189 @@
+"""
+Medien-Service für hochgeladene Requisiten-Bilder.
+
+Beim Upload werden im Hintergrund (nicht im Request-Thread) verkleinerte
+Ableitungen erzeugt und neben dem Original abgelegt:
+
+    static/props/1_82dc7a74.png          Original (bleibt unverändert)
+    static/props/1_82dc7a74.thumb.jpg    Thumbnail (Galerie, PDF)
+    static/props/1_82dc7a74.medium.jpg   Vorschau (Großansicht)
+
+Ausgeliefert werden Bilder und Videos über `/media/...` (routes/show_assets.py)
+mit Range-Support und ETag aus dem Datei-Inhalt (`content_etag`).
+"""
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+import hashlib
+import os
+import re
+import threading
+import uuid
+
+from PIL import Image, ImageOps  # type: ignore
+
+# Variante -> maximale Kantenlänge in Pixel
+VARIANTS: Dict[str, int] = {
+    "thumb": 320,
+    "medium": 1280,
+}
+JPEG_QUALITY = 82
+# Dateinamen enthalten eine UUID und ändern sich nie -> 1 Jahr cachen
+MEDIA_MAX_AGE = 365 * 24 * 3600
+_HASH_BLOCK = 1024 * 1024
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cuex-media")
+_pending: Set[str] = set()
+_pending_lock = threading.Lock()
+# Originale, die sich nicht dekodieren ließen: Pfad -> mtime_ns (nicht bei
+# jedem Seitenaufruf erneut versuchen; ein neuer Upload ändert die mtime)
+_failed: Dict[str, int] = {}
+# Zählt fertig erzeugte Ableitungen (Teil des Cache-Keys gerenderter Galerien)
+_derivatives_version = 0
+# Nur für Dateien ohne Inhalts-Hash im Namen (Altbestand, Ableitungen)
+ETAG_CACHE_SIZE = 1024
+_etag_cache: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_etag_lock = threading.Lock()
+# Inhaltsadressierte Originale (services/media_store.py): `<sha256[:32]>.<ext>`
+_CONTENT_NAME = re.compile(r"^([0-9a-f]{32})\.[A-Za-z0-9]+$")
+
+
+def derivative_name(filename: str, variant: str) -> str:
+    """`1_82dc7a74.png` + `thumb` -> `1_82dc7a74.thumb.jpg`"""
+    stem = filename.rsplit(".", 1)[0]
+    return f"{stem}.{variant}.jpg"
+
+
+def is_derivative(filename: str) -> bool:
+    return any(filename.endswith(f".{variant}.jpg") for variant in VARIANTS)
+
+
+def generate_derivatives(original_path: Path) -> Dict[str, Path]:
+    """
+    Erzeugt alle Varianten für ein Bild (synchron).
+    Gibt Variante -> Pfad zurück; bei nicht lesbaren Dateien ein leeres Dict.
+    """
+    original_path = Path(original_path)
+    result: Dict[str, Path] = {}
+    try:
+        with Image.open(original_path) as img:
+            img.draft("RGB", (max(VARIANTS.values()),) * 2)  # JPEG: verkleinert dekodieren
+            img = ImageOps.exif_transpose(img)  # Handyfotos: Ausrichtung übernehmen
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+            # Größte Variante zuerst, kleinere daraus ableiten
+            for variant, size in sorted(VARIANTS.items(), key=lambda kv: -kv[1]):
+                img.thumbnail((size, size))
+                target = original_path.with_name(derivative_name(original_path.name, variant))
+                # Erst fertig schreiben, dann umbenennen: `variant_filename` liefert
+                # eine Ableitung aus, sobald sie existiert
+                tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+                try:
+                    img.save(tmp, "JPEG", quality=JPEG_QUALITY, optimize=True)
+                    os.replace(tmp, target)
+                finally:
+                    tmp.unlink(missing_ok=True)
+                result[variant] = target
+    except Exception as e:
+        print(f"[MEDIA] Ableitungen für {original_path.name} fehlgeschlagen: {e}")
+    return result
+
+
+def _mtime_ns(path: Path) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _run_pending(original_path: Path) -> Dict[str, Path]:
+    key = str(original_path)
+    mtime = _mtime_ns(original_path)
+    result: Dict[str, Path] = {}
+    try:
+        result = generate_derivatives(original_path)
+        return result
+    finally:
+        global _derivatives_version
+        with _pending_lock:
+            _pending.discard(key)
+            if result:
+                _derivatives_version += 1
+            elif mtime is not None:
+                _failed[key] = mtime
+
+
+def derivatives_version() -> int:
+    """Ändert sich, sobald im Hintergrund neue Ableitungen fertig geworden sind."""
+    return _derivatives_version
+
+
+def schedule_derivatives(original_path: Path) -> Optional[Future]:
+    """
+    Stellt die Erzeugung der Ableitungen in den Hintergrund-Pool.
+    Mehrfachaufrufe für dieselbe Datei werden zusammengefasst (dann None),
+    ebenso Originale, die in diesem Stand schon nicht lesbar waren.
+    """
+    key = str(original_path)
+    mtime = _mtime_ns(Path(original_path))
+    with _pending_lock:
+        if key in _pending or (mtime is not None and _failed.get(key) == mtime):
+            return None
+        _failed.pop(key, None)
+        _pending.add(key)
+    return _executor.submit(_run_pending, Path(original_path))
+
+
+def variant_filename(props_dir: Path, filename: str, variant: str) -> str:
+    """
+    Dateiname der gewünschten Variante, falls vorhanden – sonst das Original.
+    Fehlende Ableitungen (z.B. ältere Uploads) werden nachträglich eingeplant.
+    """
+    if variant not in VARIANTS:
+        return filename
+    derived = derivative_name(filename, variant)
+    if (Path(props_dir) / derived).exists():
+        return derived
+    original = Path(props_dir) / filename
+    if original.exists():
+        schedule_derivatives(original)
+    return filename
+
+
+def delete_with_derivatives(original_path: Path) -> None:
+    """Löscht Original + alle Ableitungen (fehlende Dateien werden ignoriert)."""
+    original_path = Path(original_path)
+    for variant in VARIANTS:
+        original_path.with_name(derivative_name(original_path.name, variant)).unlink(missing_ok=True)
+    original_path.unlink(missing_ok=True)
+
+
+def content_etag(path: Path) -> str:
+    """
+    Starker ETag aus dem SHA-256 des Inhalts. Inhaltsadressierte Dateien
+    tragen den Hash schon im Namen (beim Upload berechnet) – dann wird nichts
+    gelesen. Sonst wird pro (Pfad, Größe, mtime) einmal gehasht (LRU-Cache).
+    """
+    match = _CONTENT_NAME.match(Path(path).name)
+    if match:
+        return match.group(1)
+
+    st = os.stat(path)
+    key = (str(path), st.st_size, st.st_mtime_ns)
+    with _etag_lock:
+        cached = _etag_cache.get(key)
+        if cached:
+            _etag_cache.move_to_end(key)
+            return cached
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            digest.update(block)
+    etag = digest.hexdigest()
+    with _etag_lock:
+        _etag_cache[key] = etag
+        while len(_etag_cache) > ETAG_CACHE_SIZE:
+            _etag_cache.popitem(last=False)
+    return etag
@@ -0,0 +1,118 @@
+"""
+Inhaltsadressierter Medien-Speicher für Requisiten-Bilder und Videos.
+
+Hochgeladene Dateien werden beim Speichern gehasht (SHA-256) und unter
+`<hash>.<ext>` abgelegt. Gleiche Inhalte (Logo, Bühnenfoto, dasselbe Video
+in 40 Tour-Shows) liegen damit genau einmal auf der Platte.
+
+Die Shows behalten ihre Referenzen wie bisher als Dateinamen-Listen
+(`prop_images` an Show/Song, `videos` an der Show). Der Referenzzähler einer
+Datei kommt aus dem Medien-Index (services/media_index.py), der diese Listen
+bei jedem `save_data()` abgleicht; gelöscht wird eine Datei erst, wenn die
+letzte Referenz entfernt wurde. Ältere `{show_id}_{uuid}`-Dateien werden
+genauso gezählt (z.B. nach `duplicate_show`).
+"""
+from collections import Counter
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Optional, Tuple
+import hashlib
+import os
+import shutil
+import uuid
+
+from core import show_logic
+from services import media_index, media_service
+
+HASH_CHARS = 32  # 128 Bit reichen als Dateiname
+_BLOCK = 1024 * 1024
+
+
+def content_name(digest: str, ext: str) -> str:
+    return f"{digest[:HASH_CHARS]}.{ext.lower()}"
+
+
+def _finalize(tmp_path: Path, kind: str, target_dir: Path, digest: str, ext: str) -> Tuple[str, bool]:
+    """Temp-Datei unter dem Inhaltsnamen ablegen – oder verwerfen, wenn schon vorhanden."""
+    fname = content_name(digest, ext)
+    target = target_dir / fname
+    # Im Index registrieren: bleibt der Upload unreferenziert, räumt die GC ihn ab
+    media_index.register(kind, fname)
+    if target.exists():
+        tmp_path.unlink(missing_ok=True)
+        return fname, False
+    try:
+        os.replace(tmp_path, target)
+    except OSError:
+        # anderes Dateisystem (z.B. instance/ -> static/)
+        shutil.move(str(tmp_path), str(target))
+    return fname, True
+
+
+def store_stream(stream: BinaryIO, kind: str, target_dir: Path, ext: str) -> Tuple[str, bool]:
+    """
+    Speichert einen Upload-Stream inhaltsadressiert (blockweise, gehasht
+    beim Schreiben). Gibt (Dateiname, neu_angelegt) zurück.
+    """
+    target_dir = Path(target_dir)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = target_dir / f".{uuid.uuid4().hex}.tmp"
+    digest = hashlib.sha256()
+    try:
+        with open(tmp_path, "wb") as f:
+            for block in iter(lambda: stream.read(_BLOCK), b""):
+                digest.update(block)
+                f.write(block)
+        return _finalize(tmp_path, kind, target_dir, digest.hexdigest(), ext)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def store_file(path: Path, kind: str, target_dir: Path, ext: str, digest: Optional[str] = None) -> Tuple[str, bool]:
+    """
+    Übernimmt eine fertige Datei (z.B. zusammengesetzten Chunk-Upload) in den
+    Speicher. Die Quelldatei wird verschoben bzw. gelöscht, falls der Inhalt
+    schon existiert. `digest` spart das erneute Hashen, wenn er bekannt ist.
+    """
+    path = Path(path)
+    target_dir = Path(target_dir)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    if not digest:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(_BLOCK), b""):
+                h.update(block)
+        digest = h.hexdigest()
+    return _finalize(path, kind, target_dir, digest, ext)
+
+
+def iter_references(shows: Optional[Iterable] = None) -> Iterator[Tuple[str, str]]:
+    """Alle (kind, Dateiname)-Referenzen aller Shows (inkl. Songs)."""
+    for show in show_logic.shows if shows is None else shows:
+        for fname in show.get("prop_images") or []:
+            yield "props", fname
+        for song in show.get("songs") or []:
+            for fname in song.get("prop_images") or []:
+                yield "props", fname
+        for fname in show.get("videos") or []:
+            yield "videos", fname
+
+
+def reference_counts(shows: Optional[Iterable] = None) -> Counter:
+    return Counter(iter_references(shows))
+
+
+def release(kind: str, fname: str, base_dir: Path) -> bool:
+    """
+    Nach dem Entfernen einer Referenz aufrufen: löscht die Datei (bei Bildern
+    inkl. Thumbnails), wenn keine Show/kein Song mehr darauf verweist.
+    Gibt True zurück, wenn gelöscht wurde.
+    """
+    if media_index.ref_count(kind, fname) > 0:
+        return False
+    path = Path(base_dir) / fname
+    if kind == "props":
+        media_service.delete_with_derivatives(path)
+    else:
+        path.unlink(missing_ok=True)
+    media_index.forget(kind, fname)
+    return True
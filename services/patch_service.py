@@ -0,0 +1,246 @@
+"""
+DMX-Patch: Adressbelegung, Kollisionen und Auto-Patch für das Rig.
+
+Pro Universe wird eine Belegungstabelle mit 512 Slots aufgebaut (Slot ->
+Index des belegenden Fixtures). Jedes Fixture markiert seine Kanäle genau
+einmal, Kollisionen fallen dabei direkt an: Aufwand O(Summe aller Kanäle).
+
+Ein Rig-Eintrag (`*_items` / `custom_devices`) mit Universe + Startadresse
+wird wie am Pult fortlaufend gepatcht: Fixture i beginnt bei
+`address + i * footprint`. Passt ein Fixture nicht mehr in das Universe,
+beginnt es im nächsten Universe bei Kanal 1.
+
+Footprint-Quelle (in dieser Reihenfolge):
+    1. `dmx_footprint` am Rig-Eintrag
+    2. GDTF-Katalog (nur wenn bereits geladen, kein Login)
+    3. Kanalzahl im Mode-Namen ("Standard 16ch", "Mode 2 - 24 Kanäle")
+    4. DEFAULT_FOOTPRINT (als geschätzt markiert)
+"""
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
+import re
+import threading
+
+from core import rig_model
+from core.rig_model import parse_start
+from services import gdtf_api
+
+UNIVERSE_SIZE = 512
+DEFAULT_FOOTPRINT = 1
+FIXTURE_PREFIXES = rig_model.CATEGORIES
+
+STRATEGIES = ("first_fit", "best_fit")
+
+_MODE_CHANNELS_RE = re.compile(r"(\d+)\s*-?\s*(?:ch\b|chan|kan)", re.IGNORECASE)
+
+_CACHE_SIZE = 64
+_cache: "OrderedDict[tuple, Dict]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def resolve_footprint(item: Dict) -> Tuple[int, bool]:
+    """(Footprint, geschätzt?) für einen Rig-Eintrag."""
+    explicit = rig_model.to_int(item.get("dmx_footprint"))
+    if explicit and explicit > 0:
+        return explicit, False
+    mode = item.get("mode") or ""
+    catalog = gdtf_api.cached_dmx_footprint(item.get("manufacturer", ""), item.get("model", ""), mode)
+    if catalog:
+        return catalog, False
+    m = _MODE_CHANNELS_RE.search(mode)
+    if m and int(m.group(1)) > 0:
+        return int(m.group(1)), False
+    return DEFAULT_FOOTPRINT, True
+
+
+def layout(start: Tuple[int, int], count: int, footprint: int) -> Iterator[Tuple[int, int]]:
+    """Startadresse jedes Fixtures eines fortlaufend gepatchten Eintrags."""
+    uni, addr = start
+    for _ in range(count):
+        if addr + footprint - 1 > UNIVERSE_SIZE and addr > 1 and footprint <= UNIVERSE_SIZE:
+            uni, addr = uni + 1, 1
+        yield uni, addr
+        addr += footprint
+
+
+class _Occupancy:
+    """Belegung aller Universes: Slot -> Fixture-Index (-1 = frei)."""
+
+    def __init__(self):
+        self.universes: Dict[int, array] = {}
+
+    def table(self, uni: int) -> array:
+        tbl = self.universes.get(uni)
+        if tbl is None:
+            tbl = self.universes[uni] = array("l", [-1]) * UNIVERSE_SIZE
+        return tbl
+
+    def mark(self, uni: int, addr: int, footprint: int, owner: int, clashes: Dict) -> int:
+        """Belegt die Kanäle; Kollisionen werden in `clashes` gezählt. Gibt die Anzahl Kanäle außerhalb 1..512 zurück."""
+        tbl = self.table(uni)
+        overflow = 0
+        for slot in range(addr - 1, addr - 1 + footprint):
+            if slot < 0 or slot >= UNIVERSE_SIZE:
+                overflow += 1
+                continue
+            prev = tbl[slot]
+            if prev >= 0 and prev != owner:
+                entry = clashes.setdefault((prev, owner), [uni, slot + 1, 0])
+                entry[2] += 1
+            else:
+                tbl[slot] = owner
+        return overflow
+
+    def free_gaps(self, uni: int) -> Iterator[Tuple[int, int]]:
+        """(Startkanal, Länge) aller freien Bereiche eines Universes."""
+        tbl = self.universes.get(uni)
+        if tbl is None:
+            yield 1, UNIVERSE_SIZE
+            return
+        start = None
+        for slot, owner in enumerate(tbl):
+            if owner < 0 and start is None:
+                start = slot
+            elif owner >= 0 and start is not None:
+                yield start + 1, slot - start
+                start = None
+        if start is not None:
+            yield start + 1, UNIVERSE_SIZE - start
+
+
+def _build(table):
+    occ = _Occupancy()
+    fixtures: List[Dict] = []
+    clashes: Dict[Tuple[int, int], List[int]] = {}
+    out_of_range: List[Dict] = []
+    unpatched: List[Dict] = []
+
+    for row in table.rows():
+        key, label = table.keys[row], table.labels[row]
+        count, footprint, estimated = table.count[row], table.footprint[row], bool(table.estimated[row])
+        if not table.patched[row]:
+            unpatched.append({"key": key, "label": label, "count": count, "footprint": footprint,
+                              "estimated": estimated})
+            continue
+        start = (table.universe[row], table.address[row])
+        for i, (uni, addr) in enumerate(layout(start, count, footprint)):
+            owner = len(fixtures)
+            fixtures.append({
+                "key": f"{key}_{i}", "item": key, "label": f"{label} {i + 1}",
+                "universe": uni, "address": addr, "footprint": footprint, "estimated": estimated,
+            })
+            if uni < 1 or occ.mark(uni, addr, footprint, owner, clashes):
+                out_of_range.append(fixtures[owner])
+    return occ, fixtures, clashes, out_of_range, unpatched
+
+
+def analyze_rig(rig: Dict) -> Dict:
+    """
+    Patch-Übersicht für ein Rig (gecacht pro Rig-Stand):
+      fixtures      – Adresse pro Fixture
+      collisions    – überlappende Fixture-Paare (Universe, erster Kanal, Anzahl Kanäle)
+      out_of_range  – Fixtures, die über Kanal 512 hinausragen
+      unpatched     – Einträge ohne Universe/Adresse
+      universes     – belegte Kanäle pro Universe
+    Das Ergebnis ist geteilt (Cache) und darf nicht verändert werden.
+    """
+    # Lazy Import: fixture_table baut auf den Parsern dieses Moduls auf
+    from services import fixture_table
+
+    table = fixture_table.get_table(rig)
+    key = table.key
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    occ, fixtures, clashes, out_of_range, unpatched = _build(table)
+
+    collisions = [
+        {
+            "universe": uni,
+            "address": addr,
+            "channels": n,
+            "a": fixtures[a]["label"],
+            "b": fixtures[b]["label"],
+        }
+        for (a, b), (uni, addr, n) in sorted(clashes.items(), key=lambda kv: kv[1][:2])
+    ]
+    report = {
+        "fixtures": fixtures,
+        "collisions": collisions,
+        "out_of_range": out_of_range,
+        "unpatched": unpatched,
+        "estimated": sorted({f["item"] for f in fixtures if f["estimated"]} |
+                            {u["key"] for u in unpatched if u["estimated"]}),
+        "universes": {
+            uni: sum(1 for owner in tbl if owner >= 0) for uni, tbl in sorted(occ.universes.items())
+        },
+    }
+    with _lock:
+        _cache[key] = report
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return report
+
+
+def _allocate_block(occ: _Occupancy, size: int, strategy: str) -> Tuple[int, int]:
+    """Freien zusammenhängenden Bereich der Größe `size` suchen (ggf. neues Universe)."""
+    best: Optional[Tuple[int, int, int]] = None  # (Lücke, Universe, Start)
+    for uni in sorted(occ.universes):
+        for start, length in occ.free_gaps(uni):
+            if length < size:
+                continue
+            if strategy == "first_fit":
+                return uni, start
+            if best is None or length < best[0]:
+                best = (length, uni, start)
+    if best is not None:
+        return best[1], best[2]
+    return (max(occ.universes) + 1 if occ.universes else 1), 1
+
+
+def auto_patch(rig: Dict, strategy: str = "first_fit") -> List[Dict]:
+    """
+    Patcht alle Einträge ohne Universe/Adresse in freie Bereiche.
+    Ein Eintrag bleibt zusammenhängend in einem Universe, wenn er hineinpasst;
+    größere Einträge beginnen in einem neuen Universe und laufen fortlaufend weiter.
+    Ändert `rig` und gibt die Zuweisungen zurück [{key, label, universe, address}].
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unbekannte Strategie: {strategy}")
+    from services import fixture_table
+
+    rig_model.upgrade(rig)
+    table = fixture_table.get_table(rig)
+    occ, fixtures, clashes, _, _ = _build(table)
+
+    assignments = []
+    owner = len(fixtures)
+    for row in table.rows():
+        if table.patched[row]:
+            continue
+        # Eintrag im übergebenen Rig (table.items kann zu einem gleichwertigen Rig gehören)
+        it = table.source_item(rig, row)
+        key, label = table.keys[row], table.labels[row]
+        count, footprint = table.count[row], table.footprint[row]
+        size = count * footprint
+        if size <= UNIVERSE_SIZE:
+            uni, addr = _allocate_block(occ, size, strategy)
+        else:
+            uni, addr = (max(occ.universes) + 1 if occ.universes else 1), 1
+        for f_uni, f_addr in layout((uni, addr), count, footprint):
+            occ.mark(f_uni, f_addr, footprint, owner, clashes)
+            owner += 1
+        it["universe"] = uni
+        it["address"] = addr
+        assignments.append({"key": key, "label": label, "universe": uni, "address": addr})
+    if assignments:
+        rig_model.touch(rig)
+    return assignments
+
+
+def clear_cache() -> None:
+    with _lock:
+        _cache.clear()
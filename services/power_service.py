@@ -1,57 +1,169 @@
 import math
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
-def calculate_rig_power(rig_data: dict) -> dict:
+from services import fixture_table
+
+FIXTURE_PREFIXES = fixture_table.FIXTURE_PREFIXES
+POWER_FIELDS = ["power_main", "power_light", "power_sound", "power_video", "power_foh", "power_other"]
+PHASES = ("L1", "L2", "L3")
+
+COS_PHI = 0.95  # Assumed power factor
+VOLTAGE_1PH = 230.0
+VOLTAGE_3PH = 400.0
+
+# Absicherung pro Phase, falls aus `power_main` nichts lesbar ist (CEE 32 A)
+DEFAULT_PHASE_BREAKER_A = 32.0
+# Absicherung eines einzelnen Stromkreises (Schuko / CEE 16 A)
+CIRCUIT_BREAKER_A = 16.0
+# Abweichung einer Phase vom Mittelwert, ab der gewarnt wird (%)
+MAX_IMBALANCE_PCT = 10.0
+
+_CACHE_SIZE = 128
+_cache: "OrderedDict[tuple, Optional[dict]]" = OrderedDict()
+_lock = threading.Lock()
+
+_PHASE_RE = re.compile(r"^\s*L?\s*([123])(?:\s*[-./:]\s*(\S+))?\s*$", re.IGNORECASE)
+_AMPS_RE = re.compile(r"(\d+(?:[.,]\d+)?)\s*A\b", re.IGNORECASE)
+
+
+def _to_float(value) -> float:
+    try:
+        s = str(value).strip().replace(",", ".")
+        return float(s) if s else 0.0
+    except Exception:
+        return 0.0
+
+
+def _parse_phase(value) -> Tuple[Optional[str], Optional[str]]:
     """
-    Calculates the total power consumption of the rig based on the provided rig data.
-    
-    Args:
-        rig_data (dict): The dictionary containing the rig setup configuration.
-        
-    Returns:
-        dict: A dictionary containing the calculated power metrics or None if no power is used.
-              Keys: total_watt, total_kw, apparent_kva, current_1ph, current_3ph, cos_phi, total_power
+    "L1" -> ("L1", None), "L2-3" / "2.3" -> ("L2", "L2-3").
+    Unbekannte Angaben -> (None, None).
     """
-    if not rig_data:
-        rig_data = {}
+    m = _PHASE_RE.match(str(value or ""))
+    if not m:
+        return None, None
+    phase = f"L{m.group(1)}"
+    circuit = f"{phase}-{m.group(2)}" if m.group(2) else None
+    return phase, circuit
+
+
+def _phase_breaker_amps(rig_data: dict) -> float:
+    """Absicherung pro Phase aus der Hauptversorgung (z.B. "63A CEE"), sonst Default."""
+    m = _AMPS_RE.search(str(rig_data.get("power_main") or ""))
+    amps = _to_float(m.group(1)) if m else 0.0
+    return amps if amps > 0 else DEFAULT_PHASE_BREAKER_A
+
+
+def _current(watt: float) -> float:
+    return watt / (VOLTAGE_1PH * COS_PHI)
+
+
+def _rig_key(rig_data: dict) -> tuple:
+    """
+    Version des Rigs für den Cache: Version der Fixture-Tabelle (pro
+    Rig-Revision) plus die manuellen Strom-Felder.
+    """
+    return fixture_table.get_table(rig_data).key, tuple(rig_data.get(f) for f in POWER_FIELDS)
+
+
+def _iter_loads(rig_data: dict):
+    """(Key, Label, Watt pro Gerät, Anzahl, Phasen-Angabe) pro Zeile der Fixture-Tabelle."""
+    table = fixture_table.get_table(rig_data)
+    return zip(table.keys, table.labels, table.watt, table.count, table.phases)
+
+
+def _spread(phase_load: List[float], watt: float, count: int) -> List[int]:
+    """
+    Verteilt `count` gleiche Geräte (je `watt`) wie die Greedy-Regel "immer auf
+    die am wenigsten belastete Phase" – aber blockweise statt Gerät für
+    Gerät, damit auch unrealistisch große Anzahlen nur O(1) Schritte kosten.
+    Ändert `phase_load` und gibt die Anzahl pro Phase zurück.
+    """
+    counts = [0] * len(PHASES)
+
+    def put(i: int, n: int) -> None:
+        counts[i] += n
+        phase_load[i] += n * watt
 
-    def _to_float(value):
-        try:
-            s = str(value).strip().replace(",", ".")
-            return float(s) if s else 0.0
-        except Exception:
-            return 0.0
-
-    # Calculate total watt from fixture items
-    prefixes = ("spots", "washes", "beams", "blinders", "strobes")
-    total_watt = 0.0
-    for prefix in prefixes:
-        items = rig_data.get(f"{prefix}_items")
-        if items:
-            for it in items:
-                w = _to_float(it.get("watt") or 0)
-                try:
-                    cnt = int((it.get("count") or "0").strip() or 0)
-                except Exception:
-                    cnt = 0
-                total_watt += w * cnt
-        else:
-            # Fallback for old data structure or direct input
-            total_watt += _to_float(rig_data.get(f"watt_{prefix}"))
-
-    # Add custom devices if any
-    custom_devices = rig_data.get("custom_devices", [])
-    if custom_devices:
-        for cd in custom_devices:
-            w = _to_float(cd.get("watt") or 0)
-            try:
-                cnt = int((cd.get("count") or "0").strip() or 0)
-            except Exception:
-                cnt = 0
-            total_watt += w * cnt
+    while count > 0:
+        lo, mid, hi = sorted(range(len(PHASES)), key=lambda i: (phase_load[i], i))
+        if phase_load[hi] - phase_load[lo] <= watt:
+            # Alle Phasen innerhalb eines Geräts: reihum, Rest einzeln
+            rounds, count = divmod(count, len(PHASES))
+            for i in (lo, mid, hi):
+                put(i, rounds)
+            for _ in range(count):
+                put(min(range(len(PHASES)), key=lambda i: (phase_load[i], i)), 1)
+            break
+        if phase_load[mid] - phase_load[lo] >= watt:
+            # Niedrigste Phase bis an die mittlere auffüllen
+            n = min(count, int((phase_load[mid] - phase_load[lo]) // watt))
+            put(lo, n)
+            count -= n
+            continue
+        # Die beiden niedrigsten abwechselnd bis an die höchste auffüllen
+        pairs = min(count // 2, int((phase_load[hi] - phase_load[mid]) // watt))
+        if pairs == 0:
+            put(lo, 1)
+            count -= 1
+            continue
+        put(lo, pairs)
+        put(mid, pairs)
+        count -= 2 * pairs
+    return counts
+
+
+def balance_phases(loads: List[Tuple[str, str, float, int]]) -> Dict:
+    """
+    Greedy-Phasenverteilung (LPT): Geräte absteigend nach Leistung, jedes auf
+    die aktuell am wenigsten belastete Phase. Gleiche Geräte einer Zeile
+    werden gemeinsam verteilt (`_spread`), der Aufwand hängt also von der
+    Zahl der Zeilen ab, nicht von der Geräteanzahl.
+    `loads`: (Key, Label, Watt pro Gerät, Anzahl).
+    Gibt Verteilung pro Eintrag + resultierende Phasenlast zurück.
+    """
+    groups = sorted(
+        ((watt, key, count) for key, _, watt, count in loads if watt > 0 and count > 0),
+        key=lambda g: -g[0],
+    )
+    phase_load = [0.0] * len(PHASES)
+    per_item: Dict[str, List[int]] = {}
+    for watt, key, count in groups:
+        counts = _spread(phase_load, watt, count)
+        total = per_item.setdefault(key, [0, 0, 0])
+        for i, n in enumerate(counts):
+            total[i] += n
+
+    phase_watt = {PHASES[i]: load for i, load in enumerate(phase_load)}
+    labels = {key: label for key, label, _, _ in loads}
+    assignments = [
+        {"key": key, "label": labels[key], **{PHASES[i]: n for i, n in enumerate(counts)}}
+        for key, counts in per_item.items()
+    ]
+    return {
+        "assignments": assignments,
+        "phase_watt": phase_watt,
+        "imbalance_pct": _imbalance_pct(phase_watt),
+    }
+
+
+def _imbalance_pct(phase_watt: Dict[str, float]) -> float:
+    """Größte Abweichung einer Phase vom Mittelwert in Prozent."""
+    mean = sum(phase_watt.values()) / len(PHASES)
+    if mean <= 0:
+        return 0.0
+    return max(abs(w - mean) for w in phase_watt.values()) / mean * 100.0
+
+
+def _compute(rig_data: dict) -> Optional[dict]:
+    table = fixture_table.get_table(rig_data)
+    total_watt = table.total_load()
 
     # Sum of manual power entries (Main, Light, Sound, etc.)
-    power_fields = ["power_main", "power_light", "power_sound", "power_video", "power_foh", "power_other"]
-    total_power = sum(_to_float(rig_data.get(f)) for f in power_fields)
+    total_power = sum(_to_float(rig_data.get(f)) for f in POWER_FIELDS)
 
     if total_watt <= 0 and total_power <= 0:
         return None
@@ -64,25 +176,94 @@ def calculate_rig_power(rig_data: dict) -> dict:
         "current_3ph": None,
         "cos_phi": None,
         "total_power": total_power if total_power > 0 else None,
+        "phases": None,
     }
 
-    if total_watt > 0:
-        cos_phi = 0.95  # Assumed power factor
-        total_kw = total_watt / 1000.0
-        apparent_kva = total_kw / cos_phi
-        
+    if total_watt <= 0:
+        return result
+
+    total_kw = total_watt / 1000.0
+    result.update({
+        "total_kw": total_kw,
+        "apparent_kva": total_kw / COS_PHI,
         # 1-phase 230V
-        current_1ph = total_watt / (230.0 * cos_phi)
-        
+        "current_1ph": _current(total_watt),
         # 3-phase 400V symmetric: P = sqrt(3) * U * I * cos phi
-        current_3ph = total_watt / (math.sqrt(3.0) * 400.0 * cos_phi)
+        "current_3ph": total_watt / (math.sqrt(3.0) * VOLTAGE_3PH * COS_PHI),
+        "cos_phi": COS_PHI,
+    })
+
+    # Last pro Phase / Stromkreis aus den erfassten Phasen-Angaben
+    phase_watt = {p: 0.0 for p in PHASES}
+    circuit_watt: Dict[str, float] = {}
+    unassigned_watt = 0.0
+    for load, phase_value in zip(table.load, table.phases):
+        if load <= 0:
+            continue
+        phase, circuit = _parse_phase(phase_value)
+        if phase is None:
+            unassigned_watt += load
+            continue
+        phase_watt[phase] += load
+        if circuit:
+            circuit_watt[circuit] = circuit_watt.get(circuit, 0.0) + load
+
+    breaker = _phase_breaker_amps(rig_data)
+    phase_current = {p: _current(w) for p, w in phase_watt.items()}
+    assigned = total_watt - unassigned_watt
+    imbalance = _imbalance_pct(phase_watt) if assigned > 0 else 0.0
+    circuits = [
+        {"circuit": c, "watt": w, "current": _current(w), "overload": _current(w) > CIRCUIT_BREAKER_A}
+        for c, w in sorted(circuit_watt.items())
+    ]
+
+    result["phases"] = {
+        "watt": phase_watt,
+        "current": phase_current,
+        "breaker_a": breaker,
+        "circuit_breaker_a": CIRCUIT_BREAKER_A,
+        "unassigned_watt": unassigned_watt,
+        "imbalance_pct": imbalance,
+        "unbalanced": assigned > 0 and imbalance > MAX_IMBALANCE_PCT,
+        "overloaded": [p for p in PHASES if phase_current[p] > breaker],
+        "circuits": circuits,
+        "overloaded_circuits": [c["circuit"] for c in circuits if c["overload"]],
+        "suggestion": balance_phases([(k, label, w, n) for k, label, w, n, _ in _iter_loads(rig_data)]),
+    }
+    return result
 
-        result.update({
-            "total_kw": total_kw,
-            "apparent_kva": apparent_kva,
-            "current_1ph": current_1ph,
-            "current_3ph": current_3ph,
-            "cos_phi": cos_phi
-        })
 
+def calculate_rig_power(rig_data: dict) -> dict:
+    """
+    Calculates the total power consumption of the rig based on the provided rig data.
+    Ergebnisse werden pro Rig-Stand gecacht (Key = Version der Fixture-Tabelle).
+
+    Args:
+        rig_data (dict): The dictionary containing the rig setup configuration.
+
+    Returns:
+        dict: A dictionary containing the calculated power metrics or None if no power is used.
+              Keys: total_watt, total_kw, apparent_kva, current_1ph, current_3ph, cos_phi, total_power,
+              phases (Last pro L1/L2/L3, Schieflast, Überlast, Verteilungsvorschlag)
+              Das Ergebnis ist geteilt (Cache) und darf nicht verändert werden.
+    """
+    if not rig_data:
+        rig_data = {}
+
+    key = _rig_key(rig_data)
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    result = _compute(rig_data)
+    with _lock:
+        _cache[key] = result
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
     return result
+
+
+def clear_cache() -> None:
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,243 @@
+"""
+Chunked, fortsetzbarer Upload für große Dateien (Videos).
+
+Protokoll (siehe routes/show_assets.py):
+
+    1. Session anlegen        -> upload_id, offset = 0
+    2. Chunks nacheinander    -> PUT mit Offset + SHA-256 des Chunks
+    3. Abbruch (WLAN weg)     -> Offset abfragen, ab dort weitersenden
+    4. Abschluss              -> Größe (+ optional Gesamt-Hash) prüfen,
+                                 Datei in das Zielverzeichnis verschieben
+
+Der Chunk-Body wird blockweise von `stream` gelesen und direkt an die
+`.part`-Datei angehängt – der Speicherbedarf pro Upload ist unabhängig von
+Datei- und Chunkgröße. Der aktuelle Offset ist die Größe der `.part`-Datei,
+d.h. ein Upload überlebt auch einen Neustart des Servers.
+"""
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional
+import hashlib
+import json
+import threading
+import time
+import uuid
+
+import werkzeug
+
+from services import media_store
+
+# Empfohlene Chunkgröße für den Client
+CHUNK_SIZE = 8 * 1024 * 1024
+# Obergrenze pro Chunk-Request (ersetzt MAX_CONTENT_LENGTH für diesen Endpoint)
+MAX_CHUNK_BYTES = 64 * 1024 * 1024
+# Blockgröße beim Lesen aus dem Request-Stream
+READ_BLOCK = 1024 * 1024
+# Unvollständige Uploads werden nach dieser Zeit verworfen (Sekunden)
+STALE_AFTER = 7 * 24 * 3600
+
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+class UploadError(Exception):
+    """Fehler im Upload-Protokoll; `status` ist der passende HTTP-Status."""
+
+    def __init__(self, message: str, status: int = 400, offset: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+def _lock_for(upload_id: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(upload_id, threading.Lock())
+
+
+def _paths(upload_dir: Path, upload_id: str):
+    # upload_id kommt aus der URL -> nur Hex-IDs zulassen
+    if not upload_id or not all(c in "0123456789abcdef" for c in upload_id):
+        raise UploadError("Unbekannter Upload", 404)
+    return upload_dir / f"{upload_id}.json", upload_dir / f"{upload_id}.part"
+
+
+def _load_meta(upload_dir: Path, upload_id: str) -> Dict:
+    meta_path, _ = _paths(upload_dir, upload_id)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        raise UploadError("Unbekannter Upload", 404)
+
+
+def _status(meta: Dict, part_path: Path) -> Dict:
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    return {
+        "upload_id": meta["upload_id"],
+        "filename": meta["filename"],
+        "size": meta["size"],
+        "offset": offset,
+        "chunk_size": CHUNK_SIZE,
+        "complete": offset >= meta["size"],
+    }
+
+
+def purge_stale(upload_dir: Path, max_age: float = STALE_AFTER) -> int:
+    """Löscht abgebrochene Uploads, die älter als `max_age` Sekunden sind."""
+    upload_dir = Path(upload_dir)
+    if not upload_dir.is_dir():
+        return 0
+    removed = 0
+    cutoff = time.time() - max_age
+    for meta_path in upload_dir.glob("*.json"):
+        part_path = meta_path.with_suffix(".part")
+        newest = max(p.stat().st_mtime for p in (meta_path, part_path) if p.exists())
+        if newest < cutoff:
+            meta_path.unlink(missing_ok=True)
+            part_path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+def create_upload(upload_dir: Path, show_id: int, filename: str, size: int, sha256: str = "") -> Dict:
+    """Legt eine neue Upload-Session an (leere `.part`-Datei + Metadaten)."""
+    safe_name = werkzeug.utils.secure_filename(filename or "")
+    if not safe_name or "." not in safe_name:
+        raise UploadError("Ungültiger Dateiname")
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise UploadError("Ungültige Dateigröße")
+    if size <= 0:
+        raise UploadError("Ungültige Dateigröße")
+
+    upload_dir = Path(upload_dir)
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    purge_stale(upload_dir)
+
+    upload_id = uuid.uuid4().hex
+    meta = {
+        "upload_id": upload_id,
+        "show_id": show_id,
+        "filename": safe_name,
+        "size": size,
+        "sha256": (sha256 or "").lower(),
+        "created": time.time(),
+    }
+    meta_path, part_path = _paths(upload_dir, upload_id)
+    part_path.touch()
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    return _status(meta, part_path)
+
+
+def get_status(upload_dir: Path, upload_id: str, show_id: int) -> Dict:
+    """Aktueller Stand (Offset) einer Session – Grundlage für das Fortsetzen."""
+    meta = _load_meta(Path(upload_dir), upload_id)
+    if meta.get("show_id") != show_id:
+        raise UploadError("Unbekannter Upload", 404)
+    _, part_path = _paths(Path(upload_dir), upload_id)
+    return _status(meta, part_path)
+
+
+def write_chunk(
+    upload_dir: Path,
+    upload_id: str,
+    show_id: int,
+    offset: int,
+    stream: BinaryIO,
+    length: int,
+    sha256: str,
+) -> Dict:
+    """
+    Hängt einen Chunk an. `offset` muss dem aktuellen Dateiende entsprechen
+    (sonst 409 mit dem Offset, ab dem weitergesendet werden muss).
+    Stimmt der SHA-256 nicht, wird der Chunk wieder abgeschnitten.
+    """
+    upload_dir = Path(upload_dir)
+    meta = _load_meta(upload_dir, upload_id)
+    if meta.get("show_id") != show_id:
+        raise UploadError("Unbekannter Upload", 404)
+    if not sha256:
+        raise UploadError("Chunk-Prüfsumme (SHA-256) fehlt")
+    if length <= 0 or length > MAX_CHUNK_BYTES:
+        raise UploadError("Ungültige Chunkgröße", 413 if length > MAX_CHUNK_BYTES else 400)
+
+    _, part_path = _paths(upload_dir, upload_id)
+    with _lock_for(upload_id):
+        current = part_path.stat().st_size if part_path.exists() else 0
+        if offset != current:
+            raise UploadError("Offset passt nicht zum Upload-Stand", 409, offset=current)
+        if current + length > meta["size"]:
+            raise UploadError("Chunk überschreitet die angekündigte Dateigröße", 400, offset=current)
+
+        digest = hashlib.sha256()
+        received = 0
+        with open(part_path, "r+b") as f:
+            f.seek(current)
+            while received < length:
+                block = stream.read(min(READ_BLOCK, length - received))
+                if not block:
+                    break
+                digest.update(block)
+                f.write(block)
+                received += len(block)
+
+            if received != length or digest.hexdigest() != sha256.lower():
+                f.truncate(current)
+                if received != length:
+                    raise UploadError("Chunk unvollständig übertragen", 400, offset=current)
+                raise UploadError("Chunk-Prüfsumme stimmt nicht", 422, offset=current)
+
+    return _status(meta, part_path)
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(READ_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def complete_upload(upload_dir: Path, upload_id: str, show_id: int, target_dir: Path) -> str:
+    """
+    Schließt den Upload ab: Größe und (falls angekündigt) Gesamt-Hash prüfen,
+    Datei inhaltsadressiert (`<hash>.<ext>`) nach `target_dir` übernehmen.
+    Gibt den neuen Dateinamen zurück.
+    """
+    upload_dir = Path(upload_dir)
+    meta = _load_meta(upload_dir, upload_id)
+    if meta.get("show_id") != show_id:
+        raise UploadError("Unbekannter Upload", 404)
+
+    meta_path, part_path = _paths(upload_dir, upload_id)
+    with _lock_for(upload_id):
+        current = part_path.stat().st_size if part_path.exists() else 0
+        if current != meta["size"]:
+            raise UploadError("Upload noch nicht vollständig", 409, offset=current)
+        digest = _file_sha256(part_path)
+        if meta.get("sha256") and digest != meta["sha256"]:
+            raise UploadError("Prüfsumme der Datei stimmt nicht", 422, offset=current)
+
+        # Inhaltsadressiert ablegen (existiert das Video schon, wird die Teildatei verworfen)
+        ext = meta["filename"].rsplit(".", 1)[-1].lower()
+        fname, _ = media_store.store_file(part_path, "videos", Path(target_dir), ext, digest=digest)
+        meta_path.unlink(missing_ok=True)
+
+    with _locks_guard:
+        _locks.pop(upload_id, None)
+    return fname
+
+
+def abort_upload(upload_dir: Path, upload_id: str, show_id: int) -> None:
+    """Verwirft eine Session samt Teildatei."""
+    upload_dir = Path(upload_dir)
+    meta = _load_meta(upload_dir, upload_id)
+    if meta.get("show_id") != show_id:
+        raise UploadError("Unbekannter Upload", 404)
+    meta_path, part_path = _paths(upload_dir, upload_id)
+    with _lock_for(upload_id):
+        part_path.unlink(missing_ok=True)
+        meta_path.unlink(missing_ok=True)
+    with _locks_guard:
+        _locks.pop(upload_id, None)
@@ -0,0 +1,453 @@
+/*
+ * Virtualisierte Cue-Liste (Songs-Tab, Regie-Tab, Regie-Ansicht).
+ *
+ * Gerendert werden nur die Zeilen im sichtbaren Bereich (plus Puffer); die
+ * Daten kommen seitenweise von /api/show/<id>/cues. DOM und Anfragen bleiben
+ * so pro Bildschirm konstant, egal wie viele Cues die Show hat.
+ *
+ * Markup: Container mit data-api-url, data-total (und optional
+ * data-row-height), darin ein <template> für eine Zeile. In der Vorlage:
+ *   data-field="name"      Text des Feldes (data-empty: Ersatztext,
+ *                          data-truncate: max. Zeichen)
+ *   data-show-if="mood"    nur sichtbar, wenn das Feld nicht leer ist
+ *   data-value="name"      Wert eines Eingabefelds
+ *   data-cue-id            value (Eingabefeld) bzw. Text = Song-ID
+ *   data-cue-toggle        Klick klappt die Zeile auf/zu
+ *   data-cue-body          Inhalt der aufgeklappten Zeile (.collapse)
+ *   data-cue-drag          Griff zum Verschieben (draggable; Container
+ *                          braucht data-move-url)
+ * Zusätzliches Feld "regie" = Special Notes, sonst allgemeine Notizen.
+ */
+(function () {
+  if (window.CueList) return;
+
+  const PAGE = 50;
+  const OVERSCAN = 10;
+  const GAP = 8;
+  const OFFSET_TOP = 110;
+  const KEY_URL = 'la_scroll_url';
+  const KEY_OPEN = 'la_open_cue';
+  const KEY_FOCUS = 'la_focus_cue';
+
+  function fieldValue(cue, field) {
+    if (field === 'regie') return String(cue.special_notes || cue.general_notes || '').replace(/\n/g, ' ');
+    const value = cue[field];
+    return value === null || value === undefined ? '' : String(value);
+  }
+
+  function CueList(root, options) {
+    const self = this;
+    this.root = root;
+    this.options = options || {};
+    this.template = root.querySelector('template');
+    this.viewport = document.createElement('div');
+    this.viewport.style.position = 'relative';
+    root.appendChild(this.viewport);
+
+    this.apiUrl = root.dataset.apiUrl;
+    this.rowHeight = parseInt(root.dataset.rowHeight, 10) || 56;
+    this.total = parseInt(root.dataset.total, 10) || 0;
+    this.query = '';
+    this.cues = new Map();      // Position -> Cue
+    this.pending = new Set();   // angefragte Seiten
+    this.generation = 0;        // neue Suche verwirft ältere Antworten
+    this.rows = new Map();      // Position -> Element
+    this.expandedId = null;
+    this.expandedPos = -1;
+    this.extra = 0;             // Mehrhöhe der aufgeklappten Zeile
+    this.scheduled = false;
+
+    const schedule = function () { self.schedule(); };
+    window.addEventListener('scroll', schedule, { passive: true });
+    window.addEventListener('resize', schedule);
+    // Wird ein versteckter Tab sichtbar, ändert sich die Größe -> neu rendern
+    if (window.ResizeObserver) {
+      this.observer = new ResizeObserver(function () { self.measure(); self.schedule(); });
+      this.observer.observe(this.viewport);
+    }
+    root.addEventListener('click', function (ev) {
+      const toggle = ev.target.closest('[data-cue-toggle]');
+      const row = toggle && toggle.closest('[data-position]');
+      if (row && root.contains(row)) self.toggle(parseInt(row.dataset.position, 10));
+    });
+
+    CueList.instances.push(this);
+    this.layoutHeight();
+    this.schedule();
+  }
+
+  CueList.instances = [];
+
+  // ------------------------------------------------------------------ //
+  // Geometrie
+  // ------------------------------------------------------------------ //
+
+  CueList.prototype.topOf = function (pos) {
+    return pos * this.rowHeight + (this.expandedPos >= 0 && pos > this.expandedPos ? this.extra : 0);
+  };
+
+  CueList.prototype.posAt = function (y) {
+    if (this.expandedPos >= 0) {
+      const expandedEnd = (this.expandedPos + 1) * this.rowHeight + this.extra;
+      if (y >= expandedEnd) y -= this.extra;
+      else if (y >= this.expandedPos * this.rowHeight) return this.expandedPos;
+    }
+    return Math.floor(y / this.rowHeight);
+  };
+
+  CueList.prototype.layoutHeight = function () {
+    this.viewport.style.height = (this.total * this.rowHeight + (this.expandedPos >= 0 ? this.extra : 0)) + 'px';
+  };
+
+  CueList.prototype.visibleRange = function () {
+    const rect = this.viewport.getBoundingClientRect();
+    if (!rect.width || !this.total) return null;  // versteckter Tab oder leer
+    const top = Math.max(0, -rect.top);
+    const bottom = Math.max(0, window.innerHeight - rect.top);
+    return [Math.max(0, this.posAt(top) - OVERSCAN), Math.min(this.total - 1, this.posAt(bottom) + OVERSCAN)];
+  };
+
+  // ------------------------------------------------------------------ //
+  // Rendern
+  // ------------------------------------------------------------------ //
+
+  CueList.prototype.schedule = function () {
+    if (this.scheduled) return;
+    this.scheduled = true;
+    const self = this;
+    requestAnimationFrame(function () { self.render(); });
+  };
+
+  CueList.prototype.render = function () {
+    this.scheduled = false;
+    const range = this.visibleRange();
+    const first = range ? range[0] : 0;
+    const last = range ? range[1] : -1;
+    const self = this;
+    this.rows.forEach(function (el, pos) {
+      if (pos < first || pos > last) {
+        el.remove();
+        self.rows.delete(pos);
+      }
+    });
+    for (let pos = first; pos <= last; pos++) {
+      const cue = this.cues.get(pos);
+      if (!cue) {
+        this.load(Math.floor(pos / PAGE));
+        continue;
+      }
+      const expanded = cue.id === this.expandedId;
+      let el = this.rows.get(pos);
+      if (el && el._cue === cue && el._expanded === expanded) {
+        el.style.top = this.topOf(pos) + 'px';
+        continue;
+      }
+      if (el) el.remove();
+      el = this.build(cue, pos, expanded);
+      this.viewport.appendChild(el);
+      this.rows.set(pos, el);
+    }
+  };
+
+  CueList.prototype.build = function (cue, pos, expanded) {
+    const el = this.template.content.firstElementChild.cloneNode(true);
+    el._cue = cue;
+    el._expanded = expanded;
+    el.id = 'cue-' + cue.id;
+    el.dataset.position = pos;
+    el.dataset.songId = cue.id;
+    el.style.position = 'absolute';
+    el.style.left = '0';
+    el.style.right = '0';
+    el.style.top = this.topOf(pos) + 'px';
+    if (!expanded) {
+      el.style.height = (this.rowHeight - GAP) + 'px';
+      el.style.overflow = 'hidden';
+    }
+
+    el.querySelectorAll('[data-field]').forEach(function (node) {
+      let text = fieldValue(cue, node.dataset.field) || node.dataset.empty || '';
+      const max = parseInt(node.dataset.truncate, 10);
+      if (max && text.length > max) text = text.slice(0, max - 1) + '…';
+      node.textContent = text;
+    });
+    el.querySelectorAll('[data-show-if]').forEach(function (node) {
+      node.classList.toggle('d-none', !fieldValue(cue, node.dataset.showIf));
+    });
+    el.querySelectorAll('[data-value]').forEach(function (node) {
+      node.value = fieldValue(cue, node.dataset.value);
+    });
+    el.querySelectorAll('[data-cue-id]').forEach(function (node) {
+      if ('value' in node) node.value = cue.id; else node.textContent = cue.id;
+    });
+    el.querySelectorAll('[data-cue-toggle]').forEach(function (node) {
+      node.setAttribute('aria-expanded', expanded ? 'true' : 'false');
+    });
+    const body = el.querySelector('[data-cue-body]');
+    if (body) {
+      body.id = 'songCollapse' + cue.id;
+      body.classList.toggle('show', expanded);
+    }
+    return el;
+  };
+
+  CueList.prototype.toggle = function (pos) {
+    const cue = this.cues.get(pos);
+    if (!cue) return;
+    if (this.expandedId === cue.id) {
+      this.expandedId = null;
+      this.expandedPos = -1;
+    } else {
+      this.expandedId = cue.id;
+      this.expandedPos = pos;
+      try { sessionStorage.setItem(KEY_OPEN, 'songCollapse' + cue.id); } catch (e) { }
+    }
+    this.extra = 0;
+    this.render();
+    this.measure();
+  };
+
+  // Höhe der aufgeklappten Zeile übernehmen (auch nach Textarea-Resize)
+  CueList.prototype.measure = function () {
+    const el = this.expandedPos >= 0 ? this.rows.get(this.expandedPos) : null;
+    if (!el) {
+      this.layoutHeight();
+      return;
+    }
+    const extra = Math.max(0, el.offsetHeight - (this.rowHeight - GAP));
+    if (extra === this.extra) return;
+    this.extra = extra;
+    this.layoutHeight();
+    const self = this;
+    this.rows.forEach(function (row, pos) { row.style.top = self.topOf(pos) + 'px'; });
+    if (this.observer && !el._observed) {
+      el._observed = true;
+      this.observer.observe(el);
+    }
+  };
+
+  // ------------------------------------------------------------------ //
+  // Daten
+  // ------------------------------------------------------------------ //
+
+  CueList.prototype.request = function (params) {
+    const url = new URL(this.apiUrl, window.location.href);
+    Object.keys(params).forEach(function (k) { url.searchParams.set(k, params[k]); });
+    if (this.query) url.searchParams.set('q', this.query);
+    return fetch(url, { credentials: 'same-origin' }).then(function (r) {
+      if (!r.ok) throw new Error('HTTP ' + r.status);
+      return r.json();
+    });
+  };
+
+  CueList.prototype.store = function (data) {
+    const self = this;
+    data.cues.forEach(function (cue) { self.cues.set(cue.position, cue); });
+    if (data.total !== this.total) {
+      this.total = data.total;
+      this.layoutHeight();
+    }
+    if (this.options.onTotal) this.options.onTotal(this.total, this.query);
+    this.schedule();
+  };
+
+  CueList.prototype.load = function (page) {
+    if (this.pending.has(page)) return;
+    this.pending.add(page);
+    const self = this;
+    const generation = this.generation;
+    this.request({ offset: page * PAGE, limit: PAGE })
+      .then(function (data) { if (generation === self.generation) self.store(data); })
+      .catch(function (e) {
+        console.warn('[CueList] Laden fehlgeschlagen:', e);
+        if (generation === self.generation) self.pending.delete(page);
+      });
+  };
+
+  CueList.prototype.search = function (query) {
+    query = (query || '').trim();
+    if (query === this.query) return;
+    this.query = query;
+    this.generation++;
+    this.cues.clear();
+    this.pending.clear();
+    this.expandedId = null;
+    this.expandedPos = -1;
+    this.extra = 0;
+    this.rows.forEach(function (el) { el.remove(); });
+    this.rows.clear();
+    this.load(0);
+  };
+
+  // Cue laden, hinscrollen und ggf. aufklappen (z.B. nach Speichern/Verschieben)
+  CueList.prototype.reveal = function (songId, expand) {
+    const self = this;
+    const generation = this.generation;
+    return this.request({ around: songId, limit: PAGE }).then(function (data) {
+      if (generation !== self.generation) return;
+      self.store(data);
+      if (data.focus === undefined) return;
+      if (expand) {
+        self.expandedId = data.cues.find(function (c) { return c.position === data.focus; }).id;
+        self.expandedPos = data.focus;
+        self.extra = 0;
+      }
+      const rect = self.viewport.getBoundingClientRect();
+      if (rect.width) {
+        window.scrollTo(0, Math.max(0, rect.top + window.pageYOffset + self.topOf(data.focus) - OFFSET_TOP));
+      }
+      self.render();
+      self.measure();
+    }).catch(function (e) { console.warn('[CueList] Cue nicht gefunden:', e); });
+  };
+
+  // Geänderten Cue übernehmen (Antwort eines JSON-Endpunkts)
+  CueList.prototype.update = function (cue) {
+    const self = this;
+    this.cues.forEach(function (old, pos) {
+      if (old.id === cue.id) self.cues.set(pos, Object.assign({}, cue, { position: pos }));
+    });
+    this.schedule();
+  };
+
+  // Nach einem Verschieben: Ausschnitte neu laden. Nur der verschobene Cue
+  // hat einen neuen Platz, alle dazwischen rücken um eins; die aufgeklappte
+  // Zeile bleibt offen, bei den Pfeil-Buttons bleibt die Zeile unter dem Mauszeiger
+  CueList.prototype.moved = function (cue, follow) {
+    let oldPos = -1;
+    this.cues.forEach(function (c, pos) { if (c.id === cue.id) oldPos = pos; });
+    const oldTop = oldPos >= 0 ? this.topOf(oldPos) : null;
+    this.generation++;
+    this.cues.clear();
+    this.pending.clear();
+    if (this.expandedId === cue.id && !this.query) {
+      this.expandedPos = cue.position;
+    } else if (this.expandedPos >= 0 && oldPos >= 0 && !this.query) {
+      if (oldPos < this.expandedPos && cue.position >= this.expandedPos) this.expandedPos--;
+      else if (oldPos > this.expandedPos && cue.position <= this.expandedPos) this.expandedPos++;
+    } else if (this.expandedPos >= 0) {
+      // Position in der (Treffer-)Liste unbekannt -> zuklappen
+      this.expandedId = null;
+      this.expandedPos = -1;
+      this.extra = 0;
+    }
+    if (follow && oldTop !== null && !this.query && this.viewport.getBoundingClientRect().width) {
+      window.scrollBy(0, this.topOf(cue.position) - oldTop);
+    }
+    this.rows.forEach(function (el) { el._cue = null; });
+    this.layoutHeight();
+    this.schedule();
+  };
+
+  // Drag & Drop (Container mit data-move-url, Griff mit data-cue-drag):
+  // Ziel-Position an die Move-API schicken, nur der Schlüssel des Cues ändert sich
+  CueList.prototype.enableDrag = function () {
+    const self = this;
+    const moveUrl = this.root.dataset.moveUrl;
+    if (!moveUrl) return;
+    let dragged = null;
+    this.viewport.addEventListener('dragstart', function (ev) {
+      const handle = ev.target.closest && ev.target.closest('[data-cue-drag]');
+      const row = handle && handle.closest('[data-position]');
+      if (!row || self.query) {
+        ev.preventDefault();
+        return;
+      }
+      dragged = row;
+      ev.dataTransfer.effectAllowed = 'move';
+      ev.dataTransfer.setData('text/plain', row.dataset.songId);
+      row.classList.add('opacity-50');
+    });
+    this.viewport.addEventListener('dragend', function () {
+      if (dragged) dragged.classList.remove('opacity-50');
+      dragged = null;
+    });
+    this.viewport.addEventListener('dragover', function (ev) {
+      if (dragged) ev.preventDefault();
+    });
+    this.viewport.addEventListener('drop', function (ev) {
+      if (!dragged) return;
+      ev.preventDefault();
+      const y = ev.clientY - self.viewport.getBoundingClientRect().top;
+      const target = Math.max(0, Math.min(self.total - 1, self.posAt(y)));
+      if (target === parseInt(dragged.dataset.position, 10)) return;
+      const body = new FormData();
+      const token = dragged.querySelector('input[name="csrf_token"]');
+      if (token) body.append('csrf_token', token.value);
+      body.append('song_id', dragged.dataset.songId);
+      body.append('position', target);
+      fetch(moveUrl, { method: 'POST', body: body, credentials: 'same-origin', headers: { 'Accept': 'application/json' } })
+        .then(function (r) {
+          if (!r.ok) throw new Error('HTTP ' + r.status);
+          return r.json();
+        })
+        .then(function (data) { CueList.movedAll(data.cue, false); })
+        .catch(function (e) {
+          console.warn('[CueList] Verschieben fehlgeschlagen:', e);
+          location.reload();
+        });
+    });
+  };
+
+  function liveInstances() {
+    CueList.instances = CueList.instances.filter(function (list) { return document.contains(list.root); });
+    return CueList.instances;
+  }
+
+  CueList.updateAll = function (cue) {
+    liveInstances().forEach(function (list) { list.update(cue); });
+  };
+
+  CueList.movedAll = function (cue, follow) {
+    liveInstances().forEach(function (list) { list.moved(cue, follow); });
+  };
+
+  // Nach einem Submit (gleiche Seite): zuletzt bearbeiteten/verschobenen Cue zeigen.
+  // Muss vor dem Aufräumen der Restore-Skripte laufen (früher registriert).
+  CueList.prototype.restore = function () {
+    let openId = null, focusId = null, sameUrl = false;
+    try {
+      openId = sessionStorage.getItem(KEY_OPEN);
+      focusId = sessionStorage.getItem(KEY_FOCUS);
+      sameUrl = sessionStorage.getItem(KEY_URL) === window.location.pathname;
+    } catch (e) { }
+    if (!sameUrl) return;
+    const m = String(openId || '').match(/^songCollapse(\d+)$/);
+    const songId = parseInt(focusId, 10) || (m ? parseInt(m[1], 10) : 0);
+    if (songId) this.reveal(songId, true);
+  };
+
+  // Liste samt Suchfeld verdrahten
+  CueList.mount = function (root, search) {
+    if (!root || root._cueList) return root && root._cueList;
+    search = search || {};
+    const list = new CueList(root, {
+      onTotal: function (total, query) {
+        if (search.empty) search.empty.classList.toggle('d-none', !(query && total === 0));
+      },
+    });
+    root._cueList = list;
+    list.enableDrag();
+    if (search.input) {
+      let timer = null;
+      const update = function () {
+        if (search.clear) search.clear.style.display = search.input.value ? 'block' : 'none';
+        clearTimeout(timer);
+        timer = setTimeout(function () { list.search(search.input.value); }, 150);
+      };
+      search.input.addEventListener('input', update);
+      if (search.clear) {
+        search.clear.style.display = 'none';
+        search.clear.addEventListener('click', function () {
+          search.input.value = '';
+          update();
+          search.input.focus();
+        });
+      }
+    }
+    list.restore();
+    return list;
+  };
+
+  window.CueList = CueList;
+})();
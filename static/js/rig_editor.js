@@ -25,6 +25,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
     const libraryContainer = document.getElementById('libraryContainer');
     let rigData = {};
+    let rigGroups = [];
     let visualPlan = {};
 
     // Standard-Farben für Typen
@@ -85,6 +86,7 @@ document.addEventListener('DOMContentLoaded', function () {
             const resp = await fetch(`/show/${showId}/api/get_rig`);
             const json = await resp.json();
             rigData = json.rig;
+            rigGroups = json.groups || [];
             visualPlan = json.visual_plan || {};
             renderUI();
         } catch (e) {
@@ -107,41 +109,29 @@ document.addEventListener('DOMContentLoaded', function () {
 
         drawGrid();
 
-        // Items verarbeiten
-        const prefixes = ["spots", "washes", "beams", "blinders", "strobes"];
-
-        prefixes.forEach(prefix => {
-            const items = rigData[`${prefix}_items`] || [];
-            items.forEach((item, itemIdx) => {
-                const count = parseInt(item.count || 0);
-                const name = item.manufacturer && item.model ? `${item.manufacturer} ${item.model}` : `${prefix.toUpperCase()}`;
-
-                for (let i = 0; i < count; i++) {
-                    const key = `${prefix}_${itemIdx}_${i}`;
-                    const label = `#${i + 1}`; // Short label on fixture
-                    const fullLabel = `${name} #${i + 1}`;
+        // Gruppen aus der Fixture-Tabelle des Servers (Anzahl bereits geparst)
+        rigGroups.forEach(group => {
+            const isCustom = group.category === 'custom';
+            const item = isCustom
+                ? (rigData.custom_devices || [])[group.item_idx]
+                : (rigData[`${group.category}_items`] || [])[group.item_idx];
+            if (!item) return;
+            const color = isCustom ? TYPE_COLORS.custom : TYPE_COLORS[group.category];
+            let name;
+            if (isCustom) {
+                name = item.name || "Custom";
+            } else {
+                name = item.manufacturer && item.model ? `${item.manufacturer} ${item.model}` : `${group.category.toUpperCase()}`;
+            }
 
-                    if (visualPlan[key]) {
-                        addToCanvas(key, label, TYPE_COLORS[prefix], visualPlan[key], prefix);
-                    } else {
-                        addToLibrary(key, fullLabel, TYPE_COLORS[prefix], prefix);
-                    }
-                }
-            });
-        });
+            for (let i = 0; i < group.count; i++) {
+                const key = `${group.category}_${group.item_idx}_${i}`;
+                const label = `#${i + 1}`; // Short label on fixture
 
-        // Custom Devices (ähnlich...)
-        const customs = rigData.custom_devices || [];
-        customs.forEach((item, itemIdx) => {
-            const count = parseInt(item.count || 0);
-            const name = item.name || "Custom";
-            for (let i = 0; i < count; i++) {
-                const key = `custom_${itemIdx}_${i}`;
-                const label = `#${i + 1}`;
                 if (visualPlan[key]) {
-                    addToCanvas(key, label, TYPE_COLORS.custom, visualPlan[key], 'custom');
+                    addToCanvas(key, label, color, visualPlan[key], group.category);
                 } else {
-                    addToLibrary(key, `${name} #${i + 1}`, TYPE_COLORS.custom, 'custom');
+                    addToLibrary(key, `${name} #${i + 1}`, color, group.category);
                 }
             }
         });
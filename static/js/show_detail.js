@@ -57,6 +57,9 @@ document.addEventListener('DOMContentLoaded', function () {
     }
   }
 });
+const KEY_SCROLL = 'la_scroll_y';
+const KEY_URL = 'la_scroll_url';
+const KEY_OPEN = 'la_open_cue';
 const KEY_FOCUS = 'la_focus_cue';
 const OFFSET_TOP = 110;
 const safeInt = (v) => {
@@ -157,6 +160,67 @@ document.addEventListener('DOMContentLoaded', function () {
   requestAnimationFrame(reveal);
 });
 
+// JSON-Änderungen: Formulare mit data-api-url gehen per fetch an den Endpunkt,
+// die Antwort enthält nur das geänderte Objekt -> DOM an Ort und Stelle anpassen
+// statt Redirect und komplettem Neuaufbau der Seite.
+function applyChecklistItem(category, item) {
+  document.querySelectorAll('[data-check-item="' + category + '-' + item.id + '"]').forEach(function (li) {
+    const box = li.querySelector('.form-check-input');
+    const label = li.querySelector('.form-check-label');
+    if (box) box.checked = !!item.done;
+    if (label) label.classList.toggle('text-decoration-line-through', !!item.done);
+    if (label) label.classList.toggle('text-muted', !!item.done);
+  });
+}
+
+function applyDelta(data) {
+  if (data.version) document.documentElement.dataset.showVersion = data.version;
+  if (data.item && data.category) applyChecklistItem(data.category, data.item);
+  if (data.cue && window.CueList) {
+    if (data.changed) CueList.movedAll(data.cue, true);
+    else CueList.updateAll(data.cue);
+  }
+}
+
+function flashButton(btn, ok) {
+  if (!btn) return;
+  const cls = ok ? 'btn-success' : 'btn-danger';
+  btn.classList.add(cls);
+  setTimeout(function () { btn.classList.remove(cls); }, 800);
+}
+
+document.addEventListener('submit', function (ev) {
+  const form = ev.target;
+  const url = form?.dataset?.apiUrl;
+  if (!url || ev.defaultPrevented || !window.fetch) return;
+  ev.preventDefault();
+  const submitter = ev.submitter;
+  if (submitter) submitter.disabled = true;
+  fetch(url, {
+    method: 'POST',
+    body: new FormData(form),
+    credentials: 'same-origin',
+    headers: { 'Accept': 'application/json' },
+  })
+    .then(function (r) {
+      if (!r.ok) throw new Error('HTTP ' + r.status);
+      return r.json();
+    })
+    .then(function (data) {
+      cleanup();  // kein Reload -> gemerkte Scrollposition verwerfen
+      applyDelta(data);
+      if (submitter && !form.querySelector('input[name="direction"]')) flashButton(submitter, true);
+    })
+    .catch(function (e) {
+      // Serverstand unklar: Seite neu laden statt erneut abzuschicken
+      console.warn('[AJAX] Änderung fehlgeschlagen, lade neu:', e);
+      location.reload();
+    })
+    .finally(function () {
+      if (submitter) submitter.disabled = false;
+    });
+});
+
 // Add Beam Row Logic
 function addBeamRow() {
   const beamsRows = document.getElementById('beams-rows');
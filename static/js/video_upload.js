@@ -0,0 +1,174 @@
+// Chunked / fortsetzbarer Video-Upload (Videos-Tab)
+// Protokoll: siehe services/upload_service.py
+(function () {
+  'use strict';
+
+  const MAX_RETRIES = 5;
+
+  // --- SHA-256 -------------------------------------------------------------
+  // crypto.subtle gibt es nur in sicheren Kontexten (https / localhost).
+  // Im Venue-LAN per http wird deshalb auf die JS-Implementierung ausgewichen.
+  const K = new Uint32Array([
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2
+  ]);
+
+  function sha256Fallback(bytes) {
+    const bitLen = bytes.length * 8;
+    const padded = new Uint8Array(((bytes.length + 9 + 63) >> 6) << 6);
+    padded.set(bytes);
+    padded[bytes.length] = 0x80;
+    const view = new DataView(padded.buffer);
+    view.setUint32(padded.length - 8, Math.floor(bitLen / 0x100000000));
+    view.setUint32(padded.length - 4, bitLen >>> 0);
+
+    const h = new Uint32Array([
+      0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19
+    ]);
+    const w = new Uint32Array(64);
+    const rotr = (x, n) => (x >>> n) | (x << (32 - n));
+
+    for (let off = 0; off < padded.length; off += 64) {
+      for (let i = 0; i < 16; i++) w[i] = view.getUint32(off + i * 4);
+      for (let i = 16; i < 64; i++) {
+        const s0 = rotr(w[i - 15], 7) ^ rotr(w[i - 15], 18) ^ (w[i - 15] >>> 3);
+        const s1 = rotr(w[i - 2], 17) ^ rotr(w[i - 2], 19) ^ (w[i - 2] >>> 10);
+        w[i] = (w[i - 16] + s0 + w[i - 7] + s1) >>> 0;
+      }
+      let [a, b, c, d, e, f, g, hh] = h;
+      for (let i = 0; i < 64; i++) {
+        const t1 = (hh + (rotr(e, 6) ^ rotr(e, 11) ^ rotr(e, 25)) + ((e & f) ^ (~e & g)) + K[i] + w[i]) >>> 0;
+        const t2 = ((rotr(a, 2) ^ rotr(a, 13) ^ rotr(a, 22)) + ((a & b) ^ (a & c) ^ (b & c))) >>> 0;
+        hh = g; g = f; f = e; e = (d + t1) >>> 0;
+        d = c; c = b; b = a; a = (t1 + t2) >>> 0;
+      }
+      h[0] += a; h[1] += b; h[2] += c; h[3] += d; h[4] += e; h[5] += f; h[6] += g; h[7] += hh;
+    }
+    return Array.from(h, x => x.toString(16).padStart(8, '0')).join('');
+  }
+
+  async function sha256Hex(buffer) {
+    if (window.crypto && window.crypto.subtle) {
+      const digest = await window.crypto.subtle.digest('SHA-256', buffer);
+      return Array.from(new Uint8Array(digest), b => b.toString(16).padStart(2, '0')).join('');
+    }
+    return sha256Fallback(new Uint8Array(buffer));
+  }
+
+  // --- Upload --------------------------------------------------------------
+
+  function storageKey(showId, file) {
+    return `videoUpload:${showId}:${file.name}:${file.size}:${file.lastModified}`;
+  }
+
+  async function api(url, options, csrfToken) {
+    const headers = Object.assign({ 'X-CSRFToken': csrfToken }, options.headers || {});
+    const resp = await fetch(url, Object.assign({}, options, { headers }));
+    let data = {};
+    try { data = await resp.json(); } catch (e) { /* leerer Body */ }
+    return { ok: resp.ok, status: resp.status, data };
+  }
+
+  async function startOrResume(base, showId, file, csrfToken) {
+    const key = storageKey(showId, file);
+    const known = localStorage.getItem(key);
+    if (known) {
+      const res = await api(`${base}/${known}`, { method: 'GET' }, csrfToken);
+      if (res.ok) return res.data;
+      localStorage.removeItem(key);
+    }
+    const res = await api(base, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ filename: file.name, size: file.size })
+    }, csrfToken);
+    if (!res.ok) throw new Error(res.data.error || `Fehler ${res.status}`);
+    localStorage.setItem(key, res.data.upload_id);
+    return res.data;
+  }
+
+  async function uploadFile(form, file, onProgress) {
+    const showId = form.dataset.showId;
+    const base = form.dataset.uploadUrl;
+    const csrfToken = form.querySelector('input[name="csrf_token"]')?.value || '';
+
+    const session = await startOrResume(base, showId, file, csrfToken);
+    const chunkSize = session.chunk_size;
+    let offset = session.offset;
+    let retries = 0;
+
+    while (offset < file.size) {
+      onProgress(offset / file.size);
+      const buffer = await file.slice(offset, Math.min(offset + chunkSize, file.size)).arrayBuffer();
+      let res;
+      try {
+        res = await api(`${base}/${session.upload_id}`, {
+          method: 'PUT',
+          headers: {
+            'Content-Type': 'application/octet-stream',
+            'Upload-Offset': String(offset),
+            'X-Chunk-SHA256': await sha256Hex(buffer)
+          },
+          body: buffer
+        }, csrfToken);
+      } catch (e) {
+        res = { ok: false, status: 0, data: {} };  // Netzwerk weg
+      }
+
+      if (res.ok) {
+        offset = res.data.offset;
+        retries = 0;
+        continue;
+      }
+      if (++retries > MAX_RETRIES) {
+        throw new Error(res.data.error || 'Verbindung unterbrochen – Upload kann später fortgesetzt werden.');
+      }
+      // Server kennt den richtigen Offset -> dort weitermachen
+      if (typeof res.data.offset === 'number') offset = res.data.offset;
+      await new Promise(r => setTimeout(r, 1000 * retries));
+    }
+
+    onProgress(1);
+    const done = await api(`${base}/${session.upload_id}/complete`, { method: 'POST' }, csrfToken);
+    if (!done.ok) throw new Error(done.data.error || `Fehler ${done.status}`);
+    localStorage.removeItem(storageKey(showId, file));
+    return done.data;
+  }
+
+  document.addEventListener('DOMContentLoaded', function () {
+    const form = document.getElementById('video-upload-form');
+    if (!form || !window.fetch || !window.Blob || !Blob.prototype.arrayBuffer) return;  // klassischer Upload
+
+    form.addEventListener('submit', async function (ev) {
+      const file = form.querySelector('input[type="file"]').files[0];
+      if (!file) return;
+      ev.preventDefault();
+
+      const button = form.querySelector('button[type="submit"]');
+      const progress = document.getElementById('video-upload-progress');
+      const bar = progress.querySelector('.progress-bar');
+      button.disabled = true;
+      progress.classList.remove('d-none');
+      bar.classList.remove('bg-danger');
+
+      try {
+        await uploadFile(form, file, function (ratio) {
+          const pct = Math.floor(ratio * 100);
+          bar.style.width = pct + '%';
+          bar.textContent = pct + '%';
+        });
+        window.location.reload();
+      } catch (e) {
+        bar.classList.add('bg-danger');
+        bar.textContent = e.message;
+        button.disabled = false;
+      }
+    });
+  });
+})();
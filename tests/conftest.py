@@ -2,6 +2,9 @@ import pytest
 import os
 import tempfile
 import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
 from app import app
 from core.show_logic import shows, save_data, DATA_FILE, next_show_id
 from core import show_logic
@@ -39,6 +42,10 @@ def client():
     
     os.close(db_fd)
     os.remove(db_path)
+    # Medien-Index der Test-Datendatei (wird beim Speichern angelegt)
+    index_file = os.path.splitext(db_path)[0] + "_media_index.json"
+    if os.path.exists(index_file):
+        os.remove(index_file)
 
 @pytest.fixture
 def sample_show():
@@ -46,3 +53,97 @@ def sample_show():
     show = show_logic.create_default_show("Test Show", "Tester", "2025-01-01", "", "", "")
     show_logic.shows.append(show)
     return show
+
+
+@pytest.fixture(autouse=True)
+def _isolated_gdtf_catalog(tmp_path, monkeypatch):
+    """GDTF-Katalog und lokale GDTF-Bibliothek pro Test in tmp_path (nie unter data/)."""
+    from services import gdtf_api, gdtf_library
+    monkeypatch.setattr(gdtf_api, "CATALOG_FILE", str(tmp_path / "gdtf_catalog.json.gz"))
+    monkeypatch.setattr(gdtf_library, "LIBRARY_DIR", tmp_path / "gdtf_library")
+    monkeypatch.setattr(gdtf_library, "INDEX_FILE", tmp_path / "gdtf_library_index.json")
+    gdtf_api.clear_cache()
+    gdtf_library.clear_cache()
+    yield
+    gdtf_api.clear_cache()
+    gdtf_library.clear_cache()
+
+
+class _GdtfStubHandler(BaseHTTPRequestHandler):
+    """
+    Minimaler GDTF-Share-Ersatz: login.php + getList.php (mit ETag).
+    Störungen: `fail` = Anzahl 503-Antworten, `expire` = Anzahl 401-Antworten,
+    `reject_login` = Zugangsdaten ablehnen.
+    """
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        stub = self.server.stub
+        stub.requests.append(("POST", self.path))
+        if self.path.endswith("/login.php"):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if stub.reject_login:
+                return self._json(200, {"result": False, "error": "Wrong credentials"})
+            self._json(200, {"result": True, "notice": "stub"}, {"Set-Cookie": "PHPSESSID=stub; Path=/"})
+        else:
+            self._json(404, {"result": False})
+
+    def do_GET(self):
+        stub = self.server.stub
+        stub.requests.append(("GET", self.path))
+        if not self.path.endswith("/getList.php"):
+            return self._json(404, {"result": False})
+        if stub.delay:
+            stub.delay.wait(5)
+        if stub.fail:
+            stub.fail -= 1
+            return self._json(503, {"result": False})
+        if stub.expire:
+            stub.expire -= 1
+            return self._json(401, {"result": False})
+        if stub.etag and self.headers.get("If-None-Match") == stub.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        headers = {"ETag": stub.etag} if stub.etag else {}
+        self._json(200, {"result": True, "list": stub.fixtures}, headers)
+
+
+@pytest.fixture
+def gdtf_stub(monkeypatch):
+    """Lokaler HTTP-Server anstelle von GDTF Share (GDTF_API_BASE wird umgebogen)."""
+    from services import gdtf_api
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _GdtfStubHandler)
+    server.stub = SimpleNamespace(
+        requests=[],
+        etag='"v1"',
+        delay=None,
+        fail=0,
+        expire=0,
+        reject_login=False,
+        fixtures=[
+            {"manufacturer": "Robe", "fixture": "MegaPointe", "rid": 1,
+             "modes": [{"0": {"name": "Standard", "dmxfootprint": 34}}]},
+            {"manufacturer": "Martin Professional", "fixture": "MAC Aura XB", "rid": 2,
+             "modes": [{"0": {"name": "Extended", "dmxfootprint": 14}}]},
+        ],
+    )
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    monkeypatch.setattr(gdtf_api, "GDTF_API_BASE", f"http://127.0.0.1:{server.server_address[1]}/apis/public")
+    yield server.stub
+    server.shutdown()
+    server.server_close()
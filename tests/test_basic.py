@@ -21,3 +21,20 @@ def test_login_invalid(client):
     ), follow_redirects=True)
     assert response.status_code == 200
     assert b"Login fehlgeschlagen" in response.data
+
+
+def test_production_profile_precompiles_templates(client, sample_show, tmp_path):
+    """Produktionsprofil: Templates vorkompiliert (mit Bytecode-Cache), kein Auto-Reload."""
+    from app import app, configure_templates
+    try:
+        app.jinja_env.cache.clear()
+        compiled = configure_templates(app, True, str(tmp_path))
+        assert compiled >= 10 and not app.jinja_env.auto_reload
+        assert any(tmp_path.iterdir())
+        assert len(app.jinja_env.cache) >= compiled
+
+        client.post('/login', data=dict(username="Admin", password="Admin123"))
+        assert client.get(f"/show/{sample_show['id']}").status_code == 200
+    finally:
+        configure_templates(app, False)
+    assert app.jinja_env.auto_reload and app.jinja_env.bytecode_cache is None
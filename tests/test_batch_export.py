@@ -0,0 +1,59 @@
+import io
+import json
+import zipfile
+
+from core import show_logic
+from services.exporters import batch_export
+
+
+def _add_tour_show(name, date):
+    show = show_logic.create_default_show(name, "Band", date, "", "", "")
+    show["songs"] = [
+        {"id": 1, "order_index": 1, "name": "Intro", "mood": "Warm", "colors": "Amber",
+         "special_notes": "", "general_notes": ""},
+    ]
+    show_logic.shows.append(show)
+    return show
+
+
+def test_select_shows_by_filter(client):
+    _add_tour_show("Tour Berlin", "2025-03-01")
+    _add_tour_show("Tour Hamburg", "2025-03-05")
+    _add_tour_show("Festival", "2025-06-01")
+
+    assert [s["name"] for s in batch_export.select_shows(query="tour")] == ["Tour Berlin", "Tour Hamburg"]
+    assert [s["name"] for s in batch_export.select_shows(date_from="2025-03-02")] == ["Tour Hamburg", "Festival"]
+    assert len(batch_export.select_shows(show_ids=[1, 3])) == 2
+
+
+def test_batch_export_dedupes_identical_outputs(client):
+    """Identical cue lists are stored once; the manifest references the first copy."""
+    client.post('/login', data=dict(username="Admin", password="Admin123"))
+    s1 = _add_tour_show("Tour Berlin", "2025-03-01")
+    s2 = _add_tour_show("Tour Hamburg", "2025-03-05")
+
+    response = client.post('/shows/batch_export', json={
+        "show_ids": [s1["id"], s2["id"]],
+        "exporters": ["nomad_csv", "mvr", "ma3"],
+    })
+    assert response.status_code == 200
+    assert response.content_type == "application/zip"
+
+    zf = zipfile.ZipFile(io.BytesIO(response.data))
+    manifest = json.loads(zf.read("manifest.json"))
+    assert len(manifest) == 6
+    assert not any("error" in entry for entry in manifest)
+
+    csv_entries = [e for e in manifest if e["exporter"] == "nomad_csv"]
+    assert csv_entries[0]["sha256"] == csv_entries[1]["sha256"]
+    assert csv_entries[1]["stored_as"] == csv_entries[0]["path"]
+    assert csv_entries[1]["path"] not in zf.namelist()
+
+    for entry in manifest:
+        assert entry["stored_as"] in zf.namelist()
+
+
+def test_batch_export_rejects_unknown_exporter(client, sample_show):
+    client.post('/login', data=dict(username="Admin", password="Admin123"))
+    response = client.post('/shows/batch_export', json={"exporters": ["does_not_exist"]})
+    assert response.status_code == 400
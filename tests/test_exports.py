@@ -73,3 +73,28 @@ def test_export_sync_fallback(client, sample_show):
     with app.app_context():
         restored_show = db.session.get(ShowModel, sample_show["id"])
         assert restored_show is not None, "Auto-repair failed: Show was not restored to DB"
+
+
+def test_export_eos_xlsx(client, sample_show):
+    """Test EOS XLSX export (write-only mode) keeps header style and cue rows."""
+    import io
+    import openpyxl
+
+    client.post('/login', data=dict(username="Admin", password="Admin123"))
+    sample_show["songs"] = [
+        {"id": 1, "order_index": 1, "name": "Intro", "mood": "Warm", "colors": "Amber",
+         "special_notes": "Go", "general_notes": ""},
+        {"id": 2, "order_index": 2, "name": "Outro", "mood": "", "colors": "",
+         "special_notes": "", "general_notes": "Blackout"},
+    ]
+
+    response = client.get(f'/show/{sample_show["id"]}/export_eos_xlsx')
+    assert response.status_code == 200
+
+    wb = openpyxl.load_workbook(io.BytesIO(response.data))
+    ws = wb["EOS_Cues"]
+    rows = list(ws.iter_rows(values_only=True))
+    assert rows[0] == ("Cue", "Label", "Notes", "Up Time", "Down Time")
+    assert ws["A1"].font.bold
+    assert rows[1][:3] == ("1/1", "Intro [Warm|Amber]", "Go")
+    assert rows[2][:3] == ("1/2", "Outro", "Blackout")
@@ -0,0 +1,108 @@
+from services import fixture_table, power_service
+from routes.main import calculate_total_lamps
+
+
+def _rig():
+    return {
+        "spots_items": [
+            {"count": "10", "watt": "200", "model": "Spot", "mode": "16ch", "universe": "1", "address": "1"},
+            {"count": "x", "watt": "100"},
+        ],
+        "washes": "4",            # Altformat ohne *_items
+        "watt_washes": "1200,5",
+        "custom_devices": [{"count": "2", "name": "Hazer", "watt": "500"}],
+    }
+
+
+def test_build_columns_and_reductions():
+    fixture_table.clear_cache()
+    table = fixture_table.get_table(_rig())
+
+    # Altfelder der Washes sind als eigener Eintrag migriert (Watt pro Gerät)
+    assert table.keys == ["spots_0", "spots_1", "washes_0", "custom_0"]
+    assert list(table.count) == [10, 0, 4, 2]
+    assert list(table.load) == [2000.0, 0.0, 1200.5, 1000.0]
+    assert (table.patched[0], table.universe[0], table.address[0], table.footprint[0]) == (1, 1, 1, 16)
+    assert table.patched[3] == 0 and table.estimated[3] == 1
+
+    assert table.total_count() == 16
+    assert table.total_load() == 4200.5
+    assert table.count_by_category()["washes"] == 4
+    # Nur Einträge mit Anzahl > 0
+    assert list(table.rows()) == [0, 2, 3]
+
+
+def test_table_is_cached_per_rig_version():
+    rig = _rig()
+    table = fixture_table.get_table(rig)
+    assert fixture_table.get_table(_rig()) is table
+
+    rig["spots_items"][0]["count"] = "12"
+    changed = fixture_table.get_table(rig)
+    assert changed is not table
+    assert changed.total_count() == 18
+
+
+def test_source_item_points_into_given_rig():
+    first, second = _rig(), _rig()
+    table = fixture_table.get_table(first)
+    assert fixture_table.get_table(second) is table
+    assert table.source_item(second, 3) is second["custom_devices"][0]
+
+
+def test_consumers_agree_with_table():
+    rig = _rig()
+    assert calculate_total_lamps(rig) == 16
+    power_service.clear_cache()
+    assert power_service.calculate_rig_power(rig)["total_watt"] == 4200.5
+
+
+def test_api_get_rig_returns_groups(client, sample_show):
+    client.post('/login', data=dict(username="Admin", password="Admin123"))
+    sample_show["rig_setup"] = _rig()
+    data = client.get(f"/show/{sample_show['id']}/api/get_rig").get_json()
+    assert data["groups"] == [
+        {"category": "spots", "item_idx": 0, "count": 10},
+        {"category": "washes", "item_idx": 0, "count": 4},
+        {"category": "custom", "item_idx": 0, "count": 2},
+    ]
+
+
+def test_current_rig_is_cached_until_touched(monkeypatch):
+    from core import rig_model
+
+    rig = rig_model.upgrade(_rig())
+    table = fixture_table.get_table(rig)
+    # Zugriff ohne Durchlauf der Einträge
+    monkeypatch.setattr(fixture_table, "_rig_key", None)
+    assert fixture_table.get_table(rig) is table
+    power = power_service.calculate_rig_power(rig)
+    assert power_service.calculate_rig_power(rig) is power
+
+    rig["spots_items"][0]["count"] = 12
+    rig_model.touch(rig)
+    # Die alte Tabelle ist sofort aus dem Cache; pro Rig bleibt nichts zurück
+    assert all(t is not table for t in fixture_table._cache.values())
+    changed = fixture_table.get_table(rig)
+    assert changed is not table and changed.total_count() == 18
+    assert power_service.calculate_rig_power(rig)["total_watt"] == 4600.5
+
+
+def test_touch_during_build_does_not_cache_stale_table(monkeypatch):
+    from core import rig_model
+
+    rig = rig_model.upgrade(_rig())
+    build = fixture_table.build
+
+    def build_and_touch(*args, **kwargs):
+        table = build(*args, **kwargs)
+        rig["spots_items"][0]["count"] = 1
+        rig_model.touch(rig)
+        return table
+
+    monkeypatch.setattr(fixture_table, "build", build_and_touch)
+    stale = fixture_table.get_table(rig)
+    monkeypatch.setattr(fixture_table, "build", build)
+    fresh = fixture_table.get_table(rig)
+    assert fresh is not stale
+    assert fresh.total_count() == stale.total_count() - 9
@@ -0,0 +1,82 @@
+import os
+import threading
+import time
+
+from services import gdtf_api
+
+USER, PASSWORD = "stub-user", "stub-pass"
+
+
+def _age_catalog(seconds):
+    gdtf_api._fixtures_cache["timestamp"] = time.time() - seconds
+
+
+def test_cold_start_fetches_and_persists(gdtf_stub):
+    fixtures = gdtf_api._get_all_fixtures(USER, PASSWORD)
+
+    assert [f["fixture"] for f in fixtures] == ["MegaPointe", "MAC Aura XB"]
+    assert [r[0] for r in gdtf_stub.requests] == ["POST", "GET"]
+    assert os.path.exists(gdtf_api.CATALOG_FILE)
+    # Zugangsdaten landen nie in der Katalog-Datei
+    with open(gdtf_api.CATALOG_FILE, "rb") as f:
+        assert b"stub-pass" not in f.read()
+
+
+def test_restart_serves_catalog_from_disk_without_network(gdtf_stub):
+    gdtf_api._get_all_fixtures(USER, PASSWORD)
+    version = gdtf_api.catalog_version()
+    gdtf_api.clear_cache()  # wie ein Neustart
+    gdtf_stub.requests.clear()
+
+    assert gdtf_api.get_manufacturers(USER, PASSWORD) == ["Martin Professional", "Robe"]
+    assert gdtf_api.cached_dmx_footprint("Robe", "MegaPointe", "Standard") == 34
+    assert gdtf_api.catalog_version() == version
+    assert gdtf_stub.requests == []
+
+
+def test_stale_catalog_is_served_while_refreshing(gdtf_stub):
+    gdtf_api._get_all_fixtures(USER, PASSWORD)
+    _age_catalog(gdtf_api.CACHE_DURATION + 1)
+    stale_ts = gdtf_api._fixtures_cache["timestamp"]
+
+    gdtf_stub.delay = threading.Event()  # GDTF Share antwortet vorerst nicht
+    gdtf_stub.fixtures = gdtf_stub.fixtures + [{"manufacturer": "Ayrton", "fixture": "Khamsin", "modes": []}]
+    gdtf_stub.etag = '"v2"'
+
+    started = time.perf_counter()
+    fixtures = gdtf_api._get_all_fixtures(USER, PASSWORD)
+    assert time.perf_counter() - started < 0.5
+    assert len(fixtures) == 2  # alter Stand sofort
+
+    gdtf_stub.delay.set()
+    gdtf_api._refresh_thread.join(5)
+    assert gdtf_api._fixtures_cache["timestamp"] > stale_ts
+    assert len(gdtf_api._get_all_fixtures(USER, PASSWORD)) == 3
+    # Index zum neuen Katalog wurde schon im Hintergrund gebaut
+    assert gdtf_api._catalog_index.source is gdtf_api._get_all_fixtures(USER, PASSWORD)
+
+
+def test_refresh_is_conditional(gdtf_stub):
+    gdtf_api._get_all_fixtures(USER, PASSWORD)
+    data = gdtf_api._fixtures_cache["data"]
+    version = gdtf_api.catalog_version()
+    _age_catalog(gdtf_api.CACHE_DURATION + 1)
+
+    assert gdtf_api.refresh_catalog(USER, PASSWORD)
+    # 304: gleiche Liste (und Version), nur der Zeitstempel ist neu
+    assert gdtf_api._fixtures_cache["data"] is data
+    assert gdtf_api.catalog_version() == version
+    assert time.time() - gdtf_api._fixtures_cache["timestamp"] < 5
+
+
+def test_only_one_background_refresh_at_a_time(gdtf_stub):
+    gdtf_api._get_all_fixtures(USER, PASSWORD)
+    _age_catalog(gdtf_api.CACHE_DURATION + 1)
+    gdtf_stub.delay = threading.Event()
+    gdtf_stub.requests.clear()
+
+    first = gdtf_api.refresh_catalog_async(USER, PASSWORD)
+    assert gdtf_api.refresh_catalog_async(USER, PASSWORD) is first
+    gdtf_stub.delay.set()
+    first.join(5)
+    assert [r for r in gdtf_stub.requests if r[0] == "GET"] == [("GET", "/apis/public/getList.php")]
@@ -0,0 +1,80 @@
+import time
+
+import pytest
+
+from services import gdtf_api
+
+USER, PASSWORD = "stub-user", "stub-pass"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Client des Moduls ohne Wartezeiten beim Backoff."""
+    monkeypatch.setattr(gdtf_api._client, "backoff", 0)
+    return gdtf_api._client
+
+
+def _logins(stub):
+    return [r for r in stub.requests if r == ("POST", "/apis/public/login.php")]
+
+
+def test_session_is_reused_across_refreshes(gdtf_stub, client):
+    assert gdtf_api.refresh_catalog(USER, PASSWORD)
+    gdtf_api._fixtures_cache["timestamp"] = 0
+    assert gdtf_api.refresh_catalog(USER, PASSWORD)
+
+    assert len(_logins(gdtf_stub)) == 1
+    assert [r[0] for r in gdtf_stub.requests] == ["POST", "GET", "GET"]
+
+
+def test_expired_session_logs_in_again_once(gdtf_stub, client):
+    gdtf_api.refresh_catalog(USER, PASSWORD)
+    gdtf_api._fixtures_cache["timestamp"] = 0
+    gdtf_stub.expire = 1
+
+    assert gdtf_api.refresh_catalog(USER, PASSWORD)
+    assert len(_logins(gdtf_stub)) == 2
+
+    # Bleibt es bei 401, wird nicht endlos neu eingeloggt
+    gdtf_api._fixtures_cache["timestamp"] = 0
+    gdtf_stub.expire = 5
+    assert not gdtf_api.refresh_catalog(USER, PASSWORD)
+    assert len(_logins(gdtf_stub)) == 3
+
+
+def test_transient_errors_are_retried(gdtf_stub, client):
+    gdtf_stub.fail = 2  # zwei 503, dann Erfolg
+
+    assert len(gdtf_api._get_all_fixtures(USER, PASSWORD)) == 2
+    assert [r for r in gdtf_stub.requests if r[0] == "GET"] == [("GET", "/apis/public/getList.php")] * 3
+    assert not client.is_open()
+
+
+def test_circuit_breaker_serves_cached_catalog_while_service_is_down(gdtf_stub, client):
+    gdtf_api._get_all_fixtures(USER, PASSWORD)
+    gdtf_stub.fail = 1000
+    for _ in range(client.failure_threshold):
+        gdtf_api._fixtures_cache["timestamp"] = 0
+        assert not gdtf_api.refresh_catalog(USER, PASSWORD)
+    assert client.is_open()
+
+    gdtf_stub.requests.clear()
+    gdtf_api._fixtures_cache["timestamp"] = 0
+    started = time.perf_counter()
+    assert len(gdtf_api._get_all_fixtures(USER, PASSWORD)) == 2
+    gdtf_api._refresh_thread.join(5)
+    assert time.perf_counter() - started < 0.5
+    assert gdtf_stub.requests == []  # Breaker offen: keine Anfrage
+
+    # Nach der Pause geht ein Versuch durch und schließt den Breaker
+    gdtf_stub.fail = 0
+    client._open_until = 0
+    assert gdtf_api.refresh_catalog(USER, PASSWORD)
+    assert not client.is_open()
+
+
+def test_rejected_credentials_do_not_open_breaker(gdtf_stub, client):
+    gdtf_stub.reject_login = True
+    for _ in range(client.failure_threshold + 1):
+        assert not gdtf_api.refresh_catalog(USER, PASSWORD)
+    assert not client.is_open()
@@ -0,0 +1,88 @@
+import time
+
+from services import gdtf_api
+
+USER, PASSWORD = "stub-user", "stub-pass"
+
+CATALOG = [
+    {"manufacturer": "JB Lighting GmbH", "fixture": "Sparx 7", "rid": 1,
+     "modes": [{"0": {"name": "Mode 1", "dmxfootprint": 20}}]},
+    {"manufacturer": "Astera LED Technology", "fixture": "Titan Tube", "rid": 2,
+     "modes": [{"0": {"name": "16bit RGBAW", "dmxfootprint": 10}}]},
+    {"manufacturer": "Robe", "fixture": "Spiider", "rid": 3,
+     "modes": [{"0": {"name": "Mode 1", "dmxfootprint": 27}}]},
+    {"manufacturer": "Robe", "fixture": "MegaPointe", "rid": 4,
+     "modes": [{"0": {"name": "Standard", "dmxfootprint": 34}}, {"1": ["Basic", 20]}]},
+    {"manufacturer": "Robe Lighting", "fixture": "megapointe", "rid": 5, "modes": []},
+]
+
+
+def _use_catalog(data):
+    """Katalog direkt in den Speicher legen (frisch -> kein Netzwerk)."""
+    gdtf_api._fixtures_cache.update(data=data, timestamp=time.time(), disk_checked=True)
+
+
+def test_manufacturer_lookup_matches_word_starts():
+    _use_catalog(CATALOG)
+
+    assert [f["rid"] for f in gdtf_api.get_fixtures_by_manufacturer(USER, PASSWORD, "Robe")] == [4, 5, 3]
+    assert [f["rid"] for f in gdtf_api.get_fixtures_by_manufacturer(USER, PASSWORD, "JB-Lighting")] == [1]
+    assert [f["rid"] for f in gdtf_api.get_fixtures_by_manufacturer(USER, PASSWORD, "led")] == [2]
+    # Kein Wortanfang passt -> Suche mitten im Namen
+    assert [f["rid"] for f in gdtf_api.get_fixtures_by_manufacturer(USER, PASSWORD, "stera")] == [2]
+    assert gdtf_api.get_fixtures_by_manufacturer(USER, PASSWORD, "Ayrton") == []
+
+    assert gdtf_api.get_manufacturers(USER, PASSWORD) == [
+        "Astera LED Technology", "JB Lighting GmbH", "Robe", "Robe Lighting"]
+    assert gdtf_api.get_model_names_by_manufacturer(USER, PASSWORD, "robe") == [
+        "MegaPointe", "Spiider", "megapointe"]
+
+
+def test_modes_lookup_uses_first_catalog_match():
+    _use_catalog(CATALOG)
+
+    assert gdtf_api.get_modes_for_fixture(USER, PASSWORD, "Robe", "MEGAPOINTE") == [
+        {"name": "Standard", "dmx_footprint": 34}, {"name": "Basic", "dmx_footprint": 20}]
+    assert gdtf_api.get_modes_for_fixture(USER, PASSWORD, "Robe Lighting", "MegaPointe") == []
+    assert gdtf_api.get_modes_for_fixture(USER, PASSWORD, "Astera", "MegaPointe") == []
+    assert gdtf_api.cached_dmx_footprint("robe", "megapointe", "basic") == 20
+
+
+def test_index_is_built_once_per_catalog_and_results_are_memoised():
+    _use_catalog(CATALOG)
+    first = gdtf_api.get_fixtures_by_manufacturer(USER, PASSWORD, "Robe")
+    index = gdtf_api._catalog_index
+
+    assert gdtf_api.get_fixtures_by_manufacturer(USER, PASSWORD, "Robe") is first
+    gdtf_api.cached_dmx_footprint("Robe", "Spiider", "Mode 1")
+    assert gdtf_api._catalog_index is index
+
+    # Neuer Katalog -> neuer Index
+    _use_catalog(CATALOG[:2])
+    assert gdtf_api.get_fixtures_by_manufacturer(USER, PASSWORD, "Robe") == []
+    assert gdtf_api._catalog_index is not index
+
+
+def test_index_is_built_by_one_thread_under_concurrent_requests(monkeypatch):
+    import threading
+
+    built = []
+    original = gdtf_api._CatalogIndex
+
+    class SlowIndex(original):
+        def __init__(self, data):
+            built.append(data)
+            time.sleep(0.05)
+            super().__init__(data)
+
+    monkeypatch.setattr(gdtf_api, "_CatalogIndex", SlowIndex)
+    _use_catalog(list(CATALOG))
+    threads = [
+        threading.Thread(target=gdtf_api.get_fixtures_by_manufacturer, args=(USER, PASSWORD, q))
+        for q in ("Robe", "JB", "Astera", "Robe")
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert len(built) == 1
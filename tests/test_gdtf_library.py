@@ -0,0 +1,140 @@
+import shutil
+import zipfile
+import xml.etree.ElementTree as ET
+
+from services import gdtf_api, gdtf_library, patch_service
+from services.exporters import mvr_export
+
+DESCRIPTION = """<?xml version="1.0" encoding="UTF-8"?>
+<GDTF DataVersion="1.2">
+  <FixtureType Name="{name}" ShortName="{name}" Manufacturer="{manufacturer}" FixtureTypeID="ID-{name}">
+    <PhysicalDescriptions>
+      <Properties>
+        <Weight Value="24.5"/>
+        <PowerConsumption Name="Default" Value="670"/>
+      </Properties>
+    </PhysicalDescriptions>
+    <Models>
+      <Model Name="Body" Length="0.35" Width="0.4" Height="0.63"/>
+    </Models>
+    <Geometries>
+      <Geometry Name="Body" Model="Body">
+        <GeometryReference Name="Pixel 1" Geometry="Pixel"><Break DMXOffset="10" DMXBreak="1"/></GeometryReference>
+        <GeometryReference Name="Pixel 2" Geometry="Pixel"><Break DMXOffset="13" DMXBreak="1"/></GeometryReference>
+      </Geometry>
+      <Geometry Name="Pixel"/>
+    </Geometries>
+    <DMXModes>
+      <DMXMode Name="Standard" Geometry="Body">
+        <DMXChannels>
+          <DMXChannel Offset="1,2" Geometry="Body"/>
+          <DMXChannel Offset="3" Geometry="Body"/>
+          <DMXChannel Offset="None" Geometry="Body"/>
+        </DMXChannels>
+      </DMXMode>
+      <DMXMode Name="Pixel" Geometry="Body">
+        <DMXChannels>
+          <DMXChannel Offset="1,2" Geometry="Body"/>
+          <DMXChannel DMXBreak="Overwrite" Offset="1,2,3" Geometry="Pixel"/>
+        </DMXChannels>
+      </DMXMode>
+    </DMXModes>
+    <Revisions><Revision Date="2024-01-01" Text="v1.1"/></Revisions>
+  </FixtureType>
+</GDTF>
+"""
+
+
+def _write_gdtf(path, manufacturer="Robe Lighting", name="MegaPointe"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("description.xml", DESCRIPTION.format(manufacturer=manufacturer, name=name))
+    return path
+
+
+def test_parse_gdtf_reads_modes_power_and_dimensions(tmp_path):
+    entry = gdtf_library.parse_gdtf(str(_write_gdtf(tmp_path / "a.gdtf")))
+
+    assert (entry["manufacturer"], entry["fixture"], entry["revision"]) == ("Robe Lighting", "MegaPointe", "v1.1")
+    assert entry["modes"] == [{"0": {"name": "Standard", "dmxfootprint": 3}},
+                              {"1": {"name": "Pixel", "dmxfootprint": 15}}]
+    assert (entry["power"], entry["weight"]) == (670, 24.5)
+    assert entry["dimensions"] == {"length": 350, "width": 400, "height": 630}
+
+    (tmp_path / "broken.gdtf").write_bytes(b"kein zip")
+    assert "error" in gdtf_library.parse_gdtf(str(tmp_path / "broken.gdtf"))
+
+
+def test_ingest_reuses_hashed_results():
+    library = gdtf_library.LIBRARY_DIR
+    _write_gdtf(library / "robe.gdtf")
+    _write_gdtf(library / "martin" / "aura.gdtf", "Martin Professional", "MAC Aura")
+
+    assert gdtf_library.ingest() == {"files": 2, "parsed": 2, "cached": 0, "failed": 0}
+    assert gdtf_library.ingest()["parsed"] == 0
+
+    # Gleicher Inhalt unter neuem Namen -> aus dem Hash-Cache
+    shutil.copy(library / "robe.gdtf", library / "robe-copy.gdtf")
+    assert gdtf_library.ingest() == {"files": 3, "parsed": 0, "cached": 3, "failed": 0}
+
+    # Neuer Prozess: Index von der Platte
+    gdtf_library.clear_cache()
+    assert gdtf_library.ingest()["parsed"] == 0
+    assert gdtf_library.find("martin professional", "mac aura")["file"] == "martin/aura.gdtf"
+
+
+def test_ingest_parses_many_files_in_pool(monkeypatch):
+    monkeypatch.setattr(gdtf_library, "POOL_MIN_FILES", 4)
+    for i in range(6):
+        _write_gdtf(gdtf_library.LIBRARY_DIR / f"f{i}.gdtf", "Acme", f"Spot {i}")
+
+    assert gdtf_library.ingest(workers=2) == {"files": 6, "parsed": 6, "cached": 0, "failed": 0}
+    assert [e["fixture"] for e in gdtf_library.entries()] == [f"Spot {i}" for i in range(6)]
+
+
+def test_new_files_in_subfolders_are_ingested_in_background():
+    library = gdtf_library.LIBRARY_DIR
+    _write_gdtf(library / "robe" / "MegaPointe.gdtf")
+    gdtf_library.ingest()
+    first = gdtf_library.entries()
+    gdtf_library.refresh_async().join(5)
+    assert gdtf_library.entries() is first  # unverändert -> kein neues Einlesen
+
+    _write_gdtf(library / "robe" / "Spiider.gdtf", "Robe Lighting", "Spiider")
+    gdtf_library._state["checked_at"] = 0.0
+    # Der Zugriff wartet nicht auf das (hier blockierte) Einlesen, sondern liefert den bisherigen Stand
+    with gdtf_library._lock:
+        assert gdtf_library.entries() is first
+    gdtf_library._refresh_thread.join(5)
+    assert [e["fixture"] for e in gdtf_library.entries()] == ["MegaPointe", "Spiider"]
+
+
+def test_library_works_offline_without_credentials(client):
+    _write_gdtf(gdtf_library.LIBRARY_DIR / "robe.gdtf")
+    gdtf_library.ingest()
+    client.post('/login', data=dict(username="Admin", password="Admin123"))
+
+    data = client.get('/api/gdtf/fixtures/Robe').get_json()
+    assert data["models"] == ["MegaPointe"]
+    modes = client.get('/api/gdtf/modes/Robe Lighting/MegaPointe').get_json()["modes"]
+    assert [m["dmx_footprint"] for m in modes] == [3, 15]
+    assert gdtf_api.catalog_version().startswith("local-")
+
+    item = {"manufacturer": "Robe Lighting", "model": "MegaPointe", "mode": "Pixel"}
+    assert patch_service.resolve_footprint(item) == (15, False)
+
+
+def test_mvr_export_embeds_library_files(tmp_path):
+    _write_gdtf(gdtf_library.LIBRARY_DIR / "robe" / "MegaPointe.gdtf")
+    gdtf_library.ingest()
+    show = {"name": "Offline", "rig_setup": {"spots_items": [
+        {"count": "2", "manufacturer": "Robe Lighting", "model": "MegaPointe", "mode": "pixel"}],
+        "washes_items": [{"count": "1", "manufacturer": "Martin", "model": "Aura"}]}}
+
+    path = mvr_export.export_mvr_to_file(show, export_dir=tmp_path / "out")
+    with zipfile.ZipFile(path) as zf:
+        assert sorted(zf.namelist()) == ["GeneralSceneDescription.xml", "MegaPointe.gdtf"]
+        root = ET.fromstring(zf.read("GeneralSceneDescription.xml"))
+    fixtures = root.findall(".//mvr:Fixture", {"mvr": mvr_export.MVR_NAMESPACE})
+    assert [(f.get("gdtfSpec"), f.get("gdtfMode")) for f in fixtures] == [
+        ("MegaPointe.gdtf", "Pixel"), ("MegaPointe.gdtf", "Pixel"), ("Martin Aura.gdtf", "")]
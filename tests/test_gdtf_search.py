@@ -0,0 +1,97 @@
+import gzip
+import json
+import time
+
+from services import gdtf_api, gdtf_search
+
+USER, PASSWORD = "stub-user", "stub-pass"
+
+CATALOG = [
+    {"manufacturer": "Robe Lighting", "fixture": "MegaPointe", "rid": 10, "rating": "4", "revision": "v1",
+     "modes": [{"0": {"name": "Standard", "dmxfootprint": 34}}]},
+    {"manufacturer": "Robe Lighting", "fixture": "MegaPointe", "rid": 11, "rating": "4", "revision": "v2",
+     "modes": [{"0": {"name": "Standard", "dmxfootprint": 39}}]},
+    {"manufacturer": "Robe Lighting", "fixture": "Pointe", "rid": 12, "rating": "5", "modes": []},
+    {"manufacturer": "Martin Professional", "fixture": "MAC Aura XB", "rid": 20, "rating": "3", "modes": []},
+    {"manufacturer": "Martin Professional", "fixture": "MAC Aura", "rid": 21, "rating": "5", "modes": []},
+    {"manufacturer": "Ayrton", "fixture": "Khamsin", "rid": 30, "modes": []},
+]
+
+
+def _use_catalog(data):
+    gdtf_api._fixtures_cache.update(data=data, timestamp=time.time(), disk_checked=True)
+
+
+def _names(results):
+    return [(r["manufacturer"], r["fixture"]) for r in results]
+
+
+def test_search_across_manufacturer_and_model_with_typos():
+    _use_catalog(CATALOG)
+
+    top = gdtf_search.search_fixtures(USER, PASSWORD, "robe megapointe")[0]
+    # Zwei Revisionen -> eine Zeile, die neueste
+    assert (top["fixture"], top["revision"], top["modes"][0]["dmx_footprint"]) == ("MegaPointe", "v2", 39)
+    assert _names(gdtf_search.search_fixtures(USER, PASSWORD, "mac aura xb"))[0] == (
+        "Martin Professional", "MAC Aura XB")
+    assert _names(gdtf_search.search_fixtures(USER, PASSWORD, "megapionte"))[0] == (
+        "Robe Lighting", "MegaPointe")
+    assert _names(gdtf_search.search_fixtures(USER, PASSWORD, "khamsn")) == [("Ayrton", "Khamsin")]
+    assert gdtf_search.search_fixtures(USER, PASSWORD, "x") == []
+
+
+def test_search_ranks_equal_matches_by_rating_and_handles_partial_words():
+    _use_catalog(CATALOG)
+
+    # Beide enthalten "mac aura" vollständig -> höhere Bewertung zuerst
+    assert _names(gdtf_search.search_fixtures(USER, PASSWORD, "mac aura ", limit=2)) == [
+        ("Martin Professional", "MAC Aura"), ("Martin Professional", "MAC Aura XB")]
+    # Unvollständiges letztes Wort beim Tippen
+    assert _names(gdtf_search.search_fixtures(USER, PASSWORD, "robe megap", limit=1)) == [
+        ("Robe Lighting", "MegaPointe")]
+
+
+def test_search_results_are_cached_per_query_and_catalog():
+    _use_catalog(CATALOG)
+    first = gdtf_search.search_fixtures(USER, PASSWORD, "pointe")
+    assert gdtf_search.search_fixtures(USER, PASSWORD, "Pointe") is first
+
+    _use_catalog(CATALOG[3:])
+    assert gdtf_search.search_fixtures(USER, PASSWORD, "pointe") == []
+
+
+def test_search_route(client):
+    _use_catalog(CATALOG)
+    client.post('/login', data=dict(username="Admin", password="Admin123"))
+    assert client.get('/api/gdtf/search?q=robe').status_code == 400
+
+    with client.session_transaction() as sess:
+        sess['gdtf_user'], sess['gdtf_password'] = USER, PASSWORD
+    data = client.get('/api/gdtf/search?q=aura&limit=1').get_json()
+    assert data['count'] == 1 and data['results'][0]['fixture'] == "MAC Aura"
+
+
+def test_catalog_endpoints_are_slim_cached_and_gzipped(client):
+    _use_catalog([dict(CATALOG[0], fixture=f"Fixture {i}") for i in range(200)])
+    client.post('/login', data=dict(username="Admin", password="Admin123"))
+    with client.session_transaction() as sess:
+        sess['gdtf_user'], sess['gdtf_password'] = USER, PASSWORD
+
+    response = client.get('/api/gdtf/fixtures/Robe', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'private' in response.headers['Cache-Control']
+    data = json.loads(gzip.decompress(response.data))
+    assert data['count'] == 200 and 'fixtures' not in data
+
+    # Gleiche Katalog-Version -> 304 ohne Inhalt
+    etag = response.headers['ETag']
+    again = client.get('/api/gdtf/fixtures/Robe', headers={'If-None-Match': etag})
+    assert again.status_code == 304 and again.data == b""
+    modes = client.get('/api/gdtf/modes/Robe/Fixture 3', headers={'If-None-Match': etag})
+    assert modes.status_code == 304
+
+    # Neuer Katalog -> neuer ETag
+    gdtf_api._fixtures_cache["changed_at"] = time.time()
+    fresh = client.get('/api/gdtf/modes/Robe/Fixture 3', headers={'If-None-Match': etag})
+    assert fresh.status_code == 200 and fresh.headers['ETag'] != etag
+    assert fresh.get_json()['modes'] == [{"name": "Standard", "dmx_footprint": 34}]
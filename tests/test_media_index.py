@@ -0,0 +1,121 @@
+import pytest
+
+from core import show_logic
+from services import media_index
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    monkeypatch.setattr(show_logic, "DATA_FILE", str(tmp_path / "shows.json"))
+    monkeypatch.setattr(media_index, "_index", None)
+    media_dir = tmp_path / "props"
+    media_dir.mkdir()
+    return media_dir
+
+
+def _show(show_id, show_images=(), song_images=()):
+    return {
+        "id": show_id,
+        "prop_images": list(show_images),
+        "songs": [{"id": 100 + show_id, "prop_images": list(song_images)}],
+        "videos": [],
+    }
+
+
+def test_refs_follow_show_changes(index):
+    a = _show(1, ["logo.png"], ["stage.jpg"])
+    b = _show(2, ["logo.png"])
+    media_index.sync_shows([a, b])
+
+    idx = media_index.get_index()
+    assert sorted(idx.references("props", "logo.png")) == ["show:1", "show:2"]
+    assert idx.references("props", "stage.jpg") == ["song:1:101"]
+    assert not idx.orphans
+
+    # Show 1 gelöscht -> stage.jpg verwaist, logo.png hängt noch an Show 2
+    media_index.sync_shows([b])
+    assert media_index.ref_count("props", "logo.png") == 1
+    assert list(idx.orphans) == ["props/stage.jpg"]
+
+
+def test_gc_deletes_only_indexed_orphans(index):
+    for name in ("kept.png", "orphan.png", "unknown.png"):
+        (index / name).write_bytes(b"x")
+    media_index.register("props", "kept.png")
+    media_index.register("props", "orphan.png")  # Upload, Show nie gespeichert
+    media_index.sync_shows([_show(1, ["kept.png"])])
+
+    # Innerhalb der Schonfrist passiert nichts
+    assert media_index.collect_garbage({"props": index}) == []
+
+    removed = media_index.collect_garbage({"props": index}, grace=0)
+    assert removed == ["props/orphan.png"]
+    assert sorted(p.name for p in index.iterdir()) == ["kept.png", "unknown.png"]
+    assert "props/orphan.png" not in media_index.get_index().files
+
+
+def test_gc_limit_and_persistence(index, monkeypatch):
+    for n in range(3):
+        (index / f"{n}.png").write_bytes(b"x")
+        media_index.register("props", f"{n}.png")
+
+    assert len(media_index.collect_garbage({"props": index}, grace=0, limit=2)) == 2
+
+    # Neu laden: verbleibende verwaiste Datei kommt aus der Index-Datei
+    monkeypatch.setattr(media_index, "_index", None)
+    assert list(media_index.get_index().orphans) == ["props/2.png"]
+    assert media_index.collect_garbage({"props": index}, grace=0) == ["props/2.png"]
+    assert not list(index.iterdir())
+
+
+def test_save_data_updates_index(client, sample_show, tmp_path, monkeypatch):
+    monkeypatch.setattr(media_index, "MEDIA_DIRS", {"props": tmp_path})
+    sample_show["prop_images"] = ["abc.png"]
+    show_logic.save_data()
+    assert media_index.get_index().references("props", "abc.png") == [f"show:{sample_show['id']}"]
+
+    client.post(f"/show/{sample_show['id']}/delete")
+    # Referenz weg; die Datei selbst räumt der GC-Lauf nach dem Löschen ab
+    assert media_index.ref_count("props", "abc.png") == 0
+
+
+def test_reupload_of_orphan_restarts_grace_period(index):
+    (index / "logo.png").write_bytes(b"x")
+    media_index.register("props", "logo.png")
+    idx = media_index.get_index()
+    idx.orphans["props/logo.png"] = idx.files["props/logo.png"]["orphan_since"] = 0.0
+
+    # Dedup-Upload derselben Datei, die Show ist noch nicht gespeichert
+    media_index.register("props", "logo.png")
+    assert media_index.collect_garbage({"props": index}) == []
+    assert (index / "logo.png").exists()
+
+
+def test_delete_show_removes_its_unshared_media(client, index, monkeypatch):
+    monkeypatch.setattr(media_index, "MEDIA_DIRS", {"props": index})
+    futures = []
+    schedule = media_index.schedule_garbage_collection
+    monkeypatch.setattr(
+        media_index, "schedule_garbage_collection", lambda *a, **kw: futures.append(schedule(*a, **kw))
+    )
+    for name in ("own.png", "shared.png"):
+        (index / name).write_bytes(b"x")
+    doomed = _show(1, ["own.png", "shared.png"])
+    show_logic.shows = [doomed, _show(2, ["shared.png"])]
+    show_logic.save_data()
+
+    client.post("/show/1/delete")
+    assert [f.result(timeout=5) for f in futures] == [["props/own.png"]]
+    assert sorted(p.name for p in index.iterdir()) == ["shared.png"]
+
+
+def test_save_after_grace_period_schedules_gc(index, monkeypatch):
+    calls = []
+    monkeypatch.setattr(media_index, "schedule_garbage_collection", lambda *a, **kw: calls.append(kw))
+    media_index.register("props", "fresh.png")
+    media_index.sync_shows([])
+    assert calls == []
+
+    media_index.get_index().orphans["props/fresh.png"] = 0.0
+    media_index.sync_shows([])
+    assert calls == [{}]
@@ -0,0 +1,122 @@
+import hashlib
+import os
+import time
+
+from PIL import Image
+
+from services import media_service
+
+
+def test_generate_derivatives_keeps_original(tmp_path):
+    original = tmp_path / "1_abcdef12.png"
+    Image.new("RGB", (4000, 3000), (10, 120, 200)).save(original)
+
+    result = media_service.generate_derivatives(original)
+
+    assert set(result) == {"thumb", "medium"}
+    assert result["thumb"].name == "1_abcdef12.thumb.jpg"
+    with Image.open(result["thumb"]) as thumb:
+        assert max(thumb.size) == media_service.VARIANTS["thumb"]
+    with Image.open(result["medium"]) as medium:
+        assert max(medium.size) == media_service.VARIANTS["medium"]
+    with Image.open(original) as img:
+        assert img.size == (4000, 3000)
+
+
+def test_variant_filename_falls_back_and_backfills(tmp_path):
+    original = tmp_path / "2_abcdef12.jpg"
+    Image.new("RGB", (800, 600)).save(original)
+
+    # Noch keine Ableitung -> Original, Erzeugung wird eingeplant
+    assert media_service.variant_filename(tmp_path, original.name, "thumb") == original.name
+    deadline = time.time() + 5
+    while media_service._pending and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert media_service.variant_filename(tmp_path, original.name, "thumb") == "2_abcdef12.thumb.jpg"
+    assert media_service.variant_filename(tmp_path, original.name, "original") == original.name
+
+
+def test_delete_with_derivatives(tmp_path):
+    original = tmp_path / "3_abcdef12.png"
+    Image.new("RGB", (100, 100)).save(original)
+    media_service.generate_derivatives(original)
+
+    media_service.delete_with_derivatives(original)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_invalid_image_is_ignored(tmp_path):
+    broken = tmp_path / "4_abcdef12.png"
+    broken.write_bytes(b"not an image")
+    assert media_service.generate_derivatives(broken) == {}
+
+
+def test_broken_original_is_not_rescheduled_until_it_changes(tmp_path):
+    broken = tmp_path / "5_abcdef12.png"
+    broken.write_bytes(b"not an image")
+
+    media_service.schedule_derivatives(broken).result(timeout=5)
+    # Gleicher Stand -> kein neuer Dekodier-Versuch pro Seitenaufruf
+    assert media_service.schedule_derivatives(broken) is None
+    assert media_service.variant_filename(tmp_path, broken.name, "thumb") == broken.name
+    assert str(broken) not in media_service._pending
+
+    # Ersetzt (neue mtime) -> wird wieder eingeplant
+    Image.new("RGB", (400, 300)).save(broken)
+    os.utime(broken, ns=(time.time_ns(), time.time_ns() + 10**9))
+    assert set(media_service.schedule_derivatives(broken).result(timeout=5)) == {"thumb", "medium"}
+    # Keine Temp-Dateien zurückgelassen
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "5_abcdef12.medium.jpg", "5_abcdef12.png", "5_abcdef12.thumb.jpg"
+    ]
+
+
+def test_serve_media_range_and_conditional(client, tmp_path, monkeypatch):
+    from routes import show_assets
+
+    monkeypatch.setattr(show_assets, "_videos_dir", lambda: tmp_path)
+    payload = bytes(range(256)) * 400
+    (tmp_path / "1_abcdef12.mp4").write_bytes(payload)
+    url = "/media/videos/1_abcdef12.mp4"
+
+    full = client.get(url)
+    assert full.status_code == 200
+    assert full.data == payload
+    assert full.headers["Accept-Ranges"] == "bytes"
+    assert "immutable" in full.headers["Cache-Control"]
+    assert "max-age=31536000" in full.headers["Cache-Control"]
+    etag = full.headers["ETag"]
+    assert etag.strip('"') == hashlib.sha256(payload).hexdigest()
+
+    part = client.get(url, headers={"Range": "bytes=1000-1999"})
+    assert part.status_code == 206
+    assert part.data == payload[1000:2000]
+    assert part.headers["Content-Range"] == f"bytes 1000-1999/{len(payload)}"
+
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    # If-Range mit passendem ETag -> Teilinhalt, mit veraltetem -> komplette Datei
+    assert client.get(url, headers={"Range": "bytes=0-9", "If-Range": etag}).status_code == 206
+    assert client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"veraltet"'}).status_code == 200
+
+
+def test_content_etag_uses_hashed_name_and_bounds_fallback_cache(tmp_path, monkeypatch):
+    # Inhaltsadressierter Name -> Hash aus dem Upload, Datei wird nicht gelesen
+    digest = hashlib.sha256(b"video").hexdigest()
+    hashed = tmp_path / f"{digest[:32]}.mp4"
+    hashed.write_bytes(b"video")
+    monkeypatch.setattr("builtins.open", None)
+    assert media_service.content_etag(hashed) == digest[:32]
+    monkeypatch.undo()
+
+    monkeypatch.setattr(media_service, "ETAG_CACHE_SIZE", 2)
+    for n in range(4):
+        legacy = tmp_path / f"{n}_abcdef12.mp4"
+        legacy.write_bytes(bytes([n]) * 10)
+        assert media_service.content_etag(legacy) == hashlib.sha256(bytes([n]) * 10).hexdigest()
+    assert len(media_service._etag_cache) <= 2
+
+
+def test_serve_media_rejects_unknown_paths(client):
+    assert client.get("/media/videos/../app.py").status_code == 404
+    assert client.get("/media/secrets/x.png").status_code == 404
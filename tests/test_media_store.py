@@ -0,0 +1,91 @@
+import io
+
+import pytest
+from PIL import Image
+
+from core import show_logic
+from routes import show_assets
+from services import media_index, media_store
+
+
+@pytest.fixture
+def props_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(show_assets, "_props_dir", lambda: tmp_path)
+    return tmp_path
+
+
+def _png_bytes(color=(200, 30, 30)):
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 64), color).save(buf, "PNG")
+    return buf.getvalue()
+
+
+def _upload(client, show_id, data, name="logo.png"):
+    return client.post(
+        f"/show/{show_id}/upload_prop_image",
+        data={"prop_image": (io.BytesIO(data), name)},
+        content_type="multipart/form-data",
+    )
+
+
+def _originals(directory):
+    return sorted(p.name for p in directory.iterdir() if not media_store.media_service.is_derivative(p.name))
+
+
+def test_same_image_is_stored_once(client, props_dir):
+    a = show_logic.create_default_show("Tour A", "", "", "", "", "")
+    b = show_logic.create_default_show("Tour B", "", "", "", "", "")
+    show_logic.shows.extend([a, b])
+    logo = _png_bytes()
+
+    _upload(client, a["id"], logo)
+    _upload(client, b["id"], logo, name="logo_kopie.png")
+    _upload(client, a["id"], logo)  # doppelt in derselben Show -> nur eine Referenz
+
+    assert len(_originals(props_dir)) == 1
+    assert a["prop_images"] == b["prop_images"]
+    fname = a["prop_images"][0]
+
+    # Erste Referenz entfernen: Datei bleibt
+    client.post(f"/show/{a['id']}/delete_prop_image/{fname}")
+    assert (props_dir / fname).exists()
+
+    # Letzte Referenz entfernen: Datei weg
+    client.post(f"/show/{b['id']}/delete_prop_image/{fname}")
+    assert not (props_dir / fname).exists()
+
+
+def test_duplicated_show_keeps_shared_file(client, props_dir, monkeypatch):
+    monkeypatch.setattr(show_logic, "sync_entire_show_to_db", lambda show: None)
+    show = show_logic.create_default_show("Tour", "", "", "", "", "")
+    show_logic.shows.append(show)
+    _upload(client, show["id"], _png_bytes((0, 0, 255)))
+    fname = show["prop_images"][0]
+
+    copy = show_logic.duplicate_show(show["id"])
+    client.post(f"/show/{copy['id']}/delete_prop_image/{fname}")
+
+    assert (props_dir / fname).exists()
+    assert media_store.reference_counts()[("props", fname)] == 1
+    assert media_index.ref_count("props", fname) == 1
+
+
+def test_store_file_discards_duplicate_content(tmp_path, monkeypatch):
+    monkeypatch.setattr(show_logic, "DATA_FILE", str(tmp_path / "shows.json"))
+    monkeypatch.setattr(media_index, "_index", None)
+    target = tmp_path / "videos"
+    first = tmp_path / "a.part"
+    second = tmp_path / "b.part"
+    first.write_bytes(b"same video")
+    second.write_bytes(b"same video")
+
+    name1, created1 = media_store.store_file(first, "videos", target, "MP4")
+    name2, created2 = media_store.store_file(second, "videos", target, "mp4")
+
+    assert name1 == name2
+    assert created1 and not created2
+    assert name1.endswith(".mp4")
+    assert not second.exists()
+    assert [p.name for p in target.iterdir()] == [name1]
+    # Unreferenziert im Index -> Kandidat für die GC
+    assert f"videos/{name1}" in media_index.get_index().orphans
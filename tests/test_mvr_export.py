@@ -0,0 +1,87 @@
+import zipfile
+import xml.etree.ElementTree as ET
+
+from services.exporters import mvr_export
+
+NS = {"mvr": mvr_export.MVR_NAMESPACE}
+
+
+def _read_scene(path):
+    with zipfile.ZipFile(path) as zf:
+        return ET.fromstring(zf.read("GeneralSceneDescription.xml"))
+
+
+def test_mvr_export_streams_all_fixtures(tmp_path):
+    show = {
+        "name": "Festival",
+        "rig_setup": {
+            "spots_items": [{"count": "1500", "manufacturer": "Robe", "model": "MegaPointe",
+                             "mode": "Standard", "universe": "1", "address": "1"}],
+            "washes_items": [{"count": "600", "model": "Aura XB"}],
+            "custom_devices": [{"count": "2", "name": "Hazer"}],
+        },
+    }
+    path = mvr_export.export_mvr_to_file(show, export_dir=tmp_path)
+    root = _read_scene(path)
+
+    fixtures = root.findall(".//mvr:Fixture", NS)
+    assert len(fixtures) == 2102
+    assert fixtures[0].get("name") == "MegaPointe 1"
+    assert fixtures[0].get("gdtfSpec") == "Robe MegaPointe.gdtf"
+    assert fixtures[0].find("mvr:Addresses/mvr:Address", NS).get("universe") == "1"
+    assert fixtures[1500].get("name") == "Aura XB 1"
+    assert fixtures[1500].find("mvr:Addresses", NS) is None
+    assert fixtures[-1].get("name") == "Hazer"
+
+    # X-Position aus der Fixture-ID, Custom Devices mit Y-Versatz
+    matrix = fixtures[-1].find("mvr:Matrix", NS).text.split()
+    assert matrix[12:14] == ["2101000.000000", "2000.000000"]
+
+
+def test_mvr_export_escapes_names(tmp_path):
+    show = {"name": "Esc", "rig_setup": {"spots_items": [{"count": "1", "model": 'A & "B" <C>'}]}}
+    root = _read_scene(mvr_export.export_mvr_to_file(show, export_dir=tmp_path))
+    assert root.find(".//mvr:Fixture", NS).get("name") == 'A & "B" <C> 1'
+
+
+def _plan_show():
+    return {
+        "id": 7,
+        "name": "Plan",
+        "rig_setup": {
+            "spots_items": [{"count": "2", "model": "Spot"}],
+            "visual_plan": {"spots_0_1": {"x": 120, "y": 40, "rotation": 90}},
+        },
+    }
+
+
+def test_mvr_export_uses_visual_plan_and_stable_uuids(tmp_path):
+    show = _plan_show()
+    first = _read_scene(mvr_export.export_mvr_to_file(show, export_dir=tmp_path))
+    second = _read_scene(mvr_export.export_mvr_to_file(show, export_dir=tmp_path))
+
+    uuids = [f.get("uuid") for f in first.findall(".//mvr:Fixture", NS)]
+    assert uuids == [f.get("uuid") for f in second.findall(".//mvr:Fixture", NS)]
+    assert uuids[0] == mvr_export.fixture_uuid(7, "spots_0_0")
+    assert len(set(uuids)) == 2
+    assert not uuids[0].startswith("00000000")
+
+    # Nicht platziert -> Aufreihung, platziert -> Position aus dem Rig-Editor (px -> mm)
+    unplaced, placed = [f.find("mvr:Matrix", NS).text.split() for f in first.findall(".//mvr:Fixture", NS)]
+    assert unplaced[12:14] == ["0.000000", "0.000000"]
+    assert placed[12:14] == ["1200.000000", "-400.000000"]
+    assert placed[0:2] == ["0.000000", "-1.000000"]
+
+
+def test_mvr_incremental_export_only_emits_changed_fixtures(tmp_path):
+    show = _plan_show()
+    mvr_export.export_mvr_to_file(show, export_dir=tmp_path)
+
+    path = mvr_export.export_mvr_to_file(show, export_dir=tmp_path, incremental=True)
+    assert path.name == "Plan_update.mvr"
+    assert _read_scene(path).findall(".//mvr:Fixture", NS) == []
+
+    show["rig_setup"]["visual_plan"]["spots_0_0"] = {"x": 10, "y": 10, "rotation": 0}
+    changed = _read_scene(mvr_export.export_mvr_to_file(show, export_dir=tmp_path, incremental=True))
+    fixtures = changed.findall(".//mvr:Fixture", NS)
+    assert [f.get("uuid") for f in fixtures] == [mvr_export.fixture_uuid(7, "spots_0_0")]
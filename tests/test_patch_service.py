@@ -0,0 +1,122 @@
+import zipfile
+import xml.etree.ElementTree as ET
+
+from core import show_logic
+from services import patch_service
+from services.exporters import mvr_export
+
+
+def test_footprint_from_mode_name_and_default():
+    assert patch_service.resolve_footprint({"mode": "Standard 16ch"}) == (16, False)
+    assert patch_service.resolve_footprint({"mode": "Mode 2 - 24 Kanäle"}) == (24, False)
+    assert patch_service.resolve_footprint({"mode": "Basic", "dmx_footprint": "7"}) == (7, False)
+    assert patch_service.resolve_footprint({"mode": "Basic"}) == (1, True)
+
+
+def test_parse_start_accepts_absolute_notation():
+    assert patch_service.parse_start("", "2.101") == (2, 101)
+    assert patch_service.parse_start("U3", "17") == (3, 17)
+    assert patch_service.parse_start("", "") is None
+
+
+def test_layout_moves_fixture_to_next_universe():
+    # 20 Kanäle ab 500: das erste Fixture passt nicht mehr ins Universe 1
+    assert list(patch_service.layout((1, 481), 3, 20)) == [(1, 481), (2, 1), (2, 21)]
+
+
+def test_analyze_rig_detects_collisions_and_overflow():
+    patch_service.clear_cache()
+    rig = {
+        "spots_items": [{"count": "4", "model": "Spot", "mode": "16ch", "universe": "1", "address": "1"}],
+        "washes_items": [{"count": "1", "model": "Wash", "mode": "8ch", "universe": "1", "address": "60"}],
+        "custom_devices": [{"count": "1", "name": "Hazer", "mode": "4ch", "universe": "0", "address": "1"},
+                           {"count": "2", "name": "Strobe"}],
+    }
+    report = patch_service.analyze_rig(rig)
+
+    assert len(report["fixtures"]) == 6
+    assert report["collisions"] == [
+        {"universe": 1, "address": 60, "channels": 5, "a": "Spot 4", "b": "Wash 1"},
+    ]
+    assert [f["label"] for f in report["out_of_range"]] == ["Hazer 1"]
+    assert report["unpatched"][0]["label"] == "Strobe"
+    assert report["estimated"] == ["custom_1"]
+    assert report["universes"] == {1: 67}
+    # Gleicher Rig-Stand -> Ergebnis aus dem Cache
+    assert patch_service.analyze_rig(rig) is report
+
+
+def test_auto_patch_first_fit_and_best_fit():
+    def rig():
+        return {
+            "spots_items": [
+                {"count": "1", "model": "A", "mode": "100ch", "universe": "1", "address": "1"},
+                {"count": "1", "model": "B", "mode": "10ch", "universe": "1", "address": "131"},
+                {"count": "1", "model": "C", "mode": "100ch", "universe": "1", "address": "401"},
+            ],
+            "washes_items": [{"count": "1", "model": "Wash", "mode": "12ch"}],
+        }
+
+    # Lücken: 101-130 (30), 141-400 (260), 501-512 (12)
+    first = rig()
+    assert patch_service.auto_patch(first, "first_fit")[0]["address"] == 101
+    best = rig()
+    patch_service.auto_patch(best, "best_fit")
+    assert (best["washes_items"][0]["universe"], best["washes_items"][0]["address"]) == (1, 501)
+
+    report = patch_service.analyze_rig(best)
+    assert report["collisions"] == [] and report["unpatched"] == []
+
+
+def test_auto_patch_invalidates_cached_report_of_current_rig():
+    from core import rig_model
+
+    rig = rig_model.upgrade({"washes_items": [{"count": "2", "model": "Wash", "mode": "12ch"}]})
+    assert patch_service.analyze_rig(rig)["unpatched"][0]["key"] == "washes_0"
+    patch_service.auto_patch(rig)
+    report = patch_service.analyze_rig(rig)
+    assert report["unpatched"] == []
+    assert [f["address"] for f in report["fixtures"]] == [1, 13]
+
+
+def test_auto_patch_opens_new_universe_when_full():
+    rig = {
+        "spots_items": [{"count": "1", "model": "A", "mode": "500ch", "universe": "1", "address": "1"}],
+        "washes_items": [{"count": "3", "model": "Wash", "mode": "16ch"}],
+    }
+    assignments = patch_service.auto_patch(rig)
+    assert assignments == [{"key": "washes_0", "label": "Wash", "universe": 2, "address": 1}]
+
+
+def test_mvr_export_writes_address_per_fixture(tmp_path):
+    show = {
+        "name": "Patch",
+        "rig_setup": {
+            "spots_items": [{"count": "3", "model": "Spot", "mode": "Mode 1 200ch",
+                             "universe": "1", "address": "201"}],
+        },
+    }
+    path = mvr_export.export_mvr_to_file(show, export_dir=tmp_path)
+    with zipfile.ZipFile(path) as zf:
+        root = ET.fromstring(zf.read("GeneralSceneDescription.xml"))
+    ns = {"mvr": mvr_export.MVR_NAMESPACE}
+    addresses = [
+        (a.get("universe"), a.get("address"))
+        for a in root.findall(".//mvr:Fixture/mvr:Addresses/mvr:Address", ns)
+    ]
+    assert addresses == [("1", "201"), ("2", "1"), ("2", "201")]
+
+
+def test_auto_patch_route(client, sample_show):
+    client.post('/login', data=dict(username="Admin", password="Admin123"))
+    sample_show["rig_setup"] = {"spots_items": [{"count": "2", "model": "Spot", "mode": "16ch"}]}
+
+    response = client.post(f"/show/{sample_show['id']}/rig/auto_patch", data={"strategy": "best_fit"})
+    assert response.status_code == 302
+    item = show_logic.shows[0]["rig_setup"]["spots_items"][0]
+    assert (item["universe"], item["address"]) == (1, 1)
+
+    page = client.get(f"/show/{sample_show['id']}?tab=rig")
+    assert "DMX-Patch" in page.get_data(as_text=True)
+
+    assert client.post(f"/show/{sample_show['id']}/rig/auto_patch", data={"strategy": "x"}).status_code == 400
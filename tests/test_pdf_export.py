@@ -0,0 +1,83 @@
+from PIL import Image
+
+from services.exporters import pdf_layout
+from services.exporters.pdf_export import build_show_report_pdf, build_techrider_pdf
+
+
+def _show(prop_images):
+    return {
+        "name": "PDF Show",
+        "songs": [{"id": i, "order_index": i, "name": f"Cue {i}", "mood": "Warm"} for i in range(1, 120)],
+        "rig_setup": {"spots": "12", "power_main": "63A CEE"},
+        "checklists": {"preproduction": [{"id": 1, "text": "Patch prüfen", "done": True}]},
+        "prop_images": prop_images,
+    }
+
+
+def test_show_report_uses_cached_thumbnails(tmp_path, monkeypatch):
+    Image.new("RGB", (2000, 1500), (200, 30, 30)).save(tmp_path / "big.jpg")
+    monkeypatch.setattr(pdf_layout, "PROPS_DIR", str(tmp_path))
+    pdf_layout.clear_caches()
+
+    buffer, filename = build_show_report_pdf(_show(["big.jpg", "missing.png"]))
+    assert filename == "PDF_Show.pdf"
+    assert buffer.getvalue().startswith(b"%PDF")
+
+    thumb = pdf_layout.get_prop_image("big.jpg")
+    assert max(thumb.getSize()) <= pdf_layout.PROP_THUMB_PX
+    # Zweiter Zugriff kommt aus dem Cache
+    assert pdf_layout.get_prop_image("big.jpg") is thumb
+    pdf_layout.clear_caches()
+
+
+def test_techrider_pdf_builds():
+    buffer, filename = build_techrider_pdf(_show([]))
+    assert filename == "PDF_Show_TechRider.pdf"
+    assert buffer.getvalue().startswith(b"%PDF")
+
+
+def test_page_header_form_is_defined_once_and_placed_on_every_following_page():
+    buffer, _ = build_show_report_pdf(_show([]))
+    data = buffer.getvalue()
+    pages = data.count(b"/Type /Page\n")
+    assert pages > 2
+    assert data.count(b"/Subtype /Form") == 1
+    # Ressourcen-Verweis auf die Form von jeder Folgeseite
+    assert data.count(b"/FormXob.cuex_page_header") == pages - 1
+
+
+def test_legacy_manufacturer_keeps_rig_section():
+    from services.exporters.pdf_export import _rig_has_content, _rig_lines
+
+    legacy = {"manufacturer": "Robe"}
+    assert _rig_has_content(legacy)
+    assert _rig_lines(legacy) == ["Bevorzugter Hersteller: Robe"]
+    assert legacy == {"manufacturer": "Robe"}  # Eingabe bleibt unverändert
+
+
+def test_image_grid_breaks_onto_new_pages(tmp_path, monkeypatch):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    Image.new("RGB", (200, 200), (30, 30, 200)).save(tmp_path / "prop.png")
+    monkeypatch.setattr(pdf_layout, "PROPS_DIR", str(tmp_path))
+    pdf_layout.clear_caches()
+
+    boxes = []
+    draw_image = canvas.Canvas.drawImage
+
+    def recording(self, image, x, y, width=None, height=None, **kwargs):
+        boxes.append((self.getPageNumber(), x, y, width, height))
+        return draw_image(self, image, x, y, width=width, height=height, **kwargs)
+
+    monkeypatch.setattr(canvas.Canvas, "drawImage", recording)
+    build_show_report_pdf(_show(["prop.png"] * 100))
+    pdf_layout.clear_caches()
+
+    thumbs = [b for b in boxes if b[3] == 90]
+    assert len(thumbs) == 100
+    assert len({page for page, *_ in thumbs}) > 1
+    page_w, page_h = A4
+    for _, x, y, w, h in thumbs:
+        assert 0 <= x and x + w <= page_w
+        assert 0 <= y and y + h <= page_h
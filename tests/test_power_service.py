@@ -1,5 +1,5 @@
 import pytest
-from services.power_service import calculate_rig_power
+from services.power_service import balance_phases, calculate_rig_power
 
 def test_empty_rig_returns_none():
     assert calculate_rig_power({}) is None
@@ -63,3 +63,54 @@ def test_invalid_values_are_handled_gracefully():
     }
     result = calculate_rig_power(rig)
     assert result is None
+
+
+def test_phase_loads_and_flags():
+    rig = {
+        "power_main": "32A CEE",
+        "spots_items": [
+            {"count": "10", "watt": "700", "phase": "L1"},   # 7000 W -> ~32 A
+            {"count": "2", "watt": "500", "phase": "L2-3"},  # Stromkreis L2-3
+        ],
+        "washes_items": [
+            {"count": "4", "watt": "250", "phase": ""},      # ohne Phase
+        ],
+    }
+    phases = calculate_rig_power(rig)["phases"]
+    assert phases["watt"] == {"L1": 7000.0, "L2": 1000.0, "L3": 0.0}
+    assert phases["unassigned_watt"] == 1000.0
+    assert phases["breaker_a"] == 32.0
+    assert phases["overloaded"] == ["L1"]
+    assert phases["unbalanced"]
+    assert [c["circuit"] for c in phases["circuits"]] == ["L2-3"]
+    assert phases["overloaded_circuits"] == []
+
+
+def test_balance_suggestion_is_even():
+    rig = {
+        "spots_items": [{"count": "30", "watt": "400", "phase": "L1"}],
+        "washes_items": [{"count": "12", "watt": "250", "phase": "L1"}],
+    }
+    suggestion = calculate_rig_power(rig)["phases"]["suggestion"]
+    assert set(suggestion["phase_watt"].values()) == {5000.0}
+    assert suggestion["imbalance_pct"] == 0.0
+    assert sum(a["L1"] + a["L2"] + a["L3"] for a in suggestion["assignments"]) == 42
+
+
+def test_balance_handles_huge_counts_in_bulk():
+    # Vertipper in der Anzahl darf die Verteilung nicht Gerät für Gerät durchlaufen
+    suggestion = balance_phases([("spots_0", "Spot", 400.0, 2_000_000_000), ("washes_0", "Wash", 250.0, 7)])
+    counts = suggestion["assignments"][0]
+    assert counts["L1"] + counts["L2"] + counts["L3"] == 2_000_000_000
+    assert max(counts[p] for p in ("L1", "L2", "L3")) - min(counts[p] for p in ("L1", "L2", "L3")) <= 1
+    assert sum(suggestion["phase_watt"].values()) == 400.0 * 2_000_000_000 + 250.0 * 7
+    assert suggestion["imbalance_pct"] < 0.001
+
+
+def test_result_is_cached_per_rig_version():
+    rig = {"spots_items": [{"count": "2", "watt": "100", "phase": "L1"}]}
+    first = calculate_rig_power(rig)
+    assert calculate_rig_power(rig) is first
+
+    rig["spots_items"][0]["count"] = "3"
+    assert calculate_rig_power(rig)["total_watt"] == 300.0
@@ -0,0 +1,99 @@
+import json
+
+from core import rig_model, show_logic
+
+
+def _legacy_rig():
+    return {
+        "manufacturer": "Robe",
+        "spots": "12",
+        "watt_spots": "6000",
+        "universe_spots": "1",
+        "address_spots": "101",
+        "phase_spots": "L2",
+        "models_spots": ["MegaPointe"],
+        "modes_spots": ["Standard 34ch"],
+        "washes": "",
+        "watt_washes": "",
+        "washes_items": [{"count": " 8 ", "watt": "450,5", "universe": "", "address": "2.17"}],
+        "custom_devices": [{"count": "2", "name": " Hazer ", "watt": "abc"}],
+        "power_main": "63A CEE",
+    }
+
+
+def test_normalize_item_parses_numbers_once():
+    item = rig_model.normalize_item({"count": " 10 ", "watt": "150,5", "universe": "U3", "address": "17",
+                                     "dmx_footprint": "0", "model": " Spot "})
+    assert item["count"] == 10
+    assert item["watt"] == 150.5
+    assert (item["universe"], item["address"]) == (3, 17)
+    assert "dmx_footprint" not in item
+    assert item["model"] == "Spot"
+    assert rig_model.normalize_item({"count": "abc", "watt": "200"})["watt"] == 200
+    assert rig_model.normalize_item({"address": "42"})["universe"] is None
+
+
+def test_upgrade_migrates_legacy_fields():
+    rig = rig_model.upgrade(_legacy_rig())
+
+    assert rig["schema"] == rig_model.RIG_SCHEMA
+    assert rig["main_brand"] == "Robe"
+    for key in ("manufacturer", "spots", "watt_spots", "universe_spots", "models_spots", "washes"):
+        assert key not in rig
+
+    spot = rig["spots_items"][0]
+    assert (spot["count"], spot["watt"], spot["model"], spot["mode"]) == (12, 500, "MegaPointe", "Standard 34ch")
+    assert (spot["universe"], spot["address"], spot["phase"]) == (1, 101, "L2")
+    assert rig["washes_items"][0]["count"] == 8
+    assert (rig["washes_items"][0]["universe"], rig["washes_items"][0]["address"]) == (2, 17)
+    assert rig["custom_devices"][0] == {
+        "count": 2, "name": "Hazer", "watt": 0, "universe": None, "address": None,
+        "manufacturer": "", "model": "", "mode": "", "phase": "",
+    }
+    assert rig["beams_items"] == []
+    assert rig["power_main"] == "63A CEE"
+
+    # Zweiter Aufruf ändert nichts mehr
+    assert rig_model.upgrade(rig) == rig
+
+
+def test_current_does_not_touch_legacy_dict():
+    legacy = _legacy_rig()
+    upgraded = rig_model.current(legacy)
+    assert upgraded is not legacy
+    assert legacy["spots"] == "12"
+    assert rig_model.current(upgraded) is upgraded
+
+
+def test_load_data_migrates_once(tmp_path, monkeypatch):
+    path = tmp_path / "shows.json"
+    path.write_text(json.dumps({"shows": [{"id": 1, "name": "Alt", "rig_setup": _legacy_rig()}]}), encoding="utf-8")
+    monkeypatch.setattr(show_logic, "DATA_FILE", str(path))
+    original = list(show_logic.shows)
+    try:
+        show_logic.load_data()
+        rig = show_logic.shows[0]["rig_setup"]
+        assert rig_model.is_current(rig)
+        assert rig["spots_items"][0]["count"] == 12
+    finally:
+        show_logic.shows[:] = original
+
+
+def test_update_rig_stores_typed_values(client, sample_show):
+    client.post('/login', data=dict(username="Admin", password="Admin123"))
+    response = client.post(f"/show/{sample_show['id']}/update_rig", data={
+        "rig_spots__count[]": ["4", ""],
+        "rig_spots__model[]": ["Spot", ""],
+        "rig_spots__universe[]": ["1", ""],
+        "rig_spots__address[]": ["001", ""],
+        "rig_spots__watt[]": ["700", ""],
+    })
+    assert response.status_code == 302
+
+    rig = show_logic.shows[0]["rig_setup"]
+    first, empty = rig["spots_items"]
+    assert (first["count"], first["universe"], first["address"], first["watt"]) == (4, 1, 1, 700)
+    assert (empty["count"], empty["universe"]) == (0, None)
+
+    page = client.get(f"/show/{sample_show['id']}?tab=rig").get_data(as_text=True)
+    assert 'value="None"' not in page
@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import patch, MagicMock
 from core import show_logic
+from services import cue_list
 
 @pytest.fixture
 def mock_persistence():
@@ -79,7 +80,7 @@ def test_create_song(mock_persistence, clean_state):
     assert song2["id"] == 2
     assert song2["order_index"] == 2
 
-def test_remove_song_reorders_indices(mock_persistence, clean_state):
+def test_remove_song_keeps_keys_and_derives_numbers(mock_persistence, clean_state):
     show = show_logic.create_default_show("S1", "", "", "", "", "")
     s1 = show_logic.create_song(show, "S1", "", "", "", "", "", "")
     s2 = show_logic.create_song(show, "S2", "", "", "", "", "", "")
@@ -97,7 +98,42 @@ def test_remove_song_reorders_indices(mock_persistence, clean_state):
     assert show["songs"][0]["order_index"] == 1
     
     assert show["songs"][1]["id"] == 3
-    assert show["songs"][1]["order_index"] == 2  # Should be re-indexed
+    assert show["songs"][1]["order_index"] == 3  # Schlüssel bleibt, nur die Nummer rückt nach
+    assert [(n, s["id"]) for n, s in cue_list.numbered_songs(show)] == [(1, 1), (2, 3)]
+
+
+def test_move_song_rewrites_only_moved_key(mock_persistence, clean_state):
+    show = show_logic.create_default_show("S1", "", "", "", "", "")
+    for name in ("A", "B", "C", "D"):
+        show_logic.create_song(show, name, "", "", "", "", "", "")
+
+    changed = show_logic.move_song(show, 4, 1)
+    assert [(old, s["name"]) for old, s in changed] == [(4, "D")]
+    assert [s["name"] for s in show["songs"]] == ["A", "D", "B", "C"]
+    assert [s["order_index"] for s in show["songs"]] == [1, 1.5, 2, 3]
+
+    assert show_logic.move_song(show, 1, 3)[0][1]["order_index"] == 4
+    assert show_logic.move_song(show, 1, 0)[0][1]["order_index"] == 0
+    assert show_logic.move_song(show, 1, 0) == []
+
+
+def test_move_song_rebalances_when_gap_is_used_up(mock_persistence, clean_state):
+    show = show_logic.create_default_show("S1", "", "", "", "", "")
+    for name in ("A", "B", "C"):
+        show_logic.create_song(show, name, "", "", "", "", "", "")
+
+    # Immer wieder zwischen A und das Element danach schieben, bis die Lücke aufgebraucht ist
+    moves = 0
+    while True:
+        moves += 1
+        moved = show["songs"][-1]["id"]
+        changed = show_logic.move_song(show, moved, 1)
+        if len(changed) > 1:
+            break
+    assert moves > 10
+    assert [s["order_index"] for s in show["songs"]] == [1, 2, 3]
+    keys = [s["order_index"] for s in show["songs"]]
+    assert keys == sorted(keys)
 
 def test_duplicate_show(mock_persistence, clean_state):
     show = show_logic.create_default_show("Original", "Artist", "2025-01-01", "", "", "")
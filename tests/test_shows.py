@@ -58,3 +58,60 @@ def test_show_detail_loads(client, sample_show):
     
     assert response.status_code == 200
     assert b"Test Show" in response.data
+
+
+def test_show_detail_renders_only_active_tab(client, sample_show):
+    """Nur der aktive Tab wird gerendert, die übrigen sind Platzhalter zum Nachladen."""
+    client.post('/login', data=dict(username="Admin", password="Admin123"))
+    show_id = sample_show["id"]
+
+    html = client.get(f'/show/{show_id}?tab=songs').get_data(as_text=True)
+    assert 'id="tab-songs"' in html and 'tab-pane fade show active' in html
+    assert 'name="rig_main_brand"' not in html
+    assert f'data-fragment-url="/show/{show_id}/tab/rig"' in html
+
+    rig = client.get(f'/show/{show_id}/tab/rig')
+    assert rig.status_code == 200
+    assert 'name="rig_main_brand"' in rig.get_data(as_text=True)
+    assert client.get(f'/show/{show_id}/tab/unknown').status_code == 404
+
+
+def test_tab_fragments_are_cached_per_show_version(client, sample_show, monkeypatch):
+    from routes import show_details
+    client.post('/login', data=dict(username="Admin", password="Admin123"))
+    calls = []
+    real = show_details.calculate_rig_power
+    monkeypatch.setattr(show_details, "calculate_rig_power", lambda rig: calls.append(1) or real(rig))
+    show_details.clear_fragment_cache()
+
+    first = client.get(f'/show/{sample_show["id"]}/tab/rig').get_data(as_text=True)
+    second = client.get(f'/show/{sample_show["id"]}/tab/rig').get_data(as_text=True)
+    assert first == second and len(calls) == 1
+    # CSRF-Token wird pro Auslieferung eingesetzt
+    assert show_details._CSRF_PLACEHOLDER not in first
+
+    # Jede Änderung an der Show ergibt eine neue Version
+    sample_show["rig_setup"]["power_main"] = "63A CEE"
+    client.get(f'/show/{sample_show["id"]}/tab/rig')
+    assert len(calls) == 2
+
+
+def test_props_fragment_switches_to_derivatives_once_ready(client, sample_show, tmp_path, monkeypatch):
+    import time
+    from PIL import Image
+    from routes import show_assets, show_details
+    from services import media_service
+
+    client.post('/login', data=dict(username="Admin", password="Admin123"))
+    monkeypatch.setattr(show_assets, "_props_dir", lambda: tmp_path)
+    Image.new("RGB", (800, 600)).save(tmp_path / "stage.png")
+    sample_show["songs"] = [{"id": 1, "order_index": 1, "name": "Intro", "prop_images": ["stage.png"]}]
+    show_details.clear_fragment_cache()
+
+    url = f'/show/{sample_show["id"]}/tab/props'
+    assert "/media/props/stage.thumb.jpg" not in client.get(url).get_data(as_text=True)
+    # Ableitungen entstehen im Hintergrund; die Show selbst ändert sich nicht
+    deadline = time.time() + 5
+    while media_service._pending and time.time() < deadline:
+        time.sleep(0.01)
+    assert "/media/props/stage.thumb.jpg" in client.get(url).get_data(as_text=True)
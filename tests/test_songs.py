@@ -83,3 +83,134 @@ def test_move_song(client, sample_show):
     assert response.status_code == 200
     assert sample_show["songs"][0]["name"] == "Song B"
     assert sample_show["songs"][1]["name"] == "Song A"
+
+
+def _add_songs(show, n):
+    for i in range(n):
+        show_logic.create_song(show, f"Song {i + 1}", "", "", "", "Blackout" if i % 10 == 0 else "", "", "")
+
+
+def test_cue_api_pages_and_ranges(client, sample_show):
+    """Cue-API liefert Ausschnitte nach Position, order_index-Bereich und Suche."""
+    show_id = sample_show["id"]
+    _add_songs(sample_show, 120)
+    assert client.get(f'/api/show/{show_id}/cues').status_code == 401
+
+    client.post('/login', data=dict(username="Admin", password="Admin123"))
+    page = client.get(f'/api/show/{show_id}/cues?offset=100&limit=30').get_json()
+    assert page["total"] == 120 and page["offset"] == 100
+    assert [c["name"] for c in page["cues"]][:2] == ["Song 101", "Song 102"]
+    assert len(page["cues"]) == 20
+
+    page = client.get(f'/api/show/{show_id}/cues?from=10&to=12').get_json()
+    assert [c["number"] for c in page["cues"]] == [10, 11, 12]
+
+    target = sample_show["songs"][74]["id"]
+    page = client.get(f'/api/show/{show_id}/cues?around={target}&limit=10').get_json()
+    assert page["focus"] == 74 and page["offset"] == 69
+
+    page = client.get(f'/api/show/{show_id}/cues?q=blackout').get_json()
+    assert page["total"] == 12
+    assert [c["position"] for c in page["cues"]][:2] == [0, 1]
+    assert page["cues"][1]["number"] == 11
+
+    assert client.get('/api/show/9999/cues').status_code == 404
+
+
+def test_cue_api_follows_reordering(client, sample_show):
+    """Nach dem Verschieben (save_data) wird der Index neu aufgebaut."""
+    client.post('/login', data=dict(username="Admin", password="Admin123"))
+    show_id = sample_show["id"]
+    _add_songs(sample_show, 3)
+    first = client.get(f'/api/show/{show_id}/cues').get_json()["cues"]
+    assert [c["name"] for c in first] == ["Song 1", "Song 2", "Song 3"]
+
+    client.post(f'/show/{show_id}/move_song', data=dict(song_id=sample_show["songs"][2]["id"], direction="up"))
+    cues = client.get(f'/api/show/{show_id}/cues').get_json()["cues"]
+    assert [c["name"] for c in cues] == ["Song 1", "Song 3", "Song 2"]
+
+
+def test_songs_tab_renders_without_cue_rows(client, sample_show):
+    """Songs-Tab und Regie-Ansicht liefern nur die Zeilenvorlage, nicht alle Cues."""
+    client.post('/login', data=dict(username="Admin", password="Admin123"))
+    show_id = sample_show["id"]
+    _add_songs(sample_show, 300)
+
+    html = client.get(f'/show/{show_id}?tab=songs').get_data(as_text=True)
+    assert 'data-total="300"' in html and "Song 250" not in html
+    assert html.count('name="song_name"') <= 2
+    regie = client.get(f'/show/{show_id}/regie').get_data(as_text=True)
+    assert 'data-total="300"' in regie and "Song 250" not in regie
+
+
+def test_json_song_endpoints_return_deltas(client, sample_show):
+    """Bearbeiten/Verschieben per JSON liefert nur die geänderten Cues."""
+    show_id = sample_show["id"]
+    _add_songs(sample_show, 3)
+    song_b = sample_show["songs"][1]["id"]
+    assert client.post(f'/api/show/{show_id}/songs/update', data=dict(song_id=song_b)).status_code == 401
+
+    client.post('/login', data=dict(username="Admin", password="Admin123"))
+    data = client.post(f'/api/show/{show_id}/songs/update', data=dict(
+        song_id=song_b, song_name="", song_mood="Ruhig")).get_json()
+    assert (data["cue"]["name"], data["cue"]["mood"], data["cue"]["position"]) == ("Song 2", "Ruhig", 1)
+    assert data["version"] == show_logic.show_version(sample_show)
+
+    data = client.post(f'/api/show/{show_id}/songs/move', data=dict(song_id=song_b, direction="up")).get_json()
+    assert (data["cue"]["id"], data["cue"]["position"]) == (song_b, 0)
+    assert [(c["name"], c["number"]) for c in data["changed"]] == [("Song 2", 1)]
+    assert [s["name"] for s in sample_show["songs"]] == ["Song 2", "Song 1", "Song 3"]
+
+    # Beliebige Zielposition: nur der verschobene Song bekommt einen neuen Schlüssel
+    song_c = sample_show["songs"][2]["id"]
+    data = client.post(f'/api/show/{show_id}/songs/move', data=dict(song_id=song_c, position=1)).get_json()
+    assert data["cue"]["number"] == 2 and len(data["changed"]) == 1
+    assert [s["name"] for s in sample_show["songs"]] == ["Song 2", "Song 3", "Song 1"]
+
+    missing = client.post(f'/api/show/{show_id}/songs/move', data=dict(song_id=999, direction="up"))
+    assert missing.status_code == 404
+
+
+def test_json_checklist_toggle_syncs_only_checklist(client, sample_show):
+    """Checklisten-Toggle per JSON: Eintrag zurück, DB-Spiegel der Kategorie aktuell."""
+    from core.models import ChecklistItem, Song
+    client.post('/login', data=dict(username="Admin", password="Admin123"))
+    show_id = sample_show["id"]
+    show_logic.create_check_item(sample_show, "aufbau", "Traversen")
+    _add_songs(sample_show, 2)
+    show_logic.sync_entire_show_to_db(sample_show)
+    item_id = sample_show["checklists"]["aufbau"][0]["id"]
+
+    data = client.post(f'/api/show/{show_id}/checklists/toggle',
+                       data=dict(category="aufbau", item_id=item_id)).get_json()
+    assert data["category"] == "aufbau" and data["item"]["done"] is True
+    with client.application.app_context():
+        assert [c.done for c in ChecklistItem.query.filter_by(show_id=show_id)] == [True]
+        assert Song.query.filter_by(show_id=show_id).count() == 2
+
+    html = client.get(f'/show/{show_id}?tab=meta').get_data(as_text=True)
+    assert f'data-check-item="aufbau-{item_id}"' in html
+    assert client.post(f'/api/show/{show_id}/checklists/toggle',
+                       data=dict(category="aufbau", item_id=999)).status_code == 404
+
+
+def test_move_and_delete_touch_only_affected_db_rows(client, sample_show):
+    """Verschieben/Löschen schreibt nur die betroffenen DB-Zeilen; Nummern folgen der Reihenfolge."""
+    from core.models import Song
+    client.post('/login', data=dict(username="Admin", password="Admin123"))
+    show_id = sample_show["id"]
+    _add_songs(sample_show, 4)
+    show_logic.sync_entire_show_to_db(sample_show)
+    with client.application.app_context():
+        row_ids = {r.name: r.id for r in Song.query.filter_by(show_id=show_id)}
+
+    song_4 = sample_show["songs"][3]["id"]
+    client.post(f'/show/{show_id}/move_song', data=dict(song_id=song_4, position=0))
+    client.post(f'/show/{show_id}/delete_song', data=dict(song_id=sample_show["songs"][2]["id"]))
+
+    with client.application.app_context():
+        rows = Song.query.filter_by(show_id=show_id).order_by(Song.order_index).all()
+        assert [r.name for r in rows] == ["Song 4", "Song 1", "Song 3"]
+        assert {r.name: r.id for r in rows} == {n: row_ids[n] for n in ("Song 4", "Song 1", "Song 3")}
+    page = client.get(f'/api/show/{show_id}/cues').get_json()
+    assert [(c["number"], c["name"]) for c in page["cues"]] == [(1, "Song 4"), (2, "Song 1"), (3, "Song 3")]
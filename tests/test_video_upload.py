@@ -0,0 +1,96 @@
+import hashlib
+import os
+
+import pytest
+
+from app import app
+from core import show_logic
+from routes import show_assets
+from services import media_store, upload_service
+
+
+@pytest.fixture
+def upload_dirs(tmp_path, monkeypatch):
+    videos = tmp_path / "videos"
+    monkeypatch.setattr(show_assets, "_videos_dir", lambda: videos)
+    monkeypatch.setitem(app.config, "VIDEO_UPLOAD_DIR", str(tmp_path / "uploads"))
+    return videos
+
+
+def _put_chunk(client, show_id, upload_id, offset, data, digest=None):
+    return client.put(
+        f"/show/{show_id}/video_uploads/{upload_id}",
+        data=data,
+        headers={
+            "Upload-Offset": str(offset),
+            "X-Chunk-SHA256": digest or hashlib.sha256(data).hexdigest(),
+            "Content-Type": "application/octet-stream",
+        },
+    )
+
+
+def test_chunked_upload_resume_and_complete(client, sample_show, upload_dirs):
+    payload = os.urandom(300_000)
+    show_id = sample_show["id"]
+
+    resp = client.post(
+        f"/show/{show_id}/video_uploads",
+        json={"filename": "Probe Mitschnitt.mp4", "size": len(payload),
+              "sha256": hashlib.sha256(payload).hexdigest()},
+    )
+    assert resp.status_code == 201
+    upload_id = resp.get_json()["upload_id"]
+
+    assert _put_chunk(client, show_id, upload_id, 0, payload[:100_000]).get_json()["offset"] == 100_000
+
+    # Defekter Chunk wird verworfen, Offset bleibt stehen
+    resp = _put_chunk(client, show_id, upload_id, 100_000, payload[100_000:200_000], digest="0" * 64)
+    assert resp.status_code == 422
+    assert resp.get_json()["offset"] == 100_000
+
+    # Falscher Offset -> 409 mit dem Offset zum Fortsetzen
+    resp = _put_chunk(client, show_id, upload_id, 0, payload[:100_000])
+    assert resp.status_code == 409
+    assert resp.get_json()["offset"] == 100_000
+
+    # Fortsetzen nach Verbindungsabbruch
+    offset = client.get(f"/show/{show_id}/video_uploads/{upload_id}").get_json()["offset"]
+    assert _put_chunk(client, show_id, upload_id, offset, payload[offset:]).get_json()["complete"]
+
+    resp = client.post(f"/show/{show_id}/video_uploads/{upload_id}/complete")
+    assert resp.status_code == 200
+    fname = resp.get_json()["filename"]
+    assert fname == media_store.content_name(hashlib.sha256(payload).hexdigest(), "mp4")
+    assert (upload_dirs / fname).read_bytes() == payload
+    assert fname in show_logic.find_show(show_id)["videos"]
+
+
+def test_complete_rejects_incomplete_upload(client, sample_show, upload_dirs):
+    show_id = sample_show["id"]
+    upload_id = client.post(
+        f"/show/{show_id}/video_uploads", json={"filename": "clip.mov", "size": 10}
+    ).get_json()["upload_id"]
+    _put_chunk(client, show_id, upload_id, 0, b"12345")
+
+    resp = client.post(f"/show/{show_id}/video_uploads/{upload_id}/complete")
+    assert resp.status_code == 409
+    assert resp.get_json()["offset"] == 5
+
+
+def test_chunk_endpoint_ignores_global_size_limit(client, sample_show, upload_dirs, monkeypatch):
+    monkeypatch.setitem(app.config, "MAX_CONTENT_LENGTH", 1024)
+    show_id = sample_show["id"]
+    data = os.urandom(4096)
+    upload_id = client.post(
+        f"/show/{show_id}/video_uploads", json={"filename": "clip.mp4", "size": len(data)}
+    ).get_json()["upload_id"]
+
+    assert _put_chunk(client, show_id, upload_id, 0, data).status_code == 200
+
+
+def test_purge_stale_removes_old_sessions(tmp_path):
+    status = upload_service.create_upload(tmp_path, 1, "clip.mp4", 10)
+    assert upload_service.purge_stale(tmp_path, max_age=-1) == 1
+    assert not list(tmp_path.iterdir())
+    with pytest.raises(upload_service.UploadError):
+        upload_service.get_status(tmp_path, status["upload_id"], 1)